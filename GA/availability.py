@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class AvailabilityMatrix:
+    """
+    Free/busy store for teachers or labs backed by a bool array [resource, day, slot].
+
+    Day and slot indices are 0-based, exactly like the nested-list format
+    ``{name: [[True] * slots for days]}`` it replaces. The mapping interface
+    (``name in m``, ``m[name][day][slot]``, ``m.items()``) is kept so code written
+    against the dict-of-lists keeps working, while ``is_free``/``occupy`` are O(1)
+    and ``free_at`` answers "who is free at (day, slot)" with one vectorised read.
+    """
+
+    def __init__(self, names, num_days: int, num_slots: int, free=None):
+        self.names = list(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        if free is None:
+            free = np.ones((len(self.names), num_days, num_slots), dtype=bool)
+        self.free = free
+
+    @classmethod
+    def from_dict(cls, matrix: dict):
+        names = list(matrix)
+        num_days = max((len(days) for days in matrix.values()), default=0)
+        num_slots = max(
+            (len(slots) for days in matrix.values() for slots in days), default=0
+        )
+        free = np.zeros((len(names), num_days, num_slots), dtype=bool)
+        for i, days in enumerate(matrix.values()):
+            for day, slots in enumerate(days):
+                free[i, day, : len(slots)] = slots
+        return cls(names, num_days, num_slots, free)
+
+    @classmethod
+    def coerce(cls, matrix):
+        if isinstance(matrix, cls):
+            return matrix
+        return cls.from_dict(matrix or {})
+
+    def to_dict(self) -> dict:
+        rows = self.free.tolist()
+        return {name: rows[i] for i, name in enumerate(self.names)}
+
+    @property
+    def num_days(self) -> int:
+        return self.free.shape[1]
+
+    @property
+    def num_slots(self) -> int:
+        return self.free.shape[2]
+
+    def index(self, name) -> int:
+        return self._index[name]
+
+    def is_free(self, name, day: int, slot: int) -> bool:
+        i = self._index.get(name)
+        if i is None:
+            return False
+        free = self.free
+        if 0 <= day < free.shape[1] and 0 <= slot < free.shape[2]:
+            return bool(free[i, day, slot])
+        return False
+
+    def occupy(self, name, day: int, slot: int):
+        self.free[self._index[name], day, slot] = False
+
+    def release(self, name, day: int, slot: int):
+        self.free[self._index[name], day, slot] = True
+
+    def free_mask_at(self, day: int, slot: int):
+        return self.free[:, day, slot]
+
+    def free_at(self, day: int, slot: int) -> list:
+        names = self.names
+        return [names[i] for i in np.flatnonzero(self.free[:, day, slot])]
+
+    def free_among(self, candidates, day: int, slot: int) -> list:
+        indices = [self._index[name] for name in candidates if name in self._index]
+        if not indices:
+            return []
+        mask = self.free[indices, day, slot]
+        names = self.names
+        return [names[i] for i, is_free in zip(indices, mask) if is_free]
+
+    def snapshot(self):
+        return self.free.copy()
+
+    def restore(self, snapshot):
+        np.copyto(self.free, snapshot)
+
+    def copy(self):
+        clone = AvailabilityMatrix.__new__(AvailabilityMatrix)
+        clone.names = self.names
+        clone._index = self._index
+        clone.free = self.free.copy()
+        return clone
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        return self.free[self._index[name]]
+
+    def __setitem__(self, name, rows):
+        self.free[self._index[name]] = rows
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        return list(self.names)
+
+    def items(self):
+        return [(name, self.free[i]) for i, name in enumerate(self.names)]
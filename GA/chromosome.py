@@ -1,8 +1,11 @@
-import copy
 import random
 from math import ceil
 
 from Constants.constant import Defaults
+from GA.availability import AvailabilityMatrix
+from GA.encoding import GeneCodec
+from GA.lab_allocator import LabAllocationIndex
+from GA.subject_index import SubjectCandidateIndex
 
 
 class TimeTableGeneration:
@@ -22,6 +25,7 @@ class TimeTableGeneration:
         lab_availability_matrix: dict,
         time_slots: dict,
         fixed_teacher_assignment: dict = None,
+        rng: random.Random = None,
     ):
         self.sections_manager = total_sections
         self.classrooms_manager = total_classrooms
@@ -35,10 +39,12 @@ class TimeTableGeneration:
         self.available_time_slots = time_slots
         self.teacher_duty_days = teacher_duty_days
         self.weekly_workload = teacher_weekly_workload
-        self.teacher_availability_matrix = teacher_availability_matrix
-        self.initial_lab_availability_matrix = copy.deepcopy(lab_availability_matrix)
-        self.lab_availability_matrix = copy.deepcopy(self.initial_lab_availability_matrix)
+        self.teacher_availability_matrix = AvailabilityMatrix.coerce(teacher_availability_matrix)
+        self.initial_lab_availability_matrix = AvailabilityMatrix.coerce(lab_availability_matrix).copy()
+        self._reset_lab_availability()
         self.fixed_teacher_assignment = fixed_teacher_assignment or {}
+        self.candidate_index = None
+        self.rng = rng or random
         self._map_sections_to_classrooms()
 
     def _map_sections_to_classrooms(self) -> dict:
@@ -65,6 +71,11 @@ class TimeTableGeneration:
         return section_classroom_map
 
 
+    def _reset_lab_availability(self):
+        self.lab_availability_matrix = self.initial_lab_availability_matrix.copy()
+        self.lab_index = LabAllocationIndex(self.lab_capacity_manager, self.lab_availability_matrix)
+
+
     def _initialize_teacher_workload_tracker(self) -> dict:
         return {
             teacher: 0
@@ -72,12 +83,27 @@ class TimeTableGeneration:
         }
 
 
+    def _get_candidate_index(self, subject_usage_tracker: dict) -> SubjectCandidateIndex:
+        if (
+            self.candidate_index is None
+            or self.candidate_index.subject_usage is not subject_usage_tracker
+        ):
+            self.candidate_index = SubjectCandidateIndex(
+                self.subject_teacher_mapping,
+                self.subject_quota_limits,
+                self.teacher_availability_preferences,
+                subject_usage_tracker,
+            )
+        return self.candidate_index
+
+
     def _get_available_subjects(self, section: str, subject_usage_tracker: dict) -> list:
-        return [
-            subject
-            for subject in self.subject_teacher_mapping
-            if subject_usage_tracker[section][subject] < self.subject_quota_limits.get(subject, 0)
-        ]
+        return self._get_candidate_index(subject_usage_tracker).available_subjects(section)
+
+
+    def _consume_subject(self, section: str, subject: str, subject_usage_tracker: dict, count: int):
+        subject_usage_tracker[section][subject] += count
+        self._get_candidate_index(subject_usage_tracker).consume(section, subject, count)
 
 
     def _assign_subject_and_teacher(
@@ -91,8 +117,9 @@ class TimeTableGeneration:
         teacher_availability_matrix: dict,
         day_index: int,
     ) -> tuple:
-        available_subjects = self._get_available_subjects(section, subject_usage_tracker)
-        random.shuffle(available_subjects)
+        candidate_index = self._get_candidate_index(subject_usage_tracker)
+        available_subjects = candidate_index.available_subjects(section)
+        self.rng.shuffle(available_subjects)
         assigned_teacher = None
         selected_subject = None
         assigned_room = assigned_classroom
@@ -104,35 +131,22 @@ class TimeTableGeneration:
                 # First, check for a fixed teacher assignment for (section, subject)
                 fixed_teacher = self.fixed_teacher_assignment.get(section, {}).get(subject)
                 if fixed_teacher:
-                    if (
-                        fixed_teacher in teacher_availability_matrix and
-                        len(teacher_availability_matrix[fixed_teacher]) > day_index and
-                        len(teacher_availability_matrix[fixed_teacher][day_index]) > (slot_index - 1) and
-                        teacher_availability_matrix[fixed_teacher][day_index][slot_index - 1]
-                    ):
+                    if teacher_availability_matrix.is_free(fixed_teacher, day_index, slot_index - 1):
                         assigned_teacher = fixed_teacher
-                        teacher_workload_tracker[fixed_teacher] += 1
+                        candidate_index.record(fixed_teacher)
                         selected_subject = subject
                         subjects_scheduled_today.add(subject)
                         break
 
-                # Otherwise, assign normally from the available pool
-                teachers = self.subject_teacher_mapping[subject]
-                preferred_teachers = [
-                    t for t in teachers if self.teacher_availability_preferences.get(t, [])
-                ]
-                for teacher in sorted(preferred_teachers, key=lambda t: teacher_workload_tracker[t]):
-                    if (
-                        teacher in teacher_availability_matrix and
-                        len(teacher_availability_matrix[teacher]) > day_index and
-                        len(teacher_availability_matrix[teacher][day_index]) > (slot_index - 1) and
-                        teacher_availability_matrix[teacher][day_index][slot_index - 1]
-                    ):
-                        assigned_teacher = teacher
-                        teacher_workload_tracker[teacher] += 1
-                        selected_subject = subject
-                        subjects_scheduled_today.add(subject)
-                        break
+                # Otherwise, assign normally from the available pool, least loaded first
+                teacher = candidate_index.pick_teacher(
+                    subject,
+                    lambda t: teacher_availability_matrix.is_free(t, day_index, slot_index - 1),
+                )
+                if teacher is not None:
+                    assigned_teacher = teacher
+                    selected_subject = subject
+                    subjects_scheduled_today.add(subject)
 
             if assigned_teacher:
                 break
@@ -153,65 +167,42 @@ class TimeTableGeneration:
     ) -> tuple:
         group1_size = ceil(section_strength / 2)
         group2_size = section_strength - group1_size
-        labs_list = list(self.lab_availability_matrix.keys())
-
-        for i in range(len(labs_list)):
-            lab1 = labs_list[i]
-            if (
-                self.lab_availability_matrix[lab1][day_index][slot_index - 1]
-                and self.lab_availability_matrix[lab1][day_index][slot_index]
-                and self.lab_capacity_manager.get(lab1, 0) >= group1_size
-            ):
-                for j in range(i + 1, len(labs_list)):
-                    lab2 = labs_list[j]
-                    if (
-                        self.lab_availability_matrix[lab2][day_index][slot_index - 1]
-                        and self.lab_availability_matrix[lab2][day_index][slot_index]
-                        and self.lab_capacity_manager.get(lab2, 0) >= group2_size
-                    ):
-                        self.lab_availability_matrix[lab1][day_index][
-                            slot_index - 1
-                        ] = False
-                        self.lab_availability_matrix[lab1][day_index][
-                            slot_index
-                        ] = False
-                        self.lab_availability_matrix[lab2][day_index][
-                            slot_index - 1
-                        ] = False
-                        self.lab_availability_matrix[lab2][day_index][
-                            slot_index
-                        ] = False
-                        entries = [
-                            {
-                                "teacher_id": teacher,
-                                "subject_id": subject,
-                                "classroom_id": lab1,
-                                "time_slot": self.available_time_slots[slot_index],
-                                "group": 1,
-                            },
-                            {
-                                "teacher_id": teacher,
-                                "subject_id": subject,
-                                "classroom_id": lab1,
-                                "time_slot": self.available_time_slots[slot_index + 1],
-                                "group": 1,
-                            },
-                            {
-                                "teacher_id": teacher,
-                                "subject_id": subject,
-                                "classroom_id": lab2,
-                                "time_slot": self.available_time_slots[slot_index],
-                                "group": 2,
-                            },
-                            {
-                                "teacher_id": teacher,
-                                "subject_id": subject,
-                                "classroom_id": lab2,
-                                "time_slot": self.available_time_slots[slot_index + 1],
-                                "group": 2,
-                            },
-                        ]
-                        return entries, slot_index + 2
+        lab_pair = self.lab_index.allocate(
+            day_index, slot_index - 1, group1_size, group2_size
+        )
+        if lab_pair is not None:
+            lab1, lab2 = lab_pair
+            entries = [
+                {
+                    "teacher_id": teacher,
+                    "subject_id": subject,
+                    "classroom_id": lab1,
+                    "time_slot": self.available_time_slots[slot_index],
+                    "group": 1,
+                },
+                {
+                    "teacher_id": teacher,
+                    "subject_id": subject,
+                    "classroom_id": lab1,
+                    "time_slot": self.available_time_slots[slot_index + 1],
+                    "group": 1,
+                },
+                {
+                    "teacher_id": teacher,
+                    "subject_id": subject,
+                    "classroom_id": lab2,
+                    "time_slot": self.available_time_slots[slot_index],
+                    "group": 2,
+                },
+                {
+                    "teacher_id": teacher,
+                    "subject_id": subject,
+                    "classroom_id": lab2,
+                    "time_slot": self.available_time_slots[slot_index + 1],
+                    "group": 2,
+                },
+            ]
+            return entries, slot_index + 2
 
         merged_entry = {
             "teacher_id": teacher,
@@ -258,7 +249,7 @@ class TimeTableGeneration:
                         teacher, subject, day_index, slot_index, section_strength
                     )
                     schedule.extend(lab_entries)
-                    subject_usage_tracker[section][subject] += len(lab_entries)
+                    self._consume_subject(section, subject, subject_usage_tracker, len(lab_entries))
                 else:
                     schedule.append(
                         {
@@ -269,7 +260,7 @@ class TimeTableGeneration:
                             "group": "fallback",
                         }
                     )
-                    subject_usage_tracker[section][subject] += 1
+                    self._consume_subject(section, subject, subject_usage_tracker, 1)
                     slot_index += 1
             else:
                 schedule.append(
@@ -282,7 +273,7 @@ class TimeTableGeneration:
                     }
                 )
                 if subject != "Library":
-                    subject_usage_tracker[section][subject] += 1
+                    self._consume_subject(section, subject, subject_usage_tracker, 1)
                 slot_index += 1
 
         return schedule, teacher_availability_matrix
@@ -297,6 +288,7 @@ class TimeTableGeneration:
     ) -> tuple:
         daily_schedule = {}
         teacher_workload = self._initialize_teacher_workload_tracker()
+        self._get_candidate_index(subject_usage_tracker).reset_workload(teacher_workload)
         for section in sections:
             section_strength = self.sections_manager[section]
             (
@@ -323,7 +315,7 @@ class TimeTableGeneration:
         }
         sections = list(self.sections_manager.keys())
         for day_index, weekday in enumerate(self.weekdays):
-            random.shuffle(sections)
+            self.rng.shuffle(sections)
             half_day = sections[: len(sections) // 2]
             (
                 daily_sched,
@@ -336,16 +328,51 @@ class TimeTableGeneration:
         return weekly_schedule, subject_usage, self.teacher_availability_matrix
 
 
-    def create_timetable(self, num_weeks: int) -> tuple:
-        timetable = {}
-        for week in range(1, num_weeks + 1):
-            self.lab_availability_matrix = copy.deepcopy(
-                self.initial_lab_availability_matrix
-            )
+    def build_week(self, seed: int = None) -> dict:
+        """
+        Build one weekly chromosome. With a seed the week is drawn from its own
+        random.Random(seed) stream, so it does not depend on which weeks were built
+        before it or in which process.
+        """
+        rng = self.rng
+        if seed is not None:
+            self.rng = random.Random(seed)
+        try:
+            self._reset_lab_availability()
             (
                 weekly_schedule,
                 _,
                 self.teacher_availability_matrix,
             ) = self._generate_weekly_schedule()
-            timetable[f"Week {week}"] = weekly_schedule
+        finally:
+            self.rng = rng
+        return weekly_schedule
+
+
+    def create_encoded_timetable(
+        self, num_weeks: int, codec: GeneCodec = None, seeds: list = None
+    ) -> tuple:
+        """
+        Same as create_timetable, but each week is packed into a CompactChromosome
+        as soon as it is built, so only one week of dict entries is alive at a time.
+        """
+        codec = codec or GeneCodec.for_problem(
+            self.subject_teacher_mapping,
+            self.sections_manager,
+            self.classrooms_manager,
+            self.lab_capacity_manager,
+            self.available_time_slots,
+        )
+        population = {}
+        for week in range(1, num_weeks + 1):
+            seed = seeds[week - 1] if seeds else None
+            population[f"Week {week}"] = codec.encode(self.build_week(seed))
+        return population, codec, self.teacher_availability_matrix, self.lab_availability_matrix
+
+
+    def create_timetable(self, num_weeks: int, seeds: list = None) -> tuple:
+        timetable = {}
+        for week in range(1, num_weeks + 1):
+            seed = seeds[week - 1] if seeds else None
+            timetable[f"Week {week}"] = self.build_week(seed)
         return timetable, self.teacher_availability_matrix, self.lab_availability_matrix
@@ -0,0 +1,253 @@
+import abc
+import random
+
+from Constants.constant import Defaults
+
+
+class CrossoverOperator(abc.ABC):
+    """
+    Base class for crossover operators on weekly schedules.
+
+    Parents are treated as persistent values: an operator never changes them and
+    builds each child from new week and day dicts that point at the parents'
+    unchanged section lists and entry dicts. Offspring therefore cost one dict per
+    day, however large the schedule, and must be forked (see
+    TimeTableMutation.fork) before any section is edited in place.
+    """
+
+    name = None
+
+    def __init__(self, rng=None):
+        self.rng = rng or random
+
+    @abc.abstractmethod
+    def cross(self, parent1: dict, parent2: dict) -> tuple:
+        """The two children of ``parent1`` and ``parent2``."""
+
+    @staticmethod
+    def _shared_days(parent1: dict, parent2: dict) -> list:
+        return [day for day in parent1 if day in parent2]
+
+
+class DaySwapCrossover(CrossoverOperator):
+    """
+    One-point crossover over the days both parents have: the days after a random
+    cut come from the other parent.
+    """
+
+    name = "day"
+
+    def cross(self, parent1: dict, parent2: dict) -> tuple:
+        child1, child2 = dict(parent1), dict(parent2)
+        days = self._shared_days(parent1, parent2)
+        if len(days) < 2:
+            return child1, child2
+        cut = self.rng.randint(1, len(days) - 1)
+        for day in days[cut:]:
+            child1[day], child2[day] = parent2[day], parent1[day]
+        return child1, child2
+
+
+class SectionCrossover(CrossoverOperator):
+    """
+    Each section takes its whole week from one parent, chosen at random per
+    section, which keeps every section's weekly subject quota intact.
+    """
+
+    name = "section"
+
+    def cross(self, parent1: dict, parent2: dict) -> tuple:
+        sections = {section for day in parent1.values() for section in day}
+        swapped = {section for section in sorted(sections) if self.rng.random() < 0.5}
+        child1, child2 = dict(parent1), dict(parent2)
+        for day in self._shared_days(parent1, parent2):
+            day1, day2 = dict(parent1[day]), dict(parent2[day])
+            for section in swapped:
+                if section in day1 and section in day2:
+                    day1[section], day2[section] = parent2[day][section], parent1[day][section]
+            child1[day], child2[day] = day1, day2
+        return child1, child2
+
+
+class UniformCrossover(CrossoverOperator):
+    """
+    Every (day, section) block is taken from either parent with probability
+    ``swap_probability``.
+    """
+
+    name = "uniform"
+
+    def __init__(self, rng=None, swap_probability: float = 0.5):
+        super().__init__(rng)
+        self.swap_probability = swap_probability
+
+    def cross(self, parent1: dict, parent2: dict) -> tuple:
+        child1, child2 = dict(parent1), dict(parent2)
+        for day in self._shared_days(parent1, parent2):
+            day1, day2 = dict(parent1[day]), dict(parent2[day])
+            for section in parent1[day]:
+                if section in day2 and self.rng.random() < self.swap_probability:
+                    day1[section], day2[section] = parent2[day][section], parent1[day][section]
+            child1[day], child2[day] = day1, day2
+        return child1, child2
+
+
+class SlotBlockCrossover(CrossoverOperator):
+    """
+    For every shared day a random window of consecutive time slots is exchanged:
+    each section keeps its own entries outside the window and takes the other
+    parent's entries inside it. Only the sections whose entries differ inside the
+    window get a new list; the entries themselves stay shared.
+    """
+
+    name = "slot_block"
+
+    def __init__(self, rng=None, time_slots: dict = None):
+        super().__init__(rng)
+        # time_slots is the {number: "9:00 - 9:55"} map used across the package;
+        # slots missing from it are ordered by first appearance.
+        self.slot_order = {
+            label: position
+            for position, (_, label) in enumerate(sorted((time_slots or {}).items()))
+        }
+
+    def _position(self, entry) -> int:
+        time_slot = entry["time_slot"]
+        position = self.slot_order.get(time_slot)
+        if position is None:
+            position = self.slot_order[time_slot] = len(self.slot_order)
+        return position
+
+    def _window(self, parent1: dict, parent2: dict, day) -> tuple:
+        if not self.slot_order:
+            for parent in (parent1, parent2):
+                for entries in parent[day].values():
+                    for entry in entries:
+                        self._position(entry)
+        num_slots = len(self.slot_order)
+        if num_slots < 2:
+            return 0, num_slots - 1
+        return tuple(sorted(self.rng.sample(range(num_slots), 2)))
+
+    def cross(self, parent1: dict, parent2: dict) -> tuple:
+        child1, child2 = dict(parent1), dict(parent2)
+        position = self._position
+        for day in self._shared_days(parent1, parent2):
+            low, high = self._window(parent1, parent2, day)
+            day1, day2 = dict(parent1[day]), dict(parent2[day])
+            for section, entries1 in parent1[day].items():
+                entries2 = day2.get(section)
+                if entries2 is None:
+                    continue
+                inside1 = [e for e in entries1 if low <= position(e) <= high]
+                inside2 = [e for e in entries2 if low <= position(e) <= high]
+                if inside1 == inside2:
+                    continue
+                outside1 = [e for e in entries1 if not low <= position(e) <= high]
+                outside2 = [e for e in entries2 if not low <= position(e) <= high]
+                day1[section] = sorted(outside1 + inside2, key=position)
+                day2[section] = sorted(outside2 + inside1, key=position)
+            child1[day], child2[day] = day1, day2
+        return child1, child2
+
+
+class WorkingDaySwapCrossover(CrossoverOperator):
+    """
+    TimeTableCrossOver's operator: every working day present in both parents is
+    exchanged, so the children are the parents with their weeks swapped.
+    """
+
+    name = "working_days"
+
+    def __init__(self, rng=None, working_days: list = None):
+        super().__init__(rng)
+        self.working_days = working_days or Defaults().working_days
+
+    def cross(self, parent1: dict, parent2: dict) -> tuple:
+        child1, child2 = dict(parent1), dict(parent2)
+        for day in self.working_days:
+            if day in parent1 and day in parent2:
+                child1[day], child2[day] = parent2[day], parent1[day]
+        return child1, child2
+
+
+CROSSOVER_OPERATORS = {
+    operator.name: operator
+    for operator in (
+        WorkingDaySwapCrossover,
+        DaySwapCrossover,
+        SectionCrossover,
+        UniformCrossover,
+        SlotBlockCrossover,
+    )
+}
+
+
+def get_crossover(name: str, **kwargs) -> CrossoverOperator:
+    try:
+        operator = CROSSOVER_OPERATORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown crossover {name!r}, expected one of {sorted(CROSSOVER_OPERATORS)}."
+        ) from None
+    return operator(**kwargs)
+
+
+if __name__ == "__main__":
+    import copy
+    import time
+
+    from Constants.helper_routines import initialize_teacher_availability
+    from GA.chromosome import TimeTableGeneration
+    from Samples.samples import (
+        RoomCapacity,
+        SpecialSubjects,
+        SubjectTeacherMap,
+        SubjectWeeklyQuota,
+        TeacherWorkload,
+        TimeSlots,
+    )
+
+    generator = TimeTableGeneration(
+        teacher_subject_mapping=SubjectTeacherMap.subject_teacher_map,
+        total_sections=RoomCapacity.section_strength,
+        total_classrooms=RoomCapacity.room_capacity,
+        total_labs=RoomCapacity.lab_capacity,
+        teacher_preferences=TeacherWorkload.teacher_preferences,
+        teacher_weekly_workload=TeacherWorkload.Weekly_workLoad,
+        special_subjects=SpecialSubjects.special_subjects,
+        labs=SpecialSubjects.Labs,
+        subject_quota_limits=SubjectWeeklyQuota.subject_quota,
+        teacher_duty_days=TeacherWorkload.teacher_duty_days,
+        teacher_availability_matrix=initialize_teacher_availability(
+            TeacherWorkload.Weekly_workLoad.keys(), 6, 7
+        ),
+        lab_availability_matrix={
+            lab: [[True] * 7 for _ in range(6)] for lab in RoomCapacity.lab_capacity
+        },
+        time_slots=TimeSlots.time_slots,
+    )
+    weeks = list(generator.create_timetable(40)[0].values())
+    pairs = list(zip(weeks[0::2], weeks[1::2]))
+
+    def throughput(cross, rounds=20):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for parent1, parent2 in pairs:
+                cross(parent1, parent2)
+        return rounds * len(pairs) / (time.perf_counter() - start)
+
+    def deepcopy_day_swap(parent1, parent2):
+        # What a caller had to do to keep the parents safe from TimeTableCrossOver.
+        child1, child2 = copy.deepcopy(parent1), copy.deepcopy(parent2)
+        for day in Defaults().working_days:
+            if day in child1 and day in child2:
+                child1[day], child2[day] = child2[day], child1[day]
+        return child1, child2
+
+    baseline = throughput(deepcopy_day_swap, rounds=2)
+    print(f"{'deepcopy + day swap':<22} {baseline:10.0f} crossovers/s")
+    for name in CROSSOVER_OPERATORS:
+        kwargs = {"time_slots": TimeSlots.time_slots} if name == "slot_block" else {}
+        rate = throughput(get_crossover(name, **kwargs).cross)
+        print(f"{name:<22} {rate:10.0f} crossovers/s  {rate / baseline:6.1f}x")
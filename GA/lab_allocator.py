@@ -0,0 +1,102 @@
+from bisect import bisect_left
+from math import ceil
+
+import numpy as np
+
+
+class LabAllocationIndex:
+    """
+    Best-fit lab pair allocator for two-slot lab sessions.
+
+    Labs are kept sorted by capacity and, for every (day, slot), the free labs are
+    held as an int bitmask over that sorted order. A session split into groups of
+    size g1 >= g2 needs two distinct labs that are free in both slots of the pair;
+    ``find_pair`` picks the smallest lab that fits g2 and then the smallest other
+    lab that fits g1, using a bisect on the capacities and a lowest-set-bit lookup
+    on the mask. Bookings are written through to the wrapped AvailabilityMatrix.
+    """
+
+    def __init__(self, lab_capacity: dict, lab_matrix):
+        names = lab_matrix.names
+        order = sorted(
+            range(len(names)), key=lambda i: (lab_capacity.get(names[i], 0), i)
+        )
+        self.matrix = lab_matrix
+        self.labs = [names[i] for i in order]
+        self.capacities = [lab_capacity.get(lab, 0) for lab in self.labs]
+        self._position = {lab: pos for pos, lab in enumerate(self.labs)}
+
+        free = lab_matrix.free[order]
+        self.num_days = lab_matrix.num_days
+        self.num_slots = lab_matrix.num_slots
+        self._free = [
+            [self._to_mask(free[:, day, slot]) for slot in range(self.num_slots)]
+            for day in range(self.num_days)
+        ]
+
+    @staticmethod
+    def _to_mask(column) -> int:
+        if not len(column):
+            return 0
+        packed = np.packbits(column.astype(np.uint8), bitorder="little")
+        return int.from_bytes(packed.tobytes(), "little")
+
+    @staticmethod
+    def _first_from(mask: int, start: int):
+        mask >>= start
+        if not mask:
+            return None
+        return start + (mask & -mask).bit_length() - 1
+
+    def pair_mask(self, day: int, slot: int) -> int:
+        if not (0 <= day < self.num_days and 0 <= slot and slot + 1 < self.num_slots):
+            return 0
+        return self._free[day][slot] & self._free[day][slot + 1]
+
+    def find_pair(self, day: int, slot: int, group1_size: int, group2_size: int):
+        """
+        Tightest (lab1, lab2) free at slots slot and slot + 1 (0-based) with
+        capacity(lab1) >= group1_size and capacity(lab2) >= group2_size, or None.
+        """
+        mask = self.pair_mask(day, slot)
+        second = self._first_from(mask, bisect_left(self.capacities, group2_size))
+        if second is None:
+            return None
+        mask &= ~(1 << second)
+        first = self._first_from(mask, bisect_left(self.capacities, group1_size))
+        if first is None:
+            return None
+        return self.labs[first], self.labs[second]
+
+    def occupy(self, lab: str, day: int, slot: int):
+        self._free[day][slot] &= ~(1 << self._position[lab])
+        self.matrix.occupy(lab, day, slot)
+
+    def release(self, lab: str, day: int, slot: int):
+        self._free[day][slot] |= 1 << self._position[lab]
+        self.matrix.release(lab, day, slot)
+
+    def allocate(self, day: int, slot: int, group1_size: int, group2_size: int):
+        pair = self.find_pair(day, slot, group1_size, group2_size)
+        if pair is not None:
+            for lab in pair:
+                self.occupy(lab, day, slot)
+                self.occupy(lab, day, slot + 1)
+        return pair
+
+    def allocate_day(self, day: int, sessions: list) -> list:
+        """
+        Batch mode: ``sessions`` is a list of (slot, section_strength) requests for one
+        day. Sessions competing for the same slot pair are matched largest first, each
+        taking its best-fit pair, so small sessions cannot strand the big labs that the
+        large ones need. Returns (lab1, lab2) or None per session, in input order.
+        """
+        results = [None] * len(sessions)
+        order = sorted(
+            range(len(sessions)), key=lambda i: (sessions[i][0], -sessions[i][1], i)
+        )
+        for i in order:
+            slot, strength = sessions[i]
+            group1_size = ceil(strength / 2)
+            results[i] = self.allocate(day, slot, group1_size, strength - group1_size)
+        return results
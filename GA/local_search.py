@@ -0,0 +1,207 @@
+import random
+
+from GA.repair import ConflictRepair, OccupancyIndex
+
+
+class LocalSearch(ConflictRepair):
+    """
+    Delta-evaluated local search over the (day, section, slot) grid of one week.
+
+    The objective is the sum of OccupancyIndex.excess over the days: the extra
+    sections booked on a teacher or room in one slot. Every step picks an entry
+    in a clash and tries one move:
+
+    - move: the entry goes to a slot its section leaves free (limited to the
+      section's span, as in ConflictRepair);
+    - swap: the entry exchanges slots with another entry of its section;
+    - kempe: the entry's slot and another slot are exchanged for the whole
+      Kempe chain that contains the entry, i.e. all entries in the two slots that
+      are linked through a shared section, teacher or room. The entries keep
+      their relative arrangement, so the chain does not add conflicts between
+      its own members, and lab group pairs move together.
+
+    A move is scored by updating the day's index and reading its excess. Moves
+    that lower the objective are kept. Moves that leave it unchanged are kept with
+    probability ``sideways``, so the search can walk across plateaus. Any other
+    move is undone through its undo log. The search stops after ``max_moves``
+    moves, when no conflict is left, or after ``patience`` moves in a row without
+    an improvement. Slot changes never change the fitness
+    evaluator's score, which does not resolve slot labels, so the search can
+    only remove conflicts.
+    """
+
+    MOVES = ("move", "swap", "kempe")
+
+    def __init__(
+        self,
+        time_slots: dict = None,
+        max_moves: int = 2000,
+        sideways: float = 0.2,
+        patience: int = 300,
+        rng=None,
+    ):
+        super().__init__(time_slots)
+        self.max_moves = max_moves
+        self.sideways = sideways
+        self.patience = patience
+        self.rng = rng or random
+        self.accepted = dict.fromkeys(self.MOVES, 0)
+        self.tried = dict.fromkeys(self.MOVES, 0)
+
+    def polish(self, week_schedule: dict, changes: list = None) -> tuple:
+        """
+        Return ``(polished_week, conflicts_removed)``. The polished week shares
+        every untouched day and section with ``week_schedule``. When ``changes`` is
+        given, it is extended with one (day, section, index, entry) record per
+        position whose slot changed.
+        """
+        week = dict(week_schedule)
+        owned = {}
+        indexes = {
+            day: OccupancyIndex.from_day(day, day_schedule)
+            for day, day_schedule in week_schedule.items()
+        }
+        before = sum(index.conflict_count() for index in indexes.values())
+        touched = {}
+        stale = 0
+        for _ in range(self.max_moves):
+            hot_days = [day for day, index in indexes.items() if index.hot]
+            if not hot_days or stale >= self.patience:
+                break
+            stale += 1
+            day = self.rng.choice(hot_days)
+            index = indexes[day]
+            section, position = self._pick_conflict(week[day], index)
+            kind = self.rng.choice(self.MOVES)
+            self.tried[kind] += 1
+            excess = index.excess
+            undo_log = getattr(self, f"_{kind}")(week, owned, index, day, section, position)
+            if not undo_log:
+                continue
+            delta = index.excess - excess
+            if delta < 0:
+                stale = 0
+            if delta < 0 or (delta == 0 and self.rng.random() < self.sideways):
+                self.accepted[kind] += 1
+                for moved_section, moved_position, _ in undo_log:
+                    touched[(day, moved_section, moved_position)] = None
+            else:
+                self._undo(week, index, day, undo_log)
+
+        if changes is not None:
+            changes.extend(
+                (day, section, position, week[day][section][position])
+                for day, section, position in touched
+            )
+        after = sum(index.conflict_count() for index in indexes.values())
+        return week, before - after
+
+    def stats(self) -> dict:
+        return {kind: (self.accepted[kind], self.tried[kind]) for kind in self.MOVES}
+
+    def _pick_conflict(self, day_schedule: dict, index: OccupancyIndex) -> tuple:
+        field, key = self.rng.choice(sorted(index.hot))
+        _, time_slot, resource = key
+        section = self.rng.choice(sorted(index.holders(field, key)))
+        positions = [
+            position
+            for position, entry in enumerate(day_schedule[section])
+            if entry["time_slot"] == time_slot and entry[field] == resource
+        ]
+        return section, self.rng.choice(positions)
+
+    def _apply(self, week, owned, index, day, moves) -> list:
+        """Set ``(section, position, slot)`` moves and return their undo log."""
+        undo_log = []
+        for section, position, time_slot in moves:
+            entry = self._own(week, owned, day, section)[position]
+            undo_log.append((section, position, entry["time_slot"]))
+            self._set_slot(index, day, section, entry, time_slot)
+        return undo_log
+
+    def _undo(self, week, index, day, undo_log: list):
+        for section, position, time_slot in reversed(undo_log):
+            self._set_slot(index, day, section, week[day][section][position], time_slot)
+
+    def _move(self, week, owned, index, day, section, position) -> list:
+        free_slots = self._free_slots(week[day][section])
+        if not free_slots:
+            return []
+        target = self.rng.choice(free_slots)
+        return self._apply(week, owned, index, day, [(section, position, target)])
+
+    def _swap(self, week, owned, index, day, section, position) -> list:
+        entries = week[day][section]
+        time_slot = entries[position]["time_slot"]
+        partners = [i for i, entry in enumerate(entries) if entry["time_slot"] != time_slot]
+        if not partners:
+            return []
+        partner = self.rng.choice(partners)
+        target = entries[partner]["time_slot"]
+        moves = [(section, position, target), (section, partner, time_slot)]
+        return self._apply(week, owned, index, day, moves)
+
+    def _kempe(self, week, owned, index, day, section, position) -> list:
+        day_schedule = week[day]
+        first = day_schedule[section][position]["time_slot"]
+        slots = {entry["time_slot"] for entry in day_schedule[section]} - {first}
+        slots.update(self._free_slots(day_schedule[section]))
+        if not slots:
+            return []
+        second = self.rng.choice(sorted(slots))
+        chain = self.kempe_chain(day_schedule, section, position, first, second)
+        other = {first: second, second: first}
+        moves = [
+            (
+                chain_section,
+                chain_position,
+                other[day_schedule[chain_section][chain_position]["time_slot"]],
+            )
+            for chain_section, chain_position in chain
+        ]
+        if self.slot_order and any(
+            time_slot not in self._span(day_schedule[chain_section])
+            for chain_section, _, time_slot in moves
+        ):
+            return []
+        return self._apply(week, owned, index, day, moves)
+
+    @classmethod
+    def kempe_chain(cls, day_schedule: dict, section, position: int, first, second) -> list:
+        """
+        The (section, position) entries in slots ``first`` and ``second`` that are
+        connected to the given entry through a shared section, teacher or room.
+        """
+        nodes = [
+            (node_section, node_position, cls._resources(node_section, entry))
+            for node_section, entries in day_schedule.items()
+            for node_position, entry in enumerate(entries)
+            if entry["time_slot"] in (first, second)
+        ]
+        start = next(
+            i for i, (s, p, _) in enumerate(nodes) if s == section and p == position
+        )
+        chain, frontier, linked = {start}, [start], set(nodes[start][2])
+        while frontier:
+            frontier = [
+                i
+                for i, node in enumerate(nodes)
+                if i not in chain and not linked.isdisjoint(node[2])
+            ]
+            for i in frontier:
+                chain.add(i)
+                linked.update(nodes[i][2])
+        return [(nodes[i][0], nodes[i][1]) for i in sorted(chain)]
+
+    @staticmethod
+    def _resources(section, entry: dict) -> tuple:
+        resources = [("section", section)]
+        if entry["teacher_id"] not in OccupancyIndex.FREE_TEACHERS:
+            resources.append(("teacher", entry["teacher_id"]))
+        if entry["classroom_id"] not in OccupancyIndex.FREE_ROOMS:
+            resources.append(("room", entry["classroom_id"]))
+        return tuple(resources)
+
+    def _span(self, entries: list) -> set:
+        used = {entry["time_slot"] for entry in entries}
+        return used.union(self._free_slots(entries))
@@ -1,12 +1,12 @@
-import copy
 import random
 
 from Constants.constant import Defaults
 
 
 class TimeTableMutation:
-    def __init__(self, mutation_rate=0.7):
+    def __init__(self, mutation_rate=0.7, rng=None):
         self.mutation_rate = mutation_rate
+        self.rng = rng or random
 
     def mutate_time_slots_in_section(self, schedule: dict, section: str) -> bool:
         if section not in schedule or len(schedule[section]) < 2:
@@ -14,25 +14,103 @@ class TimeTableMutation:
 
         section_slots = schedule[section]
         time_slots = [entry["time_slot"] for entry in section_slots]
-        random.shuffle(time_slots)
+        self.rng.shuffle(time_slots)
         for i, entry in enumerate(section_slots):
             entry["time_slot"] = time_slots[i]
         return True
 
-    def mutate_schedule_for_week(self, weekly_schedule: dict) -> dict:
-        mutated_schedule = copy.deepcopy(weekly_schedule)
-        for day, day_schedule in mutated_schedule.items():
-            sections = list(day_schedule.keys())
-            num_to_mutate = max(1, int(self.mutation_rate * len(sections)))
-            sections_to_mutate = random.sample(sections, num_to_mutate)
+    def _shuffle_section(self, day, day_schedule: dict, section, undo_log: list) -> bool:
+        """
+        mutate_time_slots_in_section that appends (day, section, index, old_slot) to
+        ``undo_log`` for every entry whose slot changed.
+        """
+        before = [entry["time_slot"] for entry in day_schedule.get(section, ())]
+        if not self.mutate_time_slots_in_section(day_schedule, section):
+            return False
+        undo_log.extend(
+            (day, section, index, time_slot)
+            for index, (entry, time_slot) in enumerate(zip(day_schedule[section], before))
+            if entry["time_slot"] != time_slot
+        )
+        return True
+
+    def _sections_to_mutate(self, day_schedule: dict) -> list:
+        sections = list(day_schedule.keys())
+        num_to_mutate = max(1, int(self.mutation_rate * len(sections)))
+        return self.rng.sample(sections, num_to_mutate)
+
+    @staticmethod
+    def changes_from_log(weekly_schedule: dict, undo_log: list) -> list:
+        """The (day, section, index, entry) change set IncrementalFitness.apply takes."""
+        return [
+            (day, section, index, weekly_schedule[day][section][index])
+            for day, section, index, _ in undo_log
+        ]
+
+    def mutate_in_place(self, weekly_schedule: dict) -> list:
+        """
+        Shuffle time slots directly in ``weekly_schedule`` and return the undo log,
+        a list of (day, section, index, old_slot). Nothing is copied, so the week
+        must not share entries with another chromosome.
+        """
+        undo_log = []
+        for day, day_schedule in weekly_schedule.items():
+            for section in self._sections_to_mutate(day_schedule):
+                self._shuffle_section(day, day_schedule, section, undo_log)
+        return undo_log
+
+    @staticmethod
+    def undo(weekly_schedule: dict, undo_log: list):
+        for day, section, index, time_slot in reversed(undo_log):
+            weekly_schedule[day][section][index]["time_slot"] = time_slot
+
+    @staticmethod
+    def fork(weekly_schedule: dict, sections_by_day: dict) -> dict:
+        """
+        Copy of the week that shares every day and section with ``weekly_schedule``
+        except the sections listed in ``sections_by_day``, which get fresh entry dicts
+        and can be changed in place.
+        """
+        forked = dict(weekly_schedule)
+        for day, sections in sections_by_day.items():
+            day_schedule = forked[day] = dict(forked[day])
+            for section in sections:
+                if section in day_schedule:
+                    day_schedule[section] = [dict(entry) for entry in day_schedule[section]]
+        return forked
+
+    def mutate_schedule_for_week(self, weekly_schedule: dict, changes: list = None) -> dict:
+        """
+        Return a mutated fork of the week: only the shuffled sections are copied and
+        every other day and section is shared with ``weekly_schedule``, so the result
+        must not be edited in place outside the sections that changed. When ``changes``
+        is given, a (day, section, index, entry) record is appended for every entry
+        whose time slot moved, which is the change set IncrementalFitness.apply takes.
+        """
+        mutated_schedule = dict(weekly_schedule)
+        undo_log = []
+        for day, day_schedule in weekly_schedule.items():
+            sections_to_mutate = self._sections_to_mutate(day_schedule)
+            day_schedule = mutated_schedule[day] = dict(day_schedule)
             for section in sections_to_mutate:
-                self.mutate_time_slots_in_section(day_schedule, section)
+                if len(day_schedule.get(section, ())) < 2:
+                    continue
+                day_schedule[section] = [dict(entry) for entry in day_schedule[section]]
+                self._shuffle_section(day, day_schedule, section, undo_log)
+        if changes is not None:
+            changes.extend(self.changes_from_log(mutated_schedule, undo_log))
         return mutated_schedule
 
 
 class TimeTableCrossOver:
     def perform_crossover(self, timetable1: dict, timetable2: dict) -> tuple:
+        """
+        Swap the working days of two weeks. The children are new week dicts that
+        share the parents' day schedules; ``timetable1`` and ``timetable2`` are left
+        untouched.
+        """
+        child1, child2 = dict(timetable1), dict(timetable2)
         for day in Defaults.working_days:
             if day in timetable1 and day in timetable2:
-                timetable1[day], timetable2[day] = timetable2[day], timetable1[day]
-        return timetable1, timetable2
+                child1[day], child2[day] = timetable2[day], timetable1[day]
+        return child1, child2
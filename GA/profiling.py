@@ -0,0 +1,226 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# tracemalloc.reset_peak is new in Python 3.9
+_HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+PHASES = (
+    "population",
+    "fitness",
+    "selection",
+    "crossover",
+    "mutation",
+    "repair",
+    "local_search",
+    "replacement",
+    "best",
+    "matrices",
+    "checkpoint",
+)
+
+
+class ProfilerHook:
+    """
+    Base class for phase callbacks. Override either method; both are called
+    outside the phase's own timing.
+    """
+
+    def phase_started(self, phase: str):
+        pass
+
+    def phase_ended(self, phase: str, seconds: float):
+        pass
+
+
+class Histogram:
+    """
+    Count, total, min and max of a series, plus a count per power-of-two bucket.
+    A bucket is keyed by its upper bound, so a value of 5 lands in bucket 8.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        bucket = 1 << int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(bucket): self.buckets[bucket] for bucket in sorted(self.buckets)},
+        }
+
+
+class Profiler:
+    """
+    Times the phases of a GA run and collects counters.
+
+    The engine wraps every phase in ``phase(name)``. Each call adds its duration
+    in microseconds to that phase's Histogram and calls ``phase_started`` and
+    ``phase_ended`` on every hook. With ``trace_allocations`` the peak memory
+    traced by tracemalloc during the phase goes to a second Histogram, in bytes;
+    before Python 3.9, which cannot reset the peak, the phase's net growth in
+    traced memory is recorded instead. With ``cprofile`` the whole run is also
+    captured by cProfile; the capture is suspended while the engine's generator
+    is paused, so a consumer's own work is not counted. ``report`` returns all of
+    it as a JSON-ready dict.
+    """
+
+    enabled = True
+
+    def __init__(self, hooks=(), cprofile: bool = False, trace_allocations: bool = False):
+        self.hooks = list(hooks)
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.trace_allocations = trace_allocations
+        self.timings = {}
+        self.allocations = {}
+        self.counters = {}
+        self.elapsed = 0.0
+        self._started = None
+        self._owns_tracing = False
+
+    @classmethod
+    def from_config(cls, config):
+        """A Profiler when the config asks for any profiling, NULL_PROFILER otherwise."""
+        if not (
+            config.profile or config.profile_hooks or config.cprofile or config.trace_allocations
+        ):
+            return NULL_PROFILER
+        return cls(config.profile_hooks or (), config.cprofile, config.trace_allocations)
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self.resume()
+
+    def stop(self):
+        self.suspend()
+        self.elapsed = time.perf_counter() - self._started
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def suspend(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+
+    def resume(self):
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    @contextmanager
+    def phase(self, name: str):
+        for hook in self.hooks:
+            hook.phase_started(name)
+        if self.trace_allocations:
+            if _HAS_RESET_PEAK:
+                tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            if self.trace_allocations:
+                current, peak = tracemalloc.get_traced_memory()
+                reached = peak if _HAS_RESET_PEAK else current
+                self.allocations.setdefault(name, Histogram()).add(max(0, reached - before))
+            self.timings.setdefault(name, Histogram()).add(seconds * 1e6)
+            for hook in self.hooks:
+                hook.phase_ended(name, seconds)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self, top: int = 20) -> dict:
+        """
+        ``elapsed`` seconds, ``phases`` (calls, seconds, share of the run and
+        the microsecond histogram of every phase, plus ``allocated_bytes`` when
+        allocations are traced), ``counters``, and with cProfile the ``top``
+        functions by cumulative time.
+        """
+        phases = {}
+        for name, timing in self.timings.items():
+            phase = {
+                "calls": timing.count,
+                "seconds": timing.total / 1e6,
+                "share": timing.total / 1e6 / self.elapsed if self.elapsed else 0.0,
+                "microseconds": timing.as_dict(),
+            }
+            if name in self.allocations:
+                phase["allocated_bytes"] = self.allocations[name].as_dict()
+            phases[name] = phase
+        report = {"elapsed": self.elapsed, "phases": phases, "counters": dict(self.counters)}
+        if self.cprofile is not None:
+            report["cprofile"] = self._top_functions(top)
+        return report
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.report(), **kwargs)
+
+    def _top_functions(self, top: int) -> list:
+        stats = pstats.Stats(self.cprofile).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        return [
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "seconds": own_time,
+                "cumulative_seconds": cumulative_time,
+            }
+            for (filename, line, function), (_, calls, own_time, cumulative_time, _) in ranked
+        ]
+
+
+class NullProfiler:
+    """
+    The profiler of a run without profiling. Every method does nothing and
+    ``phase`` hands back one shared no-op context manager, so the instrumented
+    code pays a method call per phase and allocates nothing.
+    """
+
+    enabled = False
+    _phase = nullcontext()
+
+    def phase(self, name: str):
+        return self._phase
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def suspend(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def report(self, top: int = 20):
+        return None
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+
+COMPONENTS = ("population", "selection", "crossover", "mutation", "search", "islands")
+
+
+class SeedStreams:
+    """
+    Independent random streams for the parts of one GA run, all derived from a
+    single root ``seed``.
+
+    Each component in COMPONENTS gets its own ``random.Random`` (``python``)
+    and NumPy ``Generator`` (``numpy``), seeded through ``np.random.SeedSequence``
+    with the component's position as spawn key. Extra draws in one component
+    therefore never shift another. ``spawn`` draws seeds for per-item streams,
+    such as one per week built or one per island, so a result does not depend on
+    how the items are spread over workers.
+
+    Without a seed the root is drawn from the global ``random`` module, so
+    ``random.seed()`` still pins a run. ``seed`` always holds the root in use,
+    which is all a replay needs.
+    """
+
+    def __init__(self, seed: int = None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self._python = {}
+        self._numpy = {}
+
+    def _sequence(self, component: str, kind: int) -> np.random.SeedSequence:
+        if component not in COMPONENTS:
+            raise ValueError(f"Unknown component {component!r}, expected one of {COMPONENTS}.")
+        return np.random.SeedSequence(self.seed, spawn_key=(COMPONENTS.index(component), kind))
+
+    def python(self, component: str) -> random.Random:
+        stream = self._python.get(component)
+        if stream is None:
+            state = self._sequence(component, 0).generate_state(1, dtype=np.uint64)
+            stream = self._python[component] = random.Random(int(state[0]))
+        return stream
+
+    def numpy(self, component: str) -> np.random.Generator:
+        stream = self._numpy.get(component)
+        if stream is None:
+            stream = self._numpy[component] = np.random.default_rng(self._sequence(component, 1))
+        return stream
+
+    def spawn(self, component: str, count: int) -> list:
+        stream = self.python(component)
+        return [stream.getrandbits(64) for _ in range(count)]
+
+    def getstate(self) -> dict:
+        return {
+            "seed": self.seed,
+            "python": {name: stream.getstate() for name, stream in self._python.items()},
+            "numpy": {name: stream.bit_generator.state for name, stream in self._numpy.items()},
+        }
+
+    def setstate(self, state: dict):
+        self.seed = state["seed"]
+        self._python = {}
+        self._numpy = {}
+        for name, stream_state in state["python"].items():
+            self.python(name).setstate(stream_state)
+        for name, stream_state in state["numpy"].items():
+            self.numpy(name).bit_generator.state = stream_state
@@ -1,60 +1,100 @@
-from flask import Flask, request, jsonify
+import json
 
-from GA import run_timetable_generation
+from flask import Flask, Response, request, jsonify, stream_with_context
+
+from GA import iter_timetable_generation, run_timetable_generation
+from GA.stopping import GenerationTimeout
 from flask_cors import CORS
 
 app = Flask(__name__)
 CORS(app)
 
-@app.route("/generate", methods=["POST"])
-def generate_timetable():
-    data = request.get_json()
-
-    # required inputs
-    teacher_subject_mapping = data.get("teacher_subject_mapping", {})
-    total_sections = data.get("total_sections", {})
-    total_classrooms = data.get("total_classrooms", {})
-    total_labs = data.get("total_labs", {})
-    teacher_preferences = data.get("teacher_preferences", {})
-    teacher_weekly_workload = data.get("teacher_weekly_workload", {})
-    special_subjects = data.get("special_subjects", {})
-    labs = data.get("labs", {})
-    subject_quota_limits = data.get("subject_quota_limits", {})
-    teacher_duty_days = data.get("teacher_duty_days", {})
-    teacher_availability_matrix = data.get("teacher_availability_matrix", {})
-    lab_availability_matrix = data.get("lab_availability_matrix", {})
-    total_generations = data.get("total_generations", 50)
+def _generation_arguments(data):
+    """Positional engine arguments and keyword options from a request body."""
     time_slots = {int(k): v for k, v in data.get("time_slots", {}).items()}
     day_map = {str(k): int(v) for k, v in data.get("day_map", {}).items()}
     time_slot_map = {str(k): int(v) for k, v in data.get("time_slot_map", {}).items()}
-    fixed_teacher_assignment = data.get("fixed_teacher_assignment", {})
 
-    # run engine
-    best_tt, final_teacher, final_lab = run_timetable_generation(
-        teacher_subject_mapping,
-        total_sections,
-        total_classrooms,
-        total_labs,
-        teacher_preferences,
-        teacher_weekly_workload,
-        special_subjects,
-        labs,
-        subject_quota_limits,
-        teacher_duty_days,
-        teacher_availability_matrix,
-        lab_availability_matrix,
-        total_generations,
+    # required inputs
+    arguments = (
+        data.get("teacher_subject_mapping", {}),
+        data.get("total_sections", {}),
+        data.get("total_classrooms", {}),
+        data.get("total_labs", {}),
+        data.get("teacher_preferences", {}),
+        data.get("teacher_weekly_workload", {}),
+        data.get("special_subjects", {}),
+        data.get("labs", {}),
+        data.get("subject_quota_limits", {}),
+        data.get("teacher_duty_days", {}),
+        data.get("teacher_availability_matrix", {}),
+        data.get("lab_availability_matrix", {}),
+        data.get("total_generations", 50),
         time_slots,
         day_map,
         time_slot_map,
-        fixed_teacher_assignment,
+        data.get("fixed_teacher_assignment", {}),
     )
 
-    return jsonify({
-        "timetable": best_tt,
-        "teacher_availability": final_teacher,
-        "lab_availability": final_lab
-    })
+    # optional stop criteria and seed
+    options = {
+        key: data[key]
+        for key in ("target_fitness", "stagnation_limit", "time_limit", "anytime", "seed")
+        if data.get(key) is not None
+    }
+    return arguments, options
+
+
+def _result_payload(result):
+    return {
+        "timetable": result.timetable,
+        "teacher_availability": result.teacher_availability,
+        "lab_availability": result.lab_availability,
+        "fitness_score": result.fitness,
+        "stop_reason": result.stop_reason,
+        "generations": result.generations,
+        "seed": result.seed,
+    }
+
+
+@app.route("/generate", methods=["POST"])
+def generate_timetable():
+    arguments, options = _generation_arguments(request.get_json())
+
+    # run engine
+    try:
+        result = run_timetable_generation(*arguments, **options)
+    except GenerationTimeout as timeout:
+        return jsonify({"error": str(timeout), "stop_reason": "time_limit"}), 504
+
+    return jsonify(_result_payload(result))
+
+
+@app.route("/generate/stream", methods=["POST"])
+def stream_timetable():
+    """
+    Same input as /generate. The response is newline-delimited JSON: one
+    {"progress": ...} line per generation, then one {"result": ...} line (or
+    {"error": ...} on a timeout). Closing the connection stops the run.
+    """
+    arguments, options = _generation_arguments(request.get_json())
+    progress = iter_timetable_generation(*arguments, **options)
+
+    def lines():
+        try:
+            while True:
+                try:
+                    step = next(progress)
+                except StopIteration as finished:
+                    yield json.dumps({"result": _result_payload(finished.value)}) + "\n"
+                    return
+                yield json.dumps({"progress": step.as_dict()}) + "\n"
+        except GenerationTimeout as timeout:
+            yield json.dumps({"error": str(timeout), "stop_reason": "time_limit"}) + "\n"
+        finally:
+            progress.close()
+
+    return Response(stream_with_context(lines()), mimetype="application/x-ndjson")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 """
 Algorithm module for timetable generation using Genetic Algorithm.
 """
-from algorithm.engine import TimetableEngine, run_timetable_generation
+from algorithm.engine import TimetableEngine, iter_timetable_generation, run_timetable_generation
 
-__all__ = ['TimetableEngine', 'run_timetable_generation']
+__all__ = ['TimetableEngine', 'iter_timetable_generation', 'run_timetable_generation']
@@ -0,0 +1,221 @@
+"""
+Versioned binary checkpoints of a GA run in progress.
+"""
+import json
+import os
+import struct
+import tempfile
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from algorithm.encoding import EMPTY, GENE_FIELDS, CompactChromosome, GeneCodec
+
+MAGIC = b"GACKPT"
+VERSION = 2
+_PREAMBLE = struct.Struct("<6sHI")
+
+
+class CheckpointError(ValueError):
+    """The file is not a checkpoint, or was written in another format version."""
+
+
+@dataclass
+class Checkpoint:
+    """
+    Everything TimetableEngine needs to continue a run at ``generation``: the
+    population in order, its scores, the state of its SeedStreams, the week
+    counter, the stop criteria's progress and the fitness cache.
+
+    ``save`` writes a versioned binary file. After a short preamble (magic,
+    format version, header length) comes a JSON header with the scalars, the
+    symbol tables and the week keys, then the arrays in ``np.save`` format: the
+    genes of all chromosomes encoded by one GeneCodec, one row per entry with no
+    padding, the section codes and entry counts of every (chromosome, day,
+    section), the scores, the Mersenne Twister state of every Python stream and
+    the cache. Code arrays use the narrowest integer type that holds them, so a
+    typical entry takes five bytes. The file is written next to its target and
+    moved into place with os.replace, so a run killed mid-write leaves the
+    previous checkpoint intact.
+    """
+
+    generation: int
+    next_week: int
+    population: dict
+    fitness_scores: dict
+    random_state: dict
+    elapsed: float = 0.0
+    best: float = None
+    best_generation: int = 0
+    cache: dict = field(default_factory=dict)
+    repair_history: list = field(default_factory=list)
+    local_search_history: list = field(default_factory=list)
+
+    def save(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary = tempfile.mkstemp(
+            prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                self.write(stream)
+                stream.flush()
+                os.fsync(stream.fileno())
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with open(path, "rb") as stream:
+            return cls.read(stream)
+
+    def write(self, stream):
+        keys = list(self.population)
+        codec = GeneCodec()
+        encoded = [codec.encode(self.population[key]) for key in keys]
+        sections, lengths = self._stack(encoded)
+        genes = np.concatenate(
+            [
+                chromosome.genes[self._filled(chromosome.lengths, chromosome.shape[2])]
+                for chromosome in encoded
+            ]
+        )
+        python_states = self.random_state["python"]
+
+        header = {
+            "generation": self.generation,
+            "next_week": self.next_week,
+            "keys": keys,
+            "days": [list(chromosome.days) for chromosome in encoded],
+            "symbols": [list(table) for table in codec.fields],
+            "sections": list(codec.sections),
+            "extras": [
+                [position, *place, extra]
+                for position, chromosome in enumerate(encoded)
+                for place, extra in chromosome.extras.items()
+            ],
+            "random": {
+                "seed": self.random_state["seed"],
+                "python": [
+                    [name, version, gauss_next]
+                    for name, (version, _, gauss_next) in python_states.items()
+                ],
+                "numpy": self.random_state["numpy"],
+            },
+            "elapsed": self.elapsed,
+            "best": self.best,
+            "best_generation": self.best_generation,
+            "repair_history": self.repair_history,
+            "local_search_history": self.local_search_history,
+        }
+        header = json.dumps(header, separators=(",", ":")).encode()
+        stream.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        stream.write(header)
+        for array in (
+            _narrow(genes),
+            _narrow(sections),
+            _narrow(lengths),
+            np.asarray([self.fitness_scores[key] for key in keys]),
+            np.array(
+                [mt_state for _, mt_state, _ in python_states.values()], dtype=np.uint32
+            ).reshape(len(python_states), -1),
+            np.array(list(self.cache), dtype=np.uint64),
+            np.asarray(list(self.cache.values()), dtype=None if self.cache else np.float64),
+        ):
+            np.save(stream, array, allow_pickle=False)
+
+    @classmethod
+    def read(cls, stream) -> "Checkpoint":
+        preamble = stream.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise CheckpointError("Truncated checkpoint.")
+        magic, version, header_size = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise CheckpointError("Not a GA checkpoint.")
+        if version != VERSION:
+            raise CheckpointError(
+                f"Checkpoint format version {version} is not supported, expected {VERSION}."
+            )
+        header = json.loads(stream.read(header_size))
+        genes, sections, lengths, scores, mt_states, cache_keys, cache_scores = (
+            np.load(stream, allow_pickle=False) for _ in range(7)
+        )
+
+        codec = GeneCodec(*header["symbols"], sections=header["sections"])
+        extras = [{} for _ in header["keys"]]
+        for position, day_pos, section_pos, entry_pos, extra in header["extras"]:
+            extras[position][(day_pos, section_pos, entry_pos)] = extra
+        population = {}
+        offset = 0
+        for position, (key, days) in enumerate(zip(header["keys"], header["days"])):
+            chromosome_sections = sections[position, : len(days)].astype(np.int32)
+            chromosome_lengths = lengths[position, : len(days)].astype(np.int32)
+            num_entries = int(chromosome_lengths.max(initial=0))
+            filled = cls._filled(chromosome_lengths, num_entries)
+            chromosome_genes = np.full(
+                filled.shape + (len(GENE_FIELDS),), EMPTY, dtype=np.int32
+            )
+            count = int(chromosome_lengths.sum())
+            chromosome_genes[filled] = genes[offset : offset + count]
+            offset += count
+            population[key] = codec.decode(
+                CompactChromosome(
+                    codec,
+                    chromosome_genes,
+                    chromosome_sections,
+                    chromosome_lengths,
+                    days,
+                    extras[position],
+                )
+            )
+        random_state = {
+            "seed": header["random"]["seed"],
+            "python": {
+                name: (version, tuple(mt_state), gauss_next)
+                for (name, version, gauss_next), mt_state in zip(
+                    header["random"]["python"], mt_states.tolist()
+                )
+            },
+            "numpy": header["random"]["numpy"],
+        }
+        return cls(
+            generation=header["generation"],
+            next_week=header["next_week"],
+            population=population,
+            fitness_scores=dict(zip(header["keys"], scores.tolist())),
+            random_state=random_state,
+            elapsed=header["elapsed"],
+            best=header["best"],
+            best_generation=header["best_generation"],
+            cache=dict(zip(cache_keys.tolist(), cache_scores.tolist())),
+            repair_history=header["repair_history"],
+            local_search_history=header["local_search_history"],
+        )
+
+    @staticmethod
+    def _filled(lengths: np.ndarray, num_entries: int) -> np.ndarray:
+        """Mask of the (day, section, entry) cells that hold an entry."""
+        return np.arange(num_entries) < lengths[..., None]
+
+    @staticmethod
+    def _stack(encoded: list) -> tuple:
+        num_days = max(chromosome.shape[0] for chromosome in encoded)
+        num_sections = max(chromosome.shape[1] for chromosome in encoded)
+        sections = np.full((len(encoded), num_days, num_sections), EMPTY, dtype=np.int32)
+        lengths = np.zeros((len(encoded), num_days, num_sections), dtype=np.int32)
+        for position, chromosome in enumerate(encoded):
+            days, section_count = chromosome.shape[:2]
+            sections[position, :days, :section_count] = chromosome.sections
+            lengths[position, :days, :section_count] = chromosome.lengths
+        return sections, lengths
+
+
+def _narrow(codes: np.ndarray) -> np.ndarray:
+    if not codes.size:
+        return codes
+    return codes.astype(
+        np.result_type(np.min_scalar_type(codes.min()), np.min_scalar_type(codes.max()))
+    )
@@ -0,0 +1,246 @@
+"""
+Compact, integer-encoded chromosome representation.
+"""
+import numpy as np
+
+TEACHER = 0
+SUBJECT = 1
+ROOM = 2
+TIME_SLOT = 3
+GROUP = 4
+
+GENE_FIELDS = ("teacher_id", "subject_id", "classroom_id", "time_slot", "group")
+EMPTY = -1
+
+
+class SymbolTable:
+    """
+    Interns hashable values (teacher ids, room names, groups, ...) as dense int codes.
+    """
+
+    def __init__(self, values=()):
+        self._codes = {}
+        self._values = []
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def code(self, value) -> int:
+        return self._codes.get(value, EMPTY)
+
+    def value(self, code: int):
+        return self._values[code]
+
+    def __contains__(self, value):
+        return value in self._codes
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+
+class CompactChromosome:
+    """
+    Array-backed weekly schedule.
+
+    genes     int32[day, section_pos, entry, field]  field in (teacher, subject, room, time_slot, group)
+    sections  int32[day, section_pos]                 section code in the day's dict order
+    lengths   int32[day, section_pos]                 number of entries in each section's list
+    days      tuple of day names in dict order
+
+    Padding cells hold EMPTY (-1). Keys outside GENE_FIELDS (e.g. ``flagged`` on
+    merged lab entries) are kept in ``extras`` keyed by (day_pos, section_pos, entry)
+    so that ``to_dict`` reproduces the original schedule exactly.
+    """
+
+    __slots__ = ("codec", "genes", "sections", "lengths", "days", "extras")
+
+    def __init__(self, codec, genes, sections, lengths, days, extras=None):
+        self.codec = codec
+        self.genes = genes
+        self.sections = sections
+        self.lengths = lengths
+        self.days = tuple(days)
+        self.extras = extras or {}
+
+    @property
+    def shape(self) -> tuple:
+        return self.genes.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.genes.nbytes + self.sections.nbytes + self.lengths.nbytes
+
+    def copy(self):
+        return CompactChromosome(
+            self.codec,
+            self.genes.copy(),
+            self.sections.copy(),
+            self.lengths.copy(),
+            self.days,
+            {key: dict(value) for key, value in self.extras.items()},
+        )
+
+    def to_dict(self) -> dict:
+        return self.codec.decode(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactChromosome):
+            return NotImplemented
+        return (
+            self.codec is other.codec
+            and self.days == other.days
+            and np.array_equal(self.genes, other.genes)
+            and np.array_equal(self.sections, other.sections)
+            and np.array_equal(self.lengths, other.lengths)
+            and self.extras == other.extras
+        )
+
+    __hash__ = None
+
+
+class GeneCodec:
+    """
+    Shared symbol tables used to encode chromosomes of one problem instance.
+
+    A single codec must be used for a whole population so that equal values
+    map to equal codes across chromosomes.
+    """
+
+    def __init__(
+        self,
+        teachers=(),
+        subjects=(),
+        rooms=(),
+        time_slots=(),
+        groups=(),
+        sections=(),
+    ):
+        self.fields = (
+            SymbolTable(teachers),
+            SymbolTable(subjects),
+            SymbolTable(rooms),
+            SymbolTable(time_slots),
+            SymbolTable(groups),
+        )
+        self.sections = SymbolTable(sections)
+
+    @classmethod
+    def for_problem(
+        cls,
+        subject_teacher_mapping: dict,
+        sections: dict,
+        classrooms: dict,
+        labs: dict,
+        time_slots: dict,
+    ):
+        teachers = ["None"]
+        for subject_teachers in subject_teacher_mapping.values():
+            teachers.extend(subject_teachers)
+        return cls(
+            teachers=teachers,
+            subjects=list(subject_teacher_mapping) + ["Library"],
+            rooms=list(classrooms) + list(labs) + ["merged_lab"],
+            time_slots=time_slots.values(),
+            groups=["all", 1, 2, "merged", "fallback"],
+            sections=sections,
+        )
+
+    @property
+    def teachers(self) -> SymbolTable:
+        return self.fields[TEACHER]
+
+    @property
+    def subjects(self) -> SymbolTable:
+        return self.fields[SUBJECT]
+
+    @property
+    def rooms(self) -> SymbolTable:
+        return self.fields[ROOM]
+
+    @property
+    def time_slots(self) -> SymbolTable:
+        return self.fields[TIME_SLOT]
+
+    @property
+    def groups(self) -> SymbolTable:
+        return self.fields[GROUP]
+
+    def encode(self, weekly_schedule: dict) -> CompactChromosome:
+        days = list(weekly_schedule)
+        num_sections = max((len(day) for day in weekly_schedule.values()), default=0)
+        num_entries = max(
+            (
+                len(entries)
+                for day_schedule in weekly_schedule.values()
+                for entries in day_schedule.values()
+            ),
+            default=0,
+        )
+
+        genes = np.full(
+            (len(days), num_sections, num_entries, len(GENE_FIELDS)), EMPTY, dtype=np.int32
+        )
+        sections = np.full((len(days), num_sections), EMPTY, dtype=np.int32)
+        lengths = np.zeros((len(days), num_sections), dtype=np.int32)
+        extras = {}
+
+        for day_pos, day in enumerate(days):
+            for section_pos, (section, entries) in enumerate(weekly_schedule[day].items()):
+                sections[day_pos, section_pos] = self.sections.intern(section)
+                lengths[day_pos, section_pos] = len(entries)
+                for entry_pos, entry in enumerate(entries):
+                    row = genes[day_pos, section_pos, entry_pos]
+                    for field, (key, table) in enumerate(zip(GENE_FIELDS, self.fields)):
+                        row[field] = table.intern(entry[key])
+                    if len(entry) != len(GENE_FIELDS):
+                        extra = {
+                            key: value for key, value in entry.items() if key not in GENE_FIELDS
+                        }
+                        if extra:
+                            extras[(day_pos, section_pos, entry_pos)] = extra
+
+        return CompactChromosome(self, genes, sections, lengths, days, extras)
+
+    def decode(self, chromosome: CompactChromosome) -> dict:
+        tables = [table._values for table in self.fields]
+        section_values = self.sections._values
+        genes = chromosome.genes.tolist()
+        sections = chromosome.sections.tolist()
+        lengths = chromosome.lengths.tolist()
+        extras = chromosome.extras
+
+        weekly_schedule = {}
+        for day_pos, day in enumerate(chromosome.days):
+            day_schedule = {}
+            for section_pos, section_code in enumerate(sections[day_pos]):
+                if section_code == EMPTY:
+                    continue
+                entries = []
+                for entry_pos in range(lengths[day_pos][section_pos]):
+                    row = genes[day_pos][section_pos][entry_pos]
+                    entry = {
+                        key: table[code] for key, table, code in zip(GENE_FIELDS, tables, row)
+                    }
+                    extra = extras.get((day_pos, section_pos, entry_pos))
+                    if extra:
+                        entry.update(extra)
+                    entries.append(entry)
+                day_schedule[section_values[section_code]] = entries
+            weekly_schedule[day] = day_schedule
+        return weekly_schedule
+
+    def encode_population(self, timetable: dict) -> dict:
+        return {week: self.encode(schedule) for week, schedule in timetable.items()}
+
+    def decode_population(self, population: dict) -> dict:
+        return {week: self.decode(chromosome) for week, chromosome in population.items()}
@@ -1,18 +1,28 @@
 """
 Timetable generation engine using Genetic Algorithm.
 """
-import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Tuple, Optional
 
-from algorithm.chromosome import TimeTableGeneration
+from algorithm.availability import AvailabilityMatrix
+from algorithm.batch_fitness import BatchFitnessEvaluator, StackedPopulation
+from algorithm.checkpoint import Checkpoint
+from algorithm.crossover import SlotBlockCrossover, get_crossover
+from algorithm.encoding import GeneCodec
 from algorithm.fitness import TimetableFitnessEvaluator
+from algorithm.fitness_cache import FitnessCache, ZobristKeys
+from algorithm.islands import IslandModel
+from algorithm.local_search import LocalSearch
 from algorithm.mutation import TimeTableCrossOver, TimeTableMutation
+from algorithm.population import PopulationBuilder
+from algorithm.profiling import Profiler
+from algorithm.repair import ConflictRepair
+from algorithm.seeding import SeedStreams
 from algorithm.selection import TimeTableSelection
+from algorithm.stopping import GenerationTimeout, StopCriteria
 from algorithm.helpers import (
     initialize_teacher_availability,
     update_matrix_for_best,
-    update_teacher_availability_matrix,
 )
 from algorithm.constants import Defaults
 
@@ -39,7 +49,100 @@ class TimetableConfig:
     prev_selected: dict = None
     prev_mutated: list = None
     fixed_teacher_assignment: dict = None
+    workers: int = 1
     working_days: list = None
+    population_size: int = None
+    elite_count: int = 2
+    immigrant_count: int = 1
+    fitness_cache_size: int = 4096
+    batch_fitness: bool = False
+    selection_strategy: str = "roulette"
+    crossover_strategy: str = None
+    repair_conflicts: bool = True
+    memetic_moves: int = 0
+    polish_moves: int = 0
+    islands: int = 1
+    migration_interval: int = 5
+    migration_size: int = 1
+    migration_topology: str = "ring"
+    target_fitness: float = None
+    stagnation_limit: int = None
+    time_limit: float = None
+    anytime: bool = True
+    profile: bool = False
+    profile_hooks: list = None
+    cprofile: bool = False
+    trace_allocations: bool = False
+    checkpoint_path: str = None
+    checkpoint_interval: int = 10
+    resume_from: str = None
+    seed: int = None
+
+    def __post_init__(self):
+        if self.checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1.")
+
+
+@dataclass
+class TimetableResult:
+    """
+    Outcome of TimetableEngine.run. It unpacks and indexes like the tuple run()
+    used to return, ``(timetable, teacher_availability, lab_availability, fitness)``,
+    and also carries why and when the run stopped.
+    """
+    timetable: dict
+    teacher_availability: dict
+    lab_availability: dict
+    fitness: float
+    stop_reason: str
+    generations: int
+    elapsed: float
+    profile: dict = None
+    seed: int = None
+
+    def as_tuple(self) -> tuple:
+        return (self.timetable, self.teacher_availability, self.lab_availability, int(self.fitness))
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __len__(self):
+        return len(self.as_tuple())
+
+    def __getitem__(self, index):
+        return self.as_tuple()[index]
+
+
+@dataclass
+class GenerationProgress:
+    """
+    What TimetableEngine.iter_run yields after every generation. The best
+    chromosome is not copied into the record: ``best_timetable()`` fetches it on
+    demand. In island mode it has to be fetched before the generator resumes.
+    """
+    generation: int
+    best_score: float
+    mean_score: float
+    worst_score: float
+    diversity: float
+    elapsed: float
+    stop_reason: str = None
+    best_loader: object = field(default=None, repr=False, compare=False)
+
+    def best_timetable(self) -> dict:
+        return self.best_loader()
+
+    def as_dict(self) -> dict:
+        """JSON-ready fields, without the chromosome."""
+        return {
+            "generation": self.generation,
+            "best_score": self.best_score,
+            "mean_score": self.mean_score,
+            "worst_score": self.worst_score,
+            "diversity": self.diversity,
+            "elapsed": self.elapsed,
+            "stop_reason": self.stop_reason,
+        }
 
 
 class TimetableEngine:
@@ -47,12 +150,11 @@ class TimetableEngine:
     
     def __init__(self, config: TimetableConfig):
         self.config = config
-        self.teacher_availability = copy.deepcopy(config.teacher_availability_matrix)
-        self.lab_availability = copy.deepcopy(config.lab_availability_matrix)
+        self.teacher_availability = AvailabilityMatrix.coerce(config.teacher_availability_matrix).copy()
+        self.lab_availability = AvailabilityMatrix.coerce(config.lab_availability_matrix).copy()
         
         # Set working days
         if config.working_days:
-            from algorithm.constants import Defaults
             defaults = Defaults({'working_days': config.working_days})
             self.working_days = defaults.working_days
         else:
@@ -61,7 +163,7 @@ class TimetableEngine:
 
     def _update_lab_availability(self, best_timetable):
         """Update lab availability based on best timetable."""
-        updated_lab = copy.deepcopy(self.config.lab_availability_matrix)
+        updated_lab = self.lab_availability.copy()
         for weekday, daily_schedule in best_timetable.items():
             day_index = self.config.day_map.get(weekday)
             if day_index is None:
@@ -70,15 +172,12 @@ class TimetableEngine:
                 for alloc in allocations:
                     lab = alloc.get("classroom_id")
                     ts_index = self.config.time_slot_map.get(alloc.get("time_slot"))
-                    if lab in updated_lab and ts_index is not None:
-                        if (day_index < len(updated_lab[lab]) and 
-                            ts_index - 1 < len(updated_lab[lab][day_index])):
-                            updated_lab[lab][day_index][ts_index - 1] = False
-        return updated_lab
-
-    def _generate_timetable(self, teacher_matrix):
-        """Generate a single generation of timetables."""
-        tg = TimeTableGeneration(
+                    if ts_index is not None and updated_lab.is_free(lab, day_index, ts_index - 1):
+                        updated_lab.occupy(lab, day_index, ts_index - 1)
+        return updated_lab.to_dict()
+
+    def _problem(self, teacher_matrix) -> dict:
+        return dict(
             teacher_subject_mapping=self.config.teacher_subject_mapping,
             total_sections=self.config.total_sections,
             total_classrooms=self.config.total_classrooms,
@@ -92,96 +191,517 @@ class TimetableEngine:
             teacher_availability_matrix=teacher_matrix,
             lab_availability_matrix=self.lab_availability,
             time_slots=self.config.time_slots,
-            fixed_teacher_assignment=self.config.fixed_teacher_assignment or {}
+            fixed_teacher_assignment=self.config.fixed_teacher_assignment or {},
+        )
+
+    def _population_size(self) -> int:
+        """Number of chromosomes kept alive between generations."""
+        return self.config.population_size or min(self.config.total_generations, 10)
+
+    def _fitness_evaluator(self) -> TimetableFitnessEvaluator:
+        return TimetableFitnessEvaluator(
+            timetable={},
+            all_sections=list(self.config.total_sections.keys()),
+            subject_teacher_mapping=self.config.teacher_subject_mapping,
+            available_classrooms=list(self.config.total_classrooms.keys()),
+            available_labs=list(self.config.total_labs.keys()),
+            classroom_capacity=self.config.total_classrooms,
+            section_student_strength=self.config.total_sections,
+            subject_quota_data=self.config.subject_quota_limits,
+            teacher_time_preferences=self.config.teacher_preferences,
+            teacher_daily_workload=self.config.teacher_weekly_workload,
+            time_slots=self.config.time_slots,
         )
 
-        # Generate multiple weeks (chromosomes)
-        num_weeks = self.config.total_generations if self.config.total_generations < 10 else 10
-        timetable, updated_teacher, _ = tg.create_timetable(num_weeks)
-
-        # Evaluate fitness
-        fitness = TimetableFitnessEvaluator(
-            timetable=timetable,
-            all_sections=list(tg.sections_manager.keys()),
-            subject_teacher_mapping=tg.subject_teacher_mapping,
-            available_classrooms=list(tg.classrooms_manager.keys()),
-            available_labs=list(tg.lab_capacity_manager.keys()),
-            classroom_capacity=tg.classrooms_manager,
-            section_student_strength=tg.sections_manager,
-            subject_quota_data=tg.subject_quota_limits,
-            teacher_time_preferences=tg.teacher_availability_preferences,
-            teacher_daily_workload=tg.weekly_workload,
+    def _batch_evaluator(self) -> BatchFitnessEvaluator:
+        return BatchFitnessEvaluator(
+            all_sections=list(self.config.total_sections.keys()),
+            subject_teacher_mapping=self.config.teacher_subject_mapping,
+            available_classrooms=list(self.config.total_classrooms.keys()),
+            available_labs=list(self.config.total_labs.keys()),
+            classroom_capacity=self.config.total_classrooms,
+            section_student_strength=self.config.total_sections,
+            subject_quota_data=self.config.subject_quota_limits,
+            teacher_time_preferences=self.config.teacher_preferences,
+            teacher_daily_workload=self.config.teacher_weekly_workload,
+            # No teacher_duty_days: TimetableFitnessEvaluator skips penalty 5 here
             time_slots=self.config.time_slots,
-        ).evaluate_timetable_fitness()
+        )
+
+    def _score(self, key: str, chromosome: dict):
+        # Each chromosome is scored on its own: the evaluator carries teacher
+        # workload across the weeks it is given, which would make a score depend
+        # on the rest of the batch and not be comparable across generations.
+        self.profiler.count("evaluations")
+        self.fitness_evaluator.timetable = {key: chromosome}
+        return self.fitness_evaluator.evaluate_timetable_fitness()[1][key]
+
+    def _batch_scores(self, chromosomes: dict) -> dict:
+        # independent=True restarts the workload count per chromosome, as _score does
+        self.profiler.count("evaluations", len(chromosomes))
+        stacked = StackedPopulation.from_timetable(self.gene_codec, chromosomes)
+        return self.batch_evaluator.evaluate(stacked, independent=True)[1]
+
+    def _evaluate(self, chromosomes: dict) -> dict:
+        """
+        Scores of ``chromosomes`` through the fitness cache. The misses are scored
+        one by one, or together by the batch evaluator when ``batch_fitness`` is set.
+        """
+        scores = {}
+        with self.profiler.phase("fitness"):
+            week_hashes = {}
+            for key, chromosome in chromosomes.items():
+                day_hashes = self.day_hashes[key] = self.zobrist.day_hashes(chromosome)
+                week_hashes[key] = self.zobrist.week_hash(day_hashes)
+            if self.batch_evaluator is None:
+                for key, chromosome in chromosomes.items():
+                    scores[key] = self.fitness_cache.get_or_compute(
+                        week_hashes[key], lambda: self._score(key, chromosome)
+                    )
+                return scores
+
+            for key, week_hash in week_hashes.items():
+                scores[key] = self.fitness_cache.get(week_hash)
+            missing = {key: chromosomes[key] for key, score in scores.items() if score is None}
+            if missing:
+                scores.update(self._batch_scores(missing))
+                for key in missing:
+                    self.fitness_cache.put(week_hashes[key], scores[key])
+        return scores
+
+    def _new_chromosomes(self, count: int) -> dict:
+        with self.profiler.phase("population"):
+            chromosomes = self.population_builder.build(
+                count, self.streams.spawn("population", count), first_week=self._next_week
+            )
+        self.profiler.count("chromosomes_built", count)
+        self._next_week += count
+        return chromosomes
+
+    def _next_key(self) -> str:
+        key = f"Week {self._next_week}"
+        self._next_week += 1
+        return key
 
-        # Selection
-        selected = TimeTableSelection().select_chromosomes(fitness[1])
-        if self.config.prev_selected:
-            selected.update(self.config.prev_selected)
+    def _initialize_population(self):
+        self.population = self._new_chromosomes(self._population_size())
+        self.fitness_scores = self._evaluate(self.population)
 
-        # Crossover
-        crossover = TimeTableCrossOver()
-        crossover_chromosomes = []
+    def _tracker(self, key: str):
+        tracker = self.trackers.get(key)
+        if tracker is None:
+            tracker = self.fitness_evaluator.incremental(self.population[key])
+            self.trackers[key] = tracker
+        return tracker
+
+    def _child_tracker(self, child: dict, parents: tuple):
+        """
+        Copy the tracker of the parent that shares the most days with ``child`` and
+        rescore only the days that came from the other parent.
+        """
+        def shared_days(key):
+            parent = self.population[key]
+            if set(parent) != set(child):
+                return -1
+            return sum(parent[day] is child[day] for day in child)
+
+        base = max(parents, key=shared_days)
+        if shared_days(base) < 0:
+            return self.fitness_evaluator.incremental(child)
+        tracker = self._tracker(base).copy()
+        for day, day_schedule in child.items():
+            if self.population[base][day] is not day_schedule:
+                tracker.replace_day(day, day_schedule)
+        return tracker
+
+    def _day_hashes(self, key: str) -> dict:
+        day_hashes = self.day_hashes.get(key)
+        if day_hashes is None:
+            day_hashes = self.day_hashes[key] = self.zobrist.day_hashes(self.population[key])
+        return day_hashes
+
+    def _child_day_hashes(self, child: dict, parents: tuple) -> dict:
+        day_hashes = {}
+        for day, day_schedule in child.items():
+            for parent in parents:
+                if self.population[parent].get(day) is day_schedule:
+                    day_hashes[day] = self._day_hashes(parent)[day]
+                    break
+            else:
+                day_hashes[day] = self.zobrist.day_hash(day, day_schedule)
+        return day_hashes
+
+    def _crossover(self):
+        """
+        The configured crossover as a ``(parent1, parent2) -> (child1, child2)``
+        callable; the legacy working-day swap unless ``crossover_strategy`` names
+        an operator from the crossover module.
+        """
+        name = self.config.crossover_strategy
+        if name is None:
+            return TimeTableCrossOver().perform_crossover
+        kwargs = {"rng": self.streams.python("crossover")}
+        if name == SlotBlockCrossover.name:
+            kwargs["time_slots"] = self.config.time_slots
+        return get_crossover(name, **kwargs).cross
+
+    def _breed(self, selected: dict) -> tuple:
+        """
+        Cross over, mutate and repair the selected parents. A child whose hash is
+        already in the fitness cache costs a lookup; the others are delta-scored from
+        a parent. The number of double-bookings repaired is appended to
+        ``repair_history``.
+        """
+        profiler = self.profiler
+        crossover = self._crossover()
+        mutation = TimeTableMutation(rng=self.streams.python("mutation"))
+        repair = ConflictRepair(self.config.time_slots) if self.config.repair_conflicts else None
+        offspring = {}
+        offspring_scores = {}
+        conflicts_repaired = 0
         selected_keys = list(selected.keys())
-        for i in range(0, len(selected_keys), 2):
-            if i + 1 < len(selected_keys):
-                c1, c2 = crossover.perform_crossover(
-                    timetable[selected_keys[i]], timetable[selected_keys[i + 1]]
+        for i in range(0, len(selected_keys) - 1, 2):
+            parents = (selected_keys[i], selected_keys[i + 1])
+            with profiler.phase("crossover"):
+                c1, c2 = crossover(self.population[parents[0]], self.population[parents[1]])
+            for child in (c1, c2):
+                changes = []
+                key = self._next_key()
+                with profiler.phase("mutation"):
+                    offspring[key] = mutation.mutate_schedule_for_week(child, changes)
+                if repair is not None:
+                    with profiler.phase("repair"):
+                        repair_changes = []
+                        offspring[key], repaired = repair.repair(offspring[key], repair_changes)
+                        changes = repair.merge_changes(offspring[key], changes, repair_changes)
+                        conflicts_repaired += repaired
+                with profiler.phase("fitness"):
+                    day_hashes = self.zobrist.apply(
+                        self._child_day_hashes(child, parents), child, changes
+                    )
+                    self.day_hashes[key] = day_hashes
+                    week_hash = self.zobrist.week_hash(day_hashes)
+
+                    score = self.fitness_cache.get(week_hash)
+                    if score is None:
+                        tracker = self._child_tracker(child, parents)
+                        score = tracker.apply(changes)
+                        self.trackers[key] = tracker
+                        self.fitness_cache.put(week_hash, score)
+                        profiler.count("delta_evaluations")
+                offspring_scores[key] = score
+        profiler.count("offspring", len(offspring))
+        profiler.count("conflicts_repaired", conflicts_repaired)
+        self.repair_history.append(conflicts_repaired)
+        return offspring, offspring_scores
+
+    def receive_migrants(self, chromosomes: list):
+        """
+        Add chromosomes from another population in place of the weakest ones, so
+        the population size stays the same.
+        """
+        incoming = {self._next_key(): chromosome for chromosome in chromosomes}
+        incoming_scores = self._evaluate(incoming)
+        ranked = sorted(self.fitness_scores, key=self.fitness_scores.get)
+        for key in ranked[: min(len(incoming), len(ranked) - 1)]:
+            del self.population[key], self.fitness_scores[key]
+            self.trackers.pop(key, None)
+            self.day_hashes.pop(key, None)
+        self.population.update(incoming)
+        self.fitness_scores.update(incoming_scores)
+
+    def _iter_islands(self, stop: StopCriteria):
+        """
+        Evolve ``config.islands`` populations through an IslandModel, yielding
+        progress after every epoch. Each island's best chromosome then becomes
+        the final population, and the number of generations run is returned.
+        """
+        self.island_model = IslandModel(type(self), self.config, self.streams)
+        for stats in self.island_model.iter_run(stop):
+            population = sum(island["population"] for island in stats)
+            yield GenerationProgress(
+                generation=self.island_model.generation,
+                best_score=max(island["best_score"] for island in stats),
+                mean_score=sum(island["mean_score"] * island["population"] for island in stats)
+                / population,
+                worst_score=min(island["worst_score"] for island in stats),
+                diversity=sum(island["distinct"] for island in stats) / population,
+                elapsed=stop.elapsed,
+                stop_reason=stop.reason,
+                best_loader=lambda: self.island_model.best()[0],
+            )
+        champions = self.island_model.champions
+        self.population = {self._next_key(): chromosome for chromosome, _ in champions}
+        self.fitness_scores = self._evaluate(self.population)
+        return self.island_model.generation
+
+    def _polish(self, keys: list, max_moves: int) -> int:
+        """
+        Run local search on the chromosomes at ``keys`` in place of the population
+        and return the number of conflicts it removed. Hashes and trackers follow
+        the change set, so the scores stay delta-evaluated.
+        """
+        search = LocalSearch(
+            self.config.time_slots, max_moves=max_moves, rng=self.streams.python("search")
+        )
+        removed = 0
+        with self.profiler.phase("local_search"):
+            for key in keys:
+                changes = []
+                polished, conflicts_removed = search.polish(self.population[key], changes)
+                if not changes:
+                    continue
+                self.day_hashes[key] = self.zobrist.apply(
+                    self._day_hashes(key), self.population[key], changes
                 )
-                crossover_chromosomes.extend([c1, c2])
-
-        # Mutation
-        mutated = [TimeTableMutation().mutate_schedule_for_week(ch) for ch in crossover_chromosomes]
-        if self.config.prev_mutated:
-            mutated.extend(self.config.prev_mutated)
-
-        # Find best chromosome
-        best_chromosome, best_score = None, -1
-        for key, score in selected.items():
-            score = int(score)
-            if score > best_score and key in timetable:
-                best_score = score
-                best_chromosome = timetable[key]
-
-        if best_chromosome:
-            updated_teacher = update_teacher_availability_matrix(teacher_matrix, best_chromosome)
-        
-        return best_chromosome, updated_teacher, selected, mutated, best_score
+                self.fitness_scores[key] = self._tracker(key).apply(changes)
+                self.population[key] = polished
+                removed += conflicts_removed
+        return removed
 
-    def run(self):
-        """Run the genetic algorithm to generate optimal timetable."""
-        initial_teacher = copy.deepcopy(self.teacher_availability)
-        updated_teacher = copy.deepcopy(initial_teacher)
-        best_chromosome = None
-        best_score = -1
+    def _evolve(self):
+        """
+        One generation: select parents, breed and score offspring, then build the
+        next population from the elites, the fresh immigrants and the fittest of the
+        remaining parents and offspring. With ``memetic_moves`` set, the elites are
+        polished by local search first.
+        """
+        with self.profiler.phase("selection"):
+            selection = TimeTableSelection(
+                self.config.selection_strategy, self.streams.numpy("selection")
+            )
+            selected = selection.select_chromosomes(self.fitness_scores)
+        offspring, offspring_scores = self._breed(selected)
 
+        size = self._population_size()
+        ranked = sorted(self.fitness_scores, key=self.fitness_scores.get, reverse=True)
+        elite_keys = ranked[: min(self.config.elite_count, size)]
+        if self.config.memetic_moves:
+            self.local_search_history.append(
+                self._polish(elite_keys, self.config.memetic_moves)
+            )
+        immigrants = self._new_chromosomes(
+            max(0, min(self.config.immigrant_count, size - len(elite_keys)))
+        )
+        immigrant_scores = self._evaluate(immigrants)
+
+        with self.profiler.phase("replacement"):
+            candidates = {key: self.fitness_scores[key] for key in ranked[len(elite_keys):]}
+            candidates.update(offspring_scores)
+            open_slots = size - len(elite_keys) - len(immigrants)
+            survivors = sorted(candidates, key=candidates.get, reverse=True)[:open_slots]
+
+            pool = {**self.population, **offspring, **immigrants}
+            scores = {**self.fitness_scores, **offspring_scores, **immigrant_scores}
+            keys = elite_keys + survivors + list(immigrants)
+            self.population = {key: pool[key] for key in keys}
+            self.fitness_scores = {key: scores[key] for key in keys}
+            self.trackers = {key: self.trackers[key] for key in keys if key in self.trackers}
+            self.day_hashes = {
+                key: self.day_hashes[key] for key in keys if key in self.day_hashes
+            }
+
+        self.config.prev_selected = selected
+        self.config.prev_mutated = list(offspring.values())
+
+    def _reset_state(self):
         self.config.prev_selected = None
         self.config.prev_mutated = None
+        self._next_week = 1
+        self.fitness_evaluator = self._fitness_evaluator()
+        self.fitness_cache = FitnessCache(self.config.fitness_cache_size)
+        self.batch_evaluator = self._batch_evaluator() if self.config.batch_fitness else None
+        self.gene_codec = GeneCodec()
+        # Hash only what the score depends on, so that equal-scoring duplicates
+        # (e.g. slot shuffles that map to the same slot) share a cache entry.
+        self.zobrist = ZobristKeys(gene=self.fitness_evaluator.fitness_gene)
+        self.trackers = {}
+        self.day_hashes = {}
+        self.repair_history = []
+        self.local_search_history = []
+        self.polished_conflicts = 0
+        self.profiler = Profiler.from_config(self.config)
+        self.streams = SeedStreams(self.config.seed)
+        self.seed = self.streams.seed
+
+    def best(self) -> tuple:
+        """Fittest chromosome of the current population and its score."""
+        best_key = max(self.fitness_scores, key=self.fitness_scores.get)
+        return self.population[best_key], self.fitness_scores[best_key]
+
+    def checkpoint(self, generation: int) -> Checkpoint:
+        """Snapshot of the run in progress after ``generation`` generations."""
+        stop = self.stop_criteria
+        return Checkpoint(
+            generation=generation,
+            next_week=self._next_week,
+            population=self.population,
+            fitness_scores=self.fitness_scores,
+            random_state=self.streams.getstate(),
+            elapsed=stop.elapsed,
+            best=stop.best,
+            best_generation=stop.best_generation,
+            cache=dict(self.fitness_cache.items()),
+            repair_history=self.repair_history,
+            local_search_history=self.local_search_history,
+        )
 
-        # Run for specified number of generations
-        for generation in range(self.config.total_generations):
-            teacher_copy = copy.deepcopy(initial_teacher)
-            best, updated_teacher, selected, mutated, score = self._generate_timetable(teacher_copy)
-            
-            if best and score > best_score:
-                best_chromosome = best
-                best_score = score
+    def _restore(self, checkpoint: Checkpoint) -> int:
+        """
+        Continue from ``checkpoint`` in place of a fresh population and return
+        its generation. The random streams come back as well, so the rest of the
+        run is the same as if it had never stopped.
+        """
+        self.population = dict(checkpoint.population)
+        self.fitness_scores = dict(checkpoint.fitness_scores)
+        self._next_week = checkpoint.next_week
+        self.repair_history = list(checkpoint.repair_history)
+        self.local_search_history = list(checkpoint.local_search_history)
+        for week_hash, score in checkpoint.cache.items():
+            self.fitness_cache.put(week_hash, score)
+        stop = self.stop_criteria
+        stop.started -= checkpoint.elapsed
+        stop.best = checkpoint.best
+        stop.best_generation = checkpoint.best_generation
+        self.streams.setstate(checkpoint.random_state)
+        self.seed = self.streams.seed
+        return checkpoint.generation
 
-            self.config.prev_selected = selected
-            self.config.prev_mutated = mutated
+    def _progress(self, generation: int, stop: StopCriteria) -> GenerationProgress:
+        """Progress record of the current population."""
+        scores = self.fitness_scores
+        population = self.population
+        best_key = max(scores, key=scores.get)
+        distinct = {self.zobrist.week_hash(self._day_hashes(key)) for key in population}
+        return GenerationProgress(
+            generation=generation,
+            best_score=scores[best_key],
+            mean_score=sum(scores.values()) / len(scores),
+            worst_score=min(scores.values()),
+            diversity=len(distinct) / len(population),
+            elapsed=stop.elapsed,
+            stop_reason=stop.reason,
+            best_loader=lambda: population[best_key],
+        )
+
+    def replay(self, result: TimetableResult) -> TimetableResult:
+        """
+        Run again from ``result.seed`` for ``result.generations`` generations. Every
+        component draws from its own stream of that seed, so the replay returns
+        the same timetable and scores bit for bit, whatever the worker count, also
+        for a run that a time limit or ``cancel()`` cut short.
+        """
+        config = replace(
+            self.config,
+            seed=result.seed,
+            total_generations=result.generations,
+            time_limit=None,
+            checkpoint_path=None,
+            resume_from=None,
+        )
+        return type(self)(config).run()
+
+    def cancel(self):
+        """Stop a run in progress after the current generation, keeping its best."""
+        self.stop_criteria.cancel()
+
+    def run(self):
+        """Run the genetic algorithm to generate optimal timetable."""
+        for _ in self.iter_run():
+            pass
+        return self.result
+
+    def iter_run(self):
+        """
+        Run the GA one generation at a time, yielding a GenerationProgress after
+        each one (after each migration epoch in island mode). The last record
+        carries the stop reason. The generator returns the TimetableResult and
+        also keeps it on ``result``; ``cancel()`` between steps ends the run early
+        with stop reason "cancelled". When the config enables profiling, the
+        result's ``profile`` holds the Profiler report.
+
+        With ``checkpoint_path`` set, a Checkpoint is saved there every
+        ``checkpoint_interval`` generations, and ``resume_from`` continues the
+        run saved in a checkpoint file. Island mode does not checkpoint.
+        """
+        teacher_matrix = self.teacher_availability.copy()
+        self._reset_state()
+        self.result = None
+        profiler = self.profiler
+        profiler.start()
 
-        # Update teacher availability for final best timetable
-        if best_chromosome:
+        stop = self.stop_criteria = StopCriteria.from_config(self.config)
+        if self.config.islands > 1:
+            if self.config.checkpoint_path or self.config.resume_from:
+                raise ValueError("Checkpoints are not supported in island mode.")
+            for progress in self._iter_islands(stop):
+                profiler.suspend()
+                yield progress
+                profiler.resume()
+            generation = self.island_model.generation
+        else:
+            problem = self._problem(teacher_matrix)
+            with PopulationBuilder(problem, self.config.workers) as builder:
+                self.population_builder = builder
+                if self.config.resume_from:
+                    generation = self._restore(Checkpoint.load(self.config.resume_from))
+                else:
+                    self._initialize_population()
+                    generation = 0
+                stop.check(generation, self.best()[1])
+                while not stop.reason:
+                    self._evolve()
+                    generation += 1
+                    with profiler.phase("best"):
+                        best_score = self.best()[1]
+                    stop.check(generation, best_score)
+                    if (
+                        self.config.checkpoint_path
+                        and generation % self.config.checkpoint_interval == 0
+                    ):
+                        with profiler.phase("checkpoint"):
+                            self.checkpoint(generation).save(self.config.checkpoint_path)
+                    progress = self._progress(generation, stop)
+                    profiler.suspend()
+                    yield progress
+                    profiler.resume()
+        profiler.count("generations", generation)
+
+        if self.config.polish_moves:
+            best_key = max(self.fitness_scores, key=self.fitness_scores.get)
+            self.polished_conflicts = self._polish([best_key], self.config.polish_moves)
+
+        best_chromosome, best_score = self.best()
+        with profiler.phase("matrices"):
             updated_teacher = update_matrix_for_best(
                 best_chromosome,
-                updated_teacher,
+                teacher_matrix,
                 self.config.day_map,
                 self.config.time_slot_map,
             )
+            updated_lab = self._update_lab_availability(best_chromosome)
 
-        updated_lab = self._update_lab_availability(best_chromosome) if best_chromosome else self.lab_availability
-        
-        return best_chromosome, updated_teacher, updated_lab, best_score
+        profiler.count("cache_hits", self.fitness_cache.hits)
+        profiler.count("cache_misses", self.fitness_cache.misses)
+        profiler.stop()
+        result = self.result = TimetableResult(
+            timetable=best_chromosome,
+            teacher_availability=updated_teacher.to_dict(),
+            lab_availability=updated_lab,
+            fitness=best_score,
+            stop_reason=stop.reason,
+            generations=generation,
+            elapsed=stop.elapsed,
+            profile=profiler.report(),
+            seed=self.seed,
+        )
+        if stop.reason == "time_limit" and not self.config.anytime:
+            raise GenerationTimeout(
+                f"Time limit of {self.config.time_limit}s reached after {generation} "
+                f"generations.",
+                result,
+            )
+        return result
 
 
 def run_timetable_generation(
@@ -203,6 +723,8 @@ def run_timetable_generation(
     time_slot_map: dict,
     fixed_teacher_assignment: dict = None,
     working_days: list = None,
+    stream: bool = False,
+    **options,
 ):
     """Main function to run timetable generation."""
     config = TimetableConfig(
@@ -224,6 +746,15 @@ def run_timetable_generation(
         time_slot_map=time_slot_map,
         fixed_teacher_assignment=fixed_teacher_assignment or {},
         working_days=working_days,
+        **options,
     )
     engine = TimetableEngine(config)
-    return engine.run()
+    return engine.iter_run() if stream else engine.run()
+
+
+def iter_timetable_generation(*args, **kwargs):
+    """
+    Takes the arguments of run_timetable_generation and returns the engine's
+    iter_run() generator, whose return value is the TimetableResult.
+    """
+    return run_timetable_generation(*args, stream=True, **kwargs)
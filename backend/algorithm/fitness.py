@@ -1,4 +1,6 @@
 import json
+from bisect import bisect_left, insort
+from math import floor
 
 from algorithm.constants import Defaults, PenaltyConstants
 from algorithm.chromosome import TimeTableGeneration
@@ -132,6 +134,229 @@ class TimetableFitnessEvaluator:
 
         return daily_section_fitness_scores, weekly_fitness_scores
 
+    def is_non_duty_day(self, teacher, day) -> bool:
+        # teacher_duty_days is not passed to the evaluator, so the check is skipped
+        return False
+
+    def fitness_gene(self, entry: dict) -> tuple:
+        """The (teacher, classroom, mapped time slot) values an entry is scored on."""
+        return (
+            entry["teacher_id"],
+            entry["classroom_id"],
+            self.time_slots.get(entry["time_slot"]),
+        )
+
+    def incremental(self, week_schedule: dict) -> "IncrementalFitness":
+        """Delta-scoring tracker for one weekly schedule, see IncrementalFitness."""
+        return IncrementalFitness(self, week_schedule)
+
+
+class IncrementalFitness:
+    """
+    Weekly fitness of one chromosome, kept up to date under small edits.
+
+    The score equals ``evaluate_timetable_fitness`` on ``{week: schedule}``, but it is
+    held as counters (teacher and classroom bookings per slot, per-entry penalties and
+    the sections in which each teacher teaches) so that a change set only touches the
+    entries it names. A change is ``(day, section, index, entry)`` and replaces the
+    entry at that position; ``update_section`` and ``replace_day`` derive the change
+    set for a whole section or day.
+    """
+
+    def __init__(self, evaluator, week_schedule: dict):
+        self.evaluator = evaluator
+        self.rebuild(week_schedule)
+
+    def rebuild(self, week_schedule: dict):
+        self.genes = {}
+        self.ordinals = {}
+        for day, day_schedule in week_schedule.items():
+            self.genes[day] = {}
+            for section, entries in day_schedule.items():
+                self.ordinals[(day, section)] = len(self.ordinals)
+                self.genes[day][section] = []
+
+        self.teacher_bookings = {}
+        self.classroom_bookings = {}
+        self.teacher_sections = {}
+        self.overload = {}
+        self.entry_penalty = 0
+        self.teacher_conflicts = 0
+        self.classroom_conflicts = 0
+        self.overload_total = 0
+
+        for day, day_schedule in week_schedule.items():
+            for section, entries in day_schedule.items():
+                genes = self.genes[day][section]
+                for entry in entries:
+                    gene = self._gene(entry)
+                    genes.append(gene)
+                    self._add(day, section, gene)
+
+    @property
+    def score(self):
+        penalties = self.evaluator.penalty_constants
+        return (
+            len(self.ordinals) * self.evaluator.defaults.starting_section_fitness
+            - self.entry_penalty
+            - self.teacher_conflicts * penalties.PENALTY_TEACHER_DOUBLE_BOOKED
+            - self.classroom_conflicts * penalties.PENALTY_CLASSROOM_DOUBLE_BOOKED
+            - self.overload_total * penalties.PENALTY_OVERLOAD_TEACHER
+        )
+
+    def copy(self):
+        clone = IncrementalFitness.__new__(IncrementalFitness)
+        clone.evaluator = self.evaluator
+        clone.genes = {
+            day: {section: list(genes) for section, genes in day_genes.items()}
+            for day, day_genes in self.genes.items()
+        }
+        clone.ordinals = self.ordinals
+        clone.teacher_bookings = dict(self.teacher_bookings)
+        clone.classroom_bookings = dict(self.classroom_bookings)
+        clone.teacher_sections = {
+            teacher: list(sections) for teacher, sections in self.teacher_sections.items()
+        }
+        clone.overload = dict(self.overload)
+        clone.entry_penalty = self.entry_penalty
+        clone.teacher_conflicts = self.teacher_conflicts
+        clone.classroom_conflicts = self.classroom_conflicts
+        clone.overload_total = self.overload_total
+        return clone
+
+    def apply(self, changes):
+        """
+        Apply ``(day, section, index, entry)`` changes and return the new score.
+        """
+        for day, section, index, entry in changes:
+            genes = self.genes[day][section]
+            old, new = genes[index], self._gene(entry)
+            if old == new:
+                continue
+            self._remove(day, section, old, old[0] != new[0])
+            genes[index] = new
+            self._add(day, section, new, old[0] != new[0])
+        return self.score
+
+    def section_changes(self, day: str, section: str, entries: list) -> list:
+        genes = self.genes[day][section]
+        if len(genes) != len(entries):
+            raise ValueError("A section change set cannot add or remove entries.")
+        return [
+            (day, section, index, entry)
+            for index, (gene, entry) in enumerate(zip(genes, entries))
+            if gene != self._gene(entry)
+        ]
+
+    def update_section(self, day: str, section: str, entries: list):
+        return self.apply(self.section_changes(day, section, entries))
+
+    def replace_day(self, day: str, day_schedule: dict):
+        """
+        Swap in a new schedule for ``day``, e.g. after a day-swap crossover. When the
+        day holds a different set of sections the whole week is rescored.
+        """
+        if set(day_schedule) != set(self.genes[day]):
+            week = self.schedule()
+            week[day] = day_schedule
+            self.rebuild(week)
+            return self.score
+
+        for section, genes in self.genes[day].items():
+            for gene in genes:
+                self._remove(day, section, gene)
+        first = min(self.ordinals[(day, section)] for section in day_schedule)
+        self.ordinals = dict(self.ordinals)
+        self.genes[day] = {}
+        for position, (section, entries) in enumerate(day_schedule.items()):
+            self.ordinals[(day, section)] = first + position
+            genes = self.genes[day][section] = [self._gene(entry) for entry in entries]
+            for gene in genes:
+                self._add(day, section, gene)
+        return self.score
+
+    def schedule(self) -> dict:
+        """The tracked schedule as (teacher, classroom, slot) tuples, not entry dicts."""
+        return {
+            day: {section: list(genes) for section, genes in day_genes.items()}
+            for day, day_genes in self.genes.items()
+        }
+
+    def _gene(self, entry) -> tuple:
+        if isinstance(entry, tuple):
+            return entry
+        return self.evaluator.fitness_gene(entry)
+
+    def _entry_penalty(self, day, section, gene) -> int:
+        evaluator = self.evaluator
+        penalties = evaluator.penalty_constants
+        teacher, classroom, time_slot = gene
+        penalty = 0
+        if evaluator.section_student_strength.get(section, 0) > evaluator.classroom_capacity.get(
+            classroom, evaluator.defaults.max_class_capacity
+        ):
+            penalty += penalties.PENALTY_OVER_CAPACITY
+        if time_slot not in evaluator.teacher_time_preferences.get(teacher, []):
+            penalty += penalties.PENALTY_UN_PREFERRED_SLOT
+        if evaluator.is_non_duty_day(teacher, day):
+            penalty += penalties.PENALTY_NON_DUTY_DAY
+        return penalty
+
+    def _add(self, day, section, gene, move_teacher=True):
+        teacher, classroom, time_slot = gene
+        self.entry_penalty += self._entry_penalty(day, section, gene)
+
+        key = (teacher, time_slot)
+        count = self.teacher_bookings.get(key, 0)
+        self.teacher_conflicts += count > 0
+        self.teacher_bookings[key] = count + 1
+
+        key = (day, section, classroom, time_slot)
+        count = self.classroom_bookings.get(key, 0)
+        self.classroom_conflicts += count > 0
+        self.classroom_bookings[key] = count + 1
+
+        if move_teacher and teacher is not None:
+            insort(self.teacher_sections.setdefault(teacher, []), self.ordinals[(day, section)])
+            self._update_overload(teacher)
+
+    def _remove(self, day, section, gene, move_teacher=True):
+        teacher, classroom, time_slot = gene
+        self.entry_penalty -= self._entry_penalty(day, section, gene)
+
+        key = (teacher, time_slot)
+        count = self.teacher_bookings[key] - 1
+        self.teacher_conflicts -= count > 0
+        if count:
+            self.teacher_bookings[key] = count
+        else:
+            del self.teacher_bookings[key]
+
+        key = (day, section, classroom, time_slot)
+        count = self.classroom_bookings[key] - 1
+        self.classroom_conflicts -= count > 0
+        if count:
+            self.classroom_bookings[key] = count
+        else:
+            del self.classroom_bookings[key]
+
+        if move_teacher and teacher is not None:
+            sections = self.teacher_sections[teacher]
+            del sections[bisect_left(sections, self.ordinals[(day, section)])]
+            self._update_overload(teacher)
+
+    def _update_overload(self, teacher):
+        """
+        The evaluator charges the overload penalty after every section once a teacher's
+        running count exceeds the workload, i.e. from the section holding the
+        (workload + 1)-th class up to the last section of the week.
+        """
+        sections = self.teacher_sections[teacher]
+        limit = max(floor(self.evaluator.teacher_daily_workload.get(teacher, 0)) + 1, 1)
+        overload = len(self.ordinals) - sections[limit - 1] if len(sections) >= limit else 0
+        self.overload_total += overload - self.overload.get(teacher, 0)
+        self.overload[teacher] = overload
+
 
 if __name__ == "__main__":
     total_sections = 6
@@ -0,0 +1,141 @@
+"""
+Content-hashed fitness memoization for chromosomes.
+"""
+from collections import OrderedDict
+from hashlib import blake2b
+
+from algorithm.encoding import GENE_FIELDS
+
+
+class ZobristKeys:
+    """
+    Zobrist hashing for weekly schedules.
+
+    Every feature of a chromosome (an entry at a (day, section, index) position, or
+    a day at a position in the week) gets a 64-bit key, and the chromosome hash is
+    the XOR of the keys of its features. Changing one entry updates the hash with
+    two XORs, and a day swapped in by crossover brings its day hash along. Keys are
+    derived with blake2b from the feature itself, so hashes are stable across runs
+    and worker processes.
+
+    ``gene`` projects an entry onto the values that are hashed. It defaults to all
+    GENE_FIELDS; a fitness cache can pass the fields the score depends on, so that
+    chromosomes differing only in other fields share one cache entry.
+    """
+
+    def __init__(self, salt: bytes = b"", gene=None):
+        self.salt = salt
+        self.gene = gene or self.gene_fields
+        self._keys = {}
+
+    @staticmethod
+    def gene_fields(entry: dict) -> tuple:
+        return tuple(entry.get(field) for field in GENE_FIELDS)
+
+    def key(self, feature: tuple) -> int:
+        key = self._keys.get(feature)
+        if key is None:
+            digest = blake2b(repr(feature).encode(), digest_size=8, salt=self.salt[:16])
+            key = self._keys[feature] = int.from_bytes(digest.digest(), "little")
+        return key
+
+    def entry(self, day, section, index: int, entry: dict) -> int:
+        return self.key((day, section, index) + self.gene(entry))
+
+    def day_hash(self, day, day_schedule: dict) -> int:
+        """Hash of one day's sections in their order; the day's position is not included."""
+        value = 0
+        for position, (section, entries) in enumerate(day_schedule.items()):
+            value ^= self.key(("section", day, position, section))
+            for index, entry in enumerate(entries):
+                value ^= self.entry(day, section, index, entry)
+        return value
+
+    def day_hashes(self, week_schedule: dict) -> dict:
+        return {
+            day: self.day_hash(day, day_schedule) for day, day_schedule in week_schedule.items()
+        }
+
+    def week_hash(self, day_hashes: dict) -> int:
+        value = 0
+        for position, (day, day_hash) in enumerate(day_hashes.items()):
+            value ^= day_hash ^ self.key(("day", position, day))
+        return value
+
+    def apply(self, day_hashes: dict, week_schedule: dict, changes) -> dict:
+        """
+        Day hashes after ``(day, section, index, entry)`` changes to ``week_schedule``,
+        which must still hold the old entries.
+        """
+        day_hashes = dict(day_hashes)
+        for day, section, index, entry in changes:
+            old = week_schedule[day][section][index]
+            day_hashes[day] ^= self.entry(day, section, index, old) ^ self.entry(
+                day, section, index, entry
+            )
+        return day_hashes
+
+
+class FitnessCache:
+    """
+    Bounded LRU map from chromosome hash to fitness, with hit/miss counters.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return default
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        if self.maxsize <= 0:
+            return
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        score = self.get(key)
+        if score is None:
+            score = compute()
+            self.put(key, score)
+        return score
+
+    def clear(self):
+        self._scores.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._scores),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def items(self):
+        """(hash, score) pairs from least to most recently used."""
+        return self._scores.items()
+
+    def __contains__(self, key):
+        return key in self._scores
+
+    def __len__(self):
+        return len(self._scores)
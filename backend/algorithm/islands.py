@@ -0,0 +1,260 @@
+"""
+Island-model GA: independent populations with periodic migration.
+"""
+import multiprocessing
+from dataclasses import replace
+
+from algorithm.population import PopulationBuilder
+from algorithm.seeding import SeedStreams
+
+TOPOLOGIES = ("ring", "random")
+
+
+class Island:
+    """
+    One population of the island model, evolved in steps by its own engine.
+
+    The engine is seeded with the island's ``seed``, so an island follows its own
+    random streams whether it runs in a worker process or next to the other
+    islands in one process.
+    """
+
+    def __init__(self, engine_class, config, index: int, seed: int):
+        self.index = index
+        self.seed = seed
+        self.generation = 0
+        self.migrants_received = 0
+        self.engine = engine_class(replace(config, seed=seed))
+
+    def start(self) -> dict:
+        engine = self.engine
+        engine._reset_state()
+        engine.population_builder = PopulationBuilder(
+            engine._problem(engine.teacher_availability.copy())
+        )
+        engine._initialize_population()
+        return self.stats()
+
+    def evolve(self, generations: int) -> dict:
+        for _ in range(generations):
+            self.engine._evolve()
+        self.generation += generations
+        return self.stats()
+
+    def emigrants(self, count: int) -> list:
+        scores = self.engine.fitness_scores
+        ranked = sorted(scores, key=scores.get, reverse=True)[:count]
+        return [self.engine.population[key] for key in ranked]
+
+    def immigrate(self, chromosomes: list) -> dict:
+        self.engine.receive_migrants(chromosomes)
+        self.migrants_received += len(chromosomes)
+        return self.stats()
+
+    def best(self) -> tuple:
+        return self.engine.best()
+
+    def stats(self) -> dict:
+        engine = self.engine
+        scores = list(engine.fitness_scores.values())
+        hashes = {engine.zobrist.week_hash(engine._day_hashes(key)) for key in engine.population}
+        return {
+            "island": self.index,
+            "seed": self.seed,
+            "generation": self.generation,
+            "best_score": max(scores),
+            "mean_score": sum(scores) / len(scores),
+            "worst_score": min(scores),
+            "distinct": len(hashes),
+            "population": len(scores),
+            "migrants_received": self.migrants_received,
+            "cache_hit_rate": engine.fitness_cache.hit_rate,
+            "conflicts_repaired": sum(engine.repair_history),
+        }
+
+
+def _serve_island(connection, engine_class, config, index: int, seed: int):
+    island = Island(engine_class, config, index, seed)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        method, args = message
+        connection.send(getattr(island, method)(*args))
+    connection.close()
+
+
+class _LocalIsland:
+    def __init__(self, island: Island):
+        self.island = island
+        self._result = None
+
+    def send(self, method: str, *args):
+        self._result = getattr(self.island, method)(*args)
+
+    def receive(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class _ProcessIsland:
+    def __init__(self, engine_class, config, index: int, seed: int):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_serve_island,
+            args=(child, engine_class, config, index, seed),
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def send(self, method: str, *args):
+        self.connection.send((method, args))
+
+    def receive(self):
+        return self.connection.recv()
+
+    def close(self):
+        if self.process.is_alive():
+            self.connection.send(None)
+        self.process.join()
+        self.connection.close()
+
+
+class IslandModel:
+    """
+    ``config.islands`` populations evolved independently. Every
+    ``config.migration_interval`` generations, the ``config.migration_size``
+    fittest chromosomes of every island are copied to another island, where they
+    replace the weakest. The ``ring`` topology sends island i to island i + 1;
+    ``random`` picks a different island for each source on every migration.
+
+    Each island runs in its own process when ``config.workers`` is above one, and
+    all islands run in turn in the calling process otherwise. Every island has its
+    own seed, drawn from the "islands" stream of ``streams`` (a SeedStreams for
+    ``config.seed`` by default) like the migration targets, so both modes give the
+    same result. ``stats`` holds the latest
+    per-island statistics, ``history`` holds the best score of each island
+    after every epoch, and ``champions`` holds each island's best
+    (chromosome, score) once a run is over.
+    """
+
+    def __init__(self, engine_class, config, streams: SeedStreams = None):
+        if config.migration_topology not in TOPOLOGIES:
+            raise ValueError(
+                f"Unknown migration topology {config.migration_topology!r}, "
+                f"expected one of {TOPOLOGIES}."
+            )
+        self.engine_class = engine_class
+        self.config = config
+        self.num_islands = max(1, config.islands)
+        streams = streams or SeedStreams(config.seed)
+        self.seeds = streams.spawn("islands", self.num_islands)
+        self.rng = streams.python("islands")
+        self.stats = []
+        self.history = []
+        self.champions = []
+        self.generation = 0
+        self._islands = []
+
+    def _island_config(self):
+        return replace(
+            self.config,
+            islands=1,
+            workers=1,
+            polish_moves=0,
+            profile=False,
+            profile_hooks=None,
+            cprofile=False,
+            trace_allocations=False,
+        )
+
+    def _open(self) -> list:
+        config = self._island_config()
+        if self.config.workers > 1:
+            return [
+                _ProcessIsland(self.engine_class, config, index, seed)
+                for index, seed in enumerate(self.seeds)
+            ]
+        return [
+            _LocalIsland(Island(self.engine_class, config, index, seed))
+            for index, seed in enumerate(self.seeds)
+        ]
+
+    @staticmethod
+    def _call(islands: list, method: str, *args) -> list:
+        for island in islands:
+            island.send(method, *args)
+        return [island.receive() for island in islands]
+
+    def targets(self) -> list:
+        """Destination island of every source island for one migration."""
+        count = self.num_islands
+        if self.config.migration_topology == "ring":
+            return [(index + 1) % count for index in range(count)]
+        return [
+            self.rng.choice([other for other in range(count) if other != index])
+            for index in range(count)
+        ]
+
+    def _migrate(self, islands: list):
+        emigrants = self._call(islands, "emigrants", self.config.migration_size)
+        arrivals = [[] for _ in islands]
+        for source, target in enumerate(self.targets()):
+            arrivals[target].extend(emigrants[source])
+        for island, chromosomes in zip(islands, arrivals):
+            island.send("immigrate", chromosomes)
+        self.stats = [island.receive() for island in islands]
+
+    def run(self, stop=None) -> list:
+        """
+        Evolve every island and return each island's best (chromosome, score).
+        ``stop`` is a StopCriteria checked between epochs against the best score
+        of all islands; without it the run lasts ``config.total_generations``.
+        """
+        for _ in self.iter_run(stop):
+            pass
+        return self.champions
+
+    def iter_run(self, stop=None):
+        """
+        Generator form of ``run`` that yields ``stats`` after every epoch. The
+        islands stay open while it is suspended, so ``best`` can be called
+        between epochs; a cancelled ``stop`` ends the run at the current epoch.
+        """
+        islands = self._islands = self._open()
+        try:
+            self.stats = self._call(islands, "start")
+            total = self.config.total_generations
+            interval = max(1, self.config.migration_interval)
+            self.generation = 0
+            stopped = self._should_stop(stop)
+            while not stopped:
+                step = min(interval, total - self.generation)
+                self.stats = self._call(islands, "evolve", step)
+                self.generation += step
+                self.history.append([stats["best_score"] for stats in self.stats])
+                stopped = self._should_stop(stop)
+                if not stopped and self.num_islands > 1:
+                    self._migrate(islands)
+                yield self.stats
+                if stop is not None and stop.cancelled:
+                    break
+            self.champions = self._call(islands, "best")
+            return self.champions
+        finally:
+            self._islands = []
+            for island in islands:
+                island.close()
+
+    def best(self) -> tuple:
+        """Best (chromosome, score) over all islands of the run in progress."""
+        return max(self._call(self._islands, "best"), key=lambda champion: champion[1])
+
+    def _should_stop(self, stop) -> bool:
+        if stop is None:
+            return self.generation >= self.config.total_generations
+        best_score = max(stats["best_score"] for stats in self.stats)
+        return stop.check(self.generation, best_score) is not None
@@ -0,0 +1,82 @@
+"""
+Parallel construction of the initial chromosome population.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithm.chromosome import TimeTableGeneration
+
+_worker_generator = None
+
+
+def _init_worker(problem: dict):
+    global _worker_generator
+    _worker_generator = TimeTableGeneration(**problem)
+
+
+def _build_week(seed: int) -> dict:
+    return _worker_generator.build_week(seed)
+
+
+def spawn_seeds(seed, count: int) -> list:
+    """
+    Derive ``count`` independent seeds from ``seed``. Without a seed the base is
+    drawn from the global ``random`` module, so ``random.seed()`` still pins a run.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    return np.random.SeedSequence(seed).generate_state(count, dtype=np.uint64).tolist()
+
+
+class PopulationBuilder:
+    """
+    Builds "Week N" chromosomes, optionally spread over a process pool.
+
+    ``problem`` holds the TimeTableGeneration keyword arguments. Each worker
+    builds its own generator from that snapshot once, and every week is drawn
+    from its own seeded stream, so the result only depends on the seeds and is
+    identical for any number of workers.
+    """
+
+    def __init__(self, problem: dict, workers: int = 1):
+        self.problem = problem
+        self.workers = max(1, workers or 1)
+        self._generator = None
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.problem,),
+            )
+        return self._pool
+
+    def build_weeks(self, seeds: list) -> list:
+        if self.workers == 1 or len(seeds) < 2:
+            if self._generator is None:
+                self._generator = TimeTableGeneration(**self.problem)
+            return [self._generator.build_week(seed) for seed in seeds]
+
+        chunksize = max(1, len(seeds) // (self.workers * 4))
+        return list(self._get_pool().map(_build_week, seeds, chunksize=chunksize))
+
+    def build(self, num_weeks: int, seeds: list = None, first_week: int = 1) -> dict:
+        if seeds is None:
+            seeds = spawn_seeds(None, num_weeks)
+        weeks = self.build_weeks(seeds[:num_weeks])
+        return {f"Week {first_week + i}": week for i, week in enumerate(weeks)}
@@ -0,0 +1,243 @@
+"""
+Occupancy-index repair of teacher and room double-bookings.
+"""
+class OccupancyIndex:
+    """
+    Which sections hold each teacher and each room at every (day, time slot).
+
+    Both tables map ``(day, time_slot, resource)`` to ``{section: entries}``. The
+    count is there because a lab section books its teacher twice in one slot (one
+    entry per group), which is not a clash. A resource clashes when a second section
+    holds it in the same slot. Teacher "None" and the "merged_lab" placeholder room
+    are never indexed.
+
+    ``hot`` holds the ``(field, key)`` pairs that clash, where field is the entry
+    field naming the resource. ``excess`` is the number of extra sections summed
+    over those keys, which is the objective local search minimises.
+    """
+
+    FREE_TEACHERS = frozenset({"None", None})
+    FREE_ROOMS = frozenset({"merged_lab", None})
+
+    def __init__(self):
+        self.teachers = {}
+        self.rooms = {}
+        self.hot = set()
+        self.excess = 0
+
+    @classmethod
+    def from_day(cls, day, day_schedule: dict) -> "OccupancyIndex":
+        index = cls()
+        for section, entries in day_schedule.items():
+            for entry in entries:
+                time_slot = entry["time_slot"]
+                teacher, room = entry["teacher_id"], entry["classroom_id"]
+                if teacher not in cls.FREE_TEACHERS:
+                    holders = index.teachers.setdefault((day, time_slot, teacher), {})
+                    holders[section] = holders.get(section, 0) + 1
+                if room not in cls.FREE_ROOMS:
+                    holders = index.rooms.setdefault((day, time_slot, room), {})
+                    holders[section] = holders.get(section, 0) + 1
+        for field, table in (("teacher_id", index.teachers), ("classroom_id", index.rooms)):
+            for key, holders in table.items():
+                if len(holders) > 1:
+                    index.hot.add((field, key))
+                    index.excess += len(holders) - 1
+        return index
+
+    def add(self, day, section, entry: dict):
+        self._update(day, section, entry, 1)
+
+    def remove(self, day, section, entry: dict):
+        self._update(day, section, entry, -1)
+
+    def clashes(self, day, section, entry: dict, time_slot=None) -> bool:
+        """
+        Whether another section holds the teacher or room of ``entry`` at
+        ``time_slot``. The default slot is the entry's own.
+        """
+        if time_slot is None:
+            time_slot = entry["time_slot"]
+        teacher, room = entry["teacher_id"], entry["classroom_id"]
+        return (
+            teacher not in self.FREE_TEACHERS
+            and self._held_elsewhere(self.teachers.get((day, time_slot, teacher)), section)
+        ) or (
+            room not in self.FREE_ROOMS
+            and self._held_elsewhere(self.rooms.get((day, time_slot, room)), section)
+        )
+
+    def holders(self, field: str, key: tuple) -> dict:
+        table = self.teachers if field == "teacher_id" else self.rooms
+        return table.get(key, {})
+
+    def conflicting_sections(self) -> set:
+        return {section for field, key in self.hot for section in self.holders(field, key)}
+
+    def conflict_count(self) -> int:
+        """Number of (day, slot, teacher or room) bookings held by more than one section."""
+        return len(self.hot)
+
+    def _update(self, day, section, entry: dict, step: int):
+        time_slot = entry["time_slot"]
+        if entry["teacher_id"] not in self.FREE_TEACHERS:
+            key = (day, time_slot, entry["teacher_id"])
+            self._bump(self.teachers, "teacher_id", key, section, step)
+        if entry["classroom_id"] not in self.FREE_ROOMS:
+            key = (day, time_slot, entry["classroom_id"])
+            self._bump(self.rooms, "classroom_id", key, section, step)
+
+    def _bump(self, table: dict, field: str, key: tuple, section, step: int):
+        holders = table.setdefault(key, {})
+        before = len(holders)
+        count = holders.get(section, 0) + step
+        if count > 0:
+            holders[section] = count
+        else:
+            holders.pop(section, None)
+            if not holders:
+                del table[key]
+        after = len(holders)
+        self.excess += max(after - 1, 0) - max(before - 1, 0)
+        if after > 1:
+            self.hot.add((field, key))
+        else:
+            self.hot.discard((field, key))
+
+    @staticmethod
+    def _held_elsewhere(holders: dict, section) -> bool:
+        return bool(holders) and (len(holders) > 1 or section not in holders)
+
+
+class ConflictRepair:
+    """
+    Removes teacher and room double-bookings that crossover and mutation leave
+    behind.
+
+    Each day gets an OccupancyIndex. Every entry that clashes with another section
+    is then moved to a slot its section leaves free. If no free slot works, it swaps
+    slots with an entry of its own section, and the swap is made only when neither
+    entry clashes afterwards. Only the clashing entries and their swap partners
+    change. Building the index is linear in the entries of the day; after that only
+    the sections named in a conflict are scanned, so the repair work grows with the
+    number of conflicts. An entry that cannot be placed without a clash is left as
+    it is.
+
+    ``time_slots`` is the {number: label} map. It limits moves to free slots no
+    later than the section's last class, so half-day sections stay half-day.
+    Without it, conflicts are only resolved by swaps.
+    """
+
+    def __init__(self, time_slots: dict = None):
+        self.slot_order = {
+            label: position
+            for position, (_, label) in enumerate(sorted((time_slots or {}).items()))
+        }
+
+    def conflicts(self, week_schedule: dict) -> int:
+        return sum(
+            OccupancyIndex.from_day(day, day_schedule).conflict_count()
+            for day, day_schedule in week_schedule.items()
+        )
+
+    def repair(self, week_schedule: dict, changes: list = None) -> tuple:
+        """
+        Return ``(repaired_week, repaired)``: a fork of the week that shares every
+        untouched day and section with ``week_schedule``, and the number of
+        clashing entries that were placed in a slot without a clash. When
+        ``changes`` is given, a (day, section, index, entry) record is appended for
+        every entry whose slot changed.
+        """
+        repaired_week = dict(week_schedule)
+        owned = {}
+        repaired = 0
+        for day, day_schedule in week_schedule.items():
+            index = OccupancyIndex.from_day(day, day_schedule)
+            conflicting = index.conflicting_sections()
+            for section in day_schedule:
+                if section not in conflicting:
+                    continue
+                for position in range(len(day_schedule[section])):
+                    entries = repaired_week[day][section]
+                    if not index.clashes(day, section, entries[position]):
+                        continue
+                    moved = self._resolve(repaired_week, owned, index, day, section, position)
+                    if moved:
+                        repaired += 1
+                        if changes is not None:
+                            entries = repaired_week[day][section]
+                            changes.extend(
+                                (day, section, moved_index, entries[moved_index])
+                                for moved_index in moved
+                            )
+        return repaired_week, repaired
+
+    @staticmethod
+    def merge_changes(week_schedule: dict, *change_sets) -> list:
+        """
+        One change per position across ``change_sets``, each carrying that
+        position's entry in ``week_schedule``.
+        """
+        positions = dict.fromkeys(
+            (day, section, index)
+            for changes in change_sets
+            for day, section, index, _ in changes
+        )
+        return [
+            (day, section, index, week_schedule[day][section][index])
+            for day, section, index in positions
+        ]
+
+    def _resolve(self, week: dict, owned: dict, index, day, section, position) -> tuple:
+        entries = week[day][section]
+        entry = entries[position]
+        time_slot = entry["time_slot"]
+
+        for target in self._free_slots(entries):
+            if not index.clashes(day, section, entry, target):
+                entries = self._own(week, owned, day, section)
+                self._set_slot(index, day, section, entries[position], target)
+                return (position,)
+
+        for partner, other in enumerate(entries):
+            target = other["time_slot"]
+            if target == time_slot:
+                continue
+            if index.clashes(day, section, entry, target) or index.clashes(
+                day, section, other, time_slot
+            ):
+                continue
+            entries = self._own(week, owned, day, section)
+            self._set_slot(index, day, section, entries[position], target)
+            self._set_slot(index, day, section, entries[partner], time_slot)
+            return position, partner
+        return ()
+
+    def _free_slots(self, entries: list) -> list:
+        if not self.slot_order:
+            return []
+        used = {entry["time_slot"] for entry in entries}
+        last = max(self.slot_order.get(time_slot, -1) for time_slot in used)
+        return [
+            time_slot
+            for time_slot, order in self.slot_order.items()
+            if order <= last and time_slot not in used
+        ]
+
+    @staticmethod
+    def _own(week: dict, owned: dict, day, section) -> list:
+        # Copy a day and a section the first time they are edited, so the input
+        # week and anything sharing its blocks stay untouched.
+        if day not in owned:
+            week[day] = dict(week[day])
+            owned[day] = set()
+        if section not in owned[day]:
+            week[day][section] = [dict(entry) for entry in week[day][section]]
+            owned[day].add(section)
+        return week[day][section]
+
+    @staticmethod
+    def _set_slot(index, day, section, entry: dict, time_slot):
+        index.remove(day, section, entry)
+        entry["time_slot"] = time_slot
+        index.add(day, section, entry)
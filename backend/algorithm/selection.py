@@ -1,9 +1,96 @@
 import random
 
+import numpy as np
+
+
+class SelectionEngine:
+    """
+    Vectorised parent selection over an array of fitness scores.
+
+    All draws of one call are made at once: roulette and stochastic universal
+    sampling build the cumulative weights once and look every pointer up with
+    ``numpy.searchsorted``; tournament selection compares all tournaments in one
+    array; rank selection uses linear ranking weights with ``selection_pressure``
+    in [1, 2]. Fitness is shifted before it is used as a weight, since penalty
+    heavy configurations produce negative scores: the worst chromosome gets
+    ``scaling_floor`` of the score range instead of zero or a negative slice.
+    """
+
+    STRATEGIES = ("roulette", "sus", "tournament", "rank")
+
+    def __init__(
+        self,
+        strategy: str = "roulette",
+        rng: np.random.Generator = None,
+        tournament_size: int = 3,
+        selection_pressure: float = 1.5,
+        scaling_floor: float = 0.01,
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Unknown selection strategy {strategy!r}, expected one of {self.STRATEGIES}."
+            )
+        self.strategy = strategy
+        # Seeded from the random module so that random.seed() still pins a run.
+        self.rng = rng or np.random.default_rng(random.getrandbits(64))
+        self.tournament_size = tournament_size
+        self.selection_pressure = selection_pressure
+        self.scaling_floor = scaling_floor
+
+    def shift_fitness(self, fitness) -> np.ndarray:
+        """Non-negative weights that keep the order of ``fitness``."""
+        fitness = np.asarray(fitness, dtype=np.float64)
+        if not len(fitness):
+            return fitness
+        spread = fitness.max() - fitness.min()
+        if spread <= 0:
+            return np.ones_like(fitness)
+        return fitness - fitness.min() + spread * self.scaling_floor
+
+    def select_indices(self, fitness, count: int) -> np.ndarray:
+        """Indices of ``count`` chromosomes drawn with replacement."""
+        fitness = np.asarray(fitness, dtype=np.float64)
+        if not len(fitness) or count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        return getattr(self, f"_{self.strategy}")(fitness, count)
+
+    def select(self, scores: dict, count: int) -> list:
+        """Keys of ``count`` chromosomes drawn from ``{key: fitness}``, with replacement."""
+        keys = list(scores)
+        indices = self.select_indices([scores[key] for key in keys], count)
+        return [keys[i] for i in indices]
+
+    def _pick(self, weights, pointers) -> np.ndarray:
+        cumulative = np.cumsum(weights)
+        indices = np.searchsorted(cumulative, pointers * cumulative[-1], side="right")
+        return np.minimum(indices, len(weights) - 1)
+
+    def _roulette(self, fitness, count):
+        return self._pick(self.shift_fitness(fitness), self.rng.random(count))
+
+    def _sus(self, fitness, count):
+        pointers = (self.rng.random() + np.arange(count)) / count
+        return self._pick(self.shift_fitness(fitness), pointers)
+
+    def _rank(self, fitness, count):
+        n = len(fitness)
+        ranks = np.empty(n, dtype=np.float64)
+        ranks[np.argsort(fitness, kind="stable")] = np.arange(n)
+        pressure = self.selection_pressure
+        weights = 2 - pressure + 2 * (pressure - 1) * ranks / max(n - 1, 1)
+        return self._pick(weights, self.rng.random(count))
+
+    def _tournament(self, fitness, count):
+        size = max(1, min(self.tournament_size, len(fitness)))
+        contestants = self.rng.integers(0, len(fitness), size=(count, size))
+        winners = np.argmax(fitness[contestants], axis=1)
+        return contestants[np.arange(count), winners]
+
 
 class TimeTableSelection:
-    def __init__(self):
-        pass
+    def __init__(self, strategy: str = "roulette", rng: np.random.Generator = None):
+        self.strategy = strategy
+        self.rng = rng
 
     def select_chromosomes(
         self, weekly_fitness_scores, top_percentage=0.20, roulette_percentage=0.10
@@ -62,18 +149,14 @@ class TimeTableSelection:
 
     def roulette_wheel_selection(self, scores, num_select):
         """
-        Select items using roulette-wheel selection.
+        Select items using the configured SelectionEngine strategy (roulette by default).
         """
 
         if not scores:
             print("Scores are empty. Cannot perform roulette selection.")
             return {}
 
-        total_fitness = sum(scores.values())
-        cumulative_probabilities = self.calculate_cumulative_probabilities(scores)
-        selected_items = self.perform_roulette_selection(
-            cumulative_probabilities, total_fitness, num_select
-        )
+        selected_items = SelectionEngine(self.strategy, self.rng).select(scores, num_select)
         return {week: scores[week] for week in selected_items}
 
     @staticmethod
@@ -95,3 +178,4 @@ class TimeTableSelection:
         print("\n--- Selected Weeks and Fitness Scores ---")
         for week, score in selected_fitness.items():
             print(f"Week: {week}, Score: {score}")
+
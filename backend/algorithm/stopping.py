@@ -0,0 +1,97 @@
+"""
+Stop criteria for a generation run.
+"""
+import time
+
+STOP_REASONS = ("generations", "target", "stagnation", "time_limit", "cancelled")
+
+
+class GenerationTimeout(TimeoutError):
+    """
+    Raised when the wall-clock budget runs out and anytime mode is off. The
+    best-so-far result is kept on ``result``.
+    """
+
+    def __init__(self, message: str, result=None):
+        super().__init__(message)
+        self.result = result
+
+
+class StopCriteria:
+    """
+    Decides when a run should stop. The criteria are checked after every
+    generation, in this order:
+
+    - ``cancelled``: ``cancel`` was called;
+    - ``target``: the best fitness reached ``target_fitness``;
+    - ``stagnation``: the best fitness has not improved for ``stagnation_limit``
+      generations;
+    - ``time_limit``: ``time_limit`` seconds have passed since ``start``;
+    - ``generations``: all ``total_generations`` generations have run.
+
+    ``check`` returns the reason, or None while the run should go on. It is also
+    called once before the first generation, so a run whose initial population
+    already meets the target does not evolve at all.
+    """
+
+    def __init__(
+        self,
+        total_generations: int,
+        target_fitness: float = None,
+        stagnation_limit: int = None,
+        time_limit: float = None,
+        clock=time.monotonic,
+    ):
+        self.total_generations = total_generations
+        self.target_fitness = target_fitness
+        self.stagnation_limit = stagnation_limit
+        self.time_limit = time_limit
+        self.clock = clock
+        self.start()
+
+    @classmethod
+    def from_config(cls, config) -> "StopCriteria":
+        return cls(
+            config.total_generations,
+            target_fitness=config.target_fitness,
+            stagnation_limit=config.stagnation_limit,
+            time_limit=config.time_limit,
+        )
+
+    def start(self):
+        self.started = self.clock()
+        self.best = None
+        self.best_generation = 0
+        self.cancelled = False
+        self.reason = None
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def cancel(self):
+        """Stop at the next check, or right away for a caller that reads ``reason``."""
+        self.cancelled = True
+        self.reason = "cancelled"
+
+    def check(self, generation: int, best_score) -> str:
+        if self.best is None or best_score > self.best:
+            self.best = best_score
+            self.best_generation = generation
+
+        if self.cancelled:
+            self.reason = "cancelled"
+        elif self.target_fitness is not None and best_score >= self.target_fitness:
+            self.reason = "target"
+        elif (
+            self.stagnation_limit is not None
+            and generation - self.best_generation >= self.stagnation_limit
+        ):
+            self.reason = "stagnation"
+        elif self.time_limit is not None and self.elapsed >= self.time_limit:
+            self.reason = "time_limit"
+        elif generation >= self.total_generations:
+            self.reason = "generations"
+        else:
+            self.reason = None
+        return self.reason
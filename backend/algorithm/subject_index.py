@@ -0,0 +1,107 @@
+"""
+Remaining-quota subject index and workload-ordered teacher candidates.
+"""
+import heapq
+
+
+class SubjectCandidateIndex:
+    """
+    Remaining-quota and teacher-candidate index used while building one week.
+
+    For every section it keeps the subjects that still have quota left, in
+    ``subject_teacher_mapping`` order, and drops a subject as soon as its quota is
+    used up. For every subject it keeps the teachers with time preferences in a
+    heap ordered by (current workload, position in the mapping), which is the same
+    order ``sorted(preferred_teachers, key=workload)`` produced.
+    """
+
+    def __init__(
+        self,
+        subject_teacher_mapping: dict,
+        subject_quota_limits: dict,
+        teacher_preferences: dict,
+        subject_usage: dict,
+    ):
+        self.subject_usage = subject_usage
+        self.remaining = {}
+        for section, usage in subject_usage.items():
+            remaining = {}
+            for subject in subject_teacher_mapping:
+                left = subject_quota_limits.get(subject, 0) - usage.get(subject, 0)
+                if left > 0:
+                    remaining[subject] = left
+            self.remaining[section] = remaining
+
+        self.preferred_teachers = {
+            subject: [t for t in teachers if teacher_preferences.get(t, [])]
+            for subject, teachers in subject_teacher_mapping.items()
+        }
+        self.teacher_subjects = {}
+        for subject, teachers in self.preferred_teachers.items():
+            for position, teacher in enumerate(teachers):
+                self.teacher_subjects.setdefault(teacher, []).append((subject, position))
+
+        self.workload = {}
+        self._heaps = {}
+
+    def available_subjects(self, section: str) -> list:
+        return list(self.remaining.get(section, ()))
+
+    def consume(self, section: str, subject: str, count: int = 1):
+        remaining = self.remaining.get(section)
+        if remaining is None or subject not in remaining:
+            return
+        left = remaining[subject] - count
+        if left > 0:
+            remaining[subject] = left
+        else:
+            del remaining[subject]
+
+    def reset_workload(self, workload: dict):
+        """
+        Start a new day. ``workload`` is the caller's tracker and is updated in place by record().
+        """
+        self.workload = workload
+        self._heaps = {
+            subject: [
+                (workload.get(teacher, 0), position, teacher)
+                for position, teacher in enumerate(teachers)
+            ]
+            for subject, teachers in self.preferred_teachers.items()
+        }
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+
+    def record(self, teacher: str):
+        load = self.workload.get(teacher, 0) + 1
+        self.workload[teacher] = load
+        for subject, position in self.teacher_subjects.get(teacher, ()):
+            heapq.heappush(self._heaps[subject], (load, position, teacher))
+
+    def pick_teacher(self, subject: str, is_available):
+        """
+        Return the least-loaded preferred teacher for which is_available(teacher) holds,
+        recording the assignment, or None.
+        """
+        heap = self._heaps.get(subject)
+        if not heap:
+            return None
+
+        workload = self.workload
+        skipped = []
+        chosen = None
+        while heap:
+            entry = heapq.heappop(heap)
+            load, _, teacher = entry
+            if load != workload.get(teacher, 0):
+                continue  # stale entry, superseded by a later record()
+            if is_available(teacher):
+                chosen = teacher
+                break
+            skipped.append(entry)
+
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if chosen is not None:
+            self.record(chosen)
+        return chosen
@@ -5,7 +5,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from core.models import (
     User, College, Department, Teacher, Subject, Section,
-    Classroom, SubjectTeacherMapping, Timetable, TeacherPreference
+    Classroom, SubjectTeacherMapping, Timetable, TeacherPreference, GenerationJob
 )
 
 
@@ -101,3 +101,10 @@ class TimetableAdmin(admin.ModelAdmin):
 class TeacherPreferenceAdmin(admin.ModelAdmin):
     list_display = ['teacher', 'created_at', 'updated_at']
     search_fields = ['teacher__user__email']
+
+
+@admin.register(GenerationJob)
+class GenerationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'college', 'status', 'generation', 'total_generations', 'best_fitness', 'created_at']
+    list_filter = ['status', 'college', 'created_at']
+    readonly_fields = ['id', 'created_at', 'started_at', 'finished_at', 'updated_at']
@@ -0,0 +1,272 @@
+"""
+Generation inputs built from a college's data, and storage of the results. Used
+by the generation views and by the background generation task.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from core.models import (
+    College, Section, Classroom, Subject, Teacher, SubjectTeacherMapping,
+    Timetable, TimetableEntry, TeacherPreference
+)
+from algorithm.availability import AvailabilityMatrix
+
+
+class MissingResourceError(Exception):
+    """The college lacks data that generation needs; the message says which."""
+
+
+DEFAULT_TIME_SLOT_MAP = {
+    "9:00 - 9:55": 1,
+    "9:55 - 10:50": 2,
+    "11:10 - 12:05": 3,
+    "12:05 - 1:00": 4,
+    "1:20 - 2:15": 5,
+    "2:15 - 3:10": 6,
+    "3:30 - 4:25": 7,
+}
+
+DEFAULT_WORKING_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+# Periods per day in the availability matrices
+NUM_SLOTS = 7
+
+# Queries issued by load_problem, whatever the size of the college
+PROBLEM_QUERIES = 6
+
+
+def load_problem(college):
+    """
+    The part of the algorithm input read from the database: sections, rooms,
+    labs, subjects and their quotas, the teacher-subject mapping, workloads and
+    preferences. Each table is read once with ``values_list``, following foreign
+    keys through joins, so the load takes PROBLEM_QUERIES queries for any number
+    of teachers or mappings. Rows are read in creation order. Raises
+    MissingResourceError when a resource is missing.
+    """
+    sections = Section.objects.filter(college=college).order_by('created_at', 'id')
+    total_sections = dict(sections.values_list('name', 'student_strength'))
+    if not total_sections:
+        raise MissingResourceError('No sections found. Please add sections first.')
+
+    teachers = Teacher.objects.filter(department__college=college).order_by('created_at', 'id')
+    teacher_weekly_workload = dict(teachers.values_list('employee_id', 'max_weekly_hours'))
+    if not teacher_weekly_workload:
+        raise MissingResourceError('No teachers found. Please add teachers first.')
+
+    subjects = list(
+        Subject.objects.filter(college=college)
+        .order_by('created_at', 'id')
+        .values_list('code', 'weekly_quota', 'is_lab')
+    )
+    if not subjects:
+        raise MissingResourceError('No subjects found. Please add subjects first.')
+
+    rooms = list(
+        Classroom.objects.filter(college=college)
+        .order_by('created_at', 'id')
+        .values_list('name', 'capacity', 'is_lab')
+    )
+    if not rooms:
+        raise MissingResourceError('No classrooms or labs found. Please add classrooms/labs first.')
+
+    mappings = list(
+        SubjectTeacherMapping.objects.filter(subject__college=college)
+        .order_by('created_at', 'id')
+        .values_list('subject__code', 'teacher__employee_id')
+    )
+    if not mappings:
+        raise MissingResourceError('No subject-teacher mappings found. Please create mappings first.')
+
+    # The newest preference of a teacher wins
+    preferences = dict(
+        TeacherPreference.objects.filter(teacher__department__college=college)
+        .order_by('created_at', 'id')
+        .values_list('teacher__employee_id', 'preferred_time_slots')
+    )
+
+    teacher_subject_mapping = {}
+    for subject_code, teacher_id in mappings:
+        teacher_subject_mapping.setdefault(subject_code, []).append(teacher_id)
+
+    return {
+        'teacher_subject_mapping': teacher_subject_mapping,
+        'total_sections': total_sections,
+        'total_classrooms': {name: capacity for name, capacity, is_lab in rooms if not is_lab},
+        'total_labs': {name: capacity for name, capacity, is_lab in rooms if is_lab},
+        'teacher_preferences': {
+            teacher_id: preferences.get(teacher_id) or [] for teacher_id in teacher_weekly_workload
+        },
+        'teacher_weekly_workload': teacher_weekly_workload,
+        'labs': [code for code, _, is_lab in subjects if is_lab],
+        'subject_quota_limits': {code: quota for code, quota, _ in subjects},
+    }
+
+
+def compile_problem(college, num_days, num_slots=NUM_SLOTS):
+    """
+    The college's part of the engine input: load_problem plus what is built
+    from it, the teachers' duty days and the teacher and lab AvailabilityMatrix
+    arrays for ``num_days`` days of ``num_slots`` periods. Raises
+    MissingResourceError when a resource is missing.
+    """
+    problem = load_problem(college)
+    return {
+        **problem,
+        'teacher_duty_days': {
+            teacher_id: list(DEFAULT_WORKING_DAYS) for teacher_id in problem['teacher_weekly_workload']
+        },
+        'teacher_availability_matrix': AvailabilityMatrix(
+            problem['teacher_weekly_workload'], num_days, num_slots
+        ),
+        'lab_availability_matrix': AvailabilityMatrix(problem['total_labs'], num_days, num_slots),
+    }
+
+
+# Seconds a compiled problem is kept, whatever its version
+PROBLEM_CACHE_TIMEOUT = 60 * 60
+
+
+def problem_version(college_id):
+    """Data version of a college, from its problem_version column."""
+    return College.objects.values_list('problem_version', flat=True).get(pk=college_id)
+
+
+def bump_problem_version(college_id):
+    """Make every problem cached for the college stale, in every process."""
+    College.objects.filter(pk=college_id).update(problem_version=F('problem_version') + 1)
+
+
+def cached_problem(college, num_days=len(DEFAULT_WORKING_DAYS), num_slots=NUM_SLOTS):
+    """
+    compile_problem through Django's cache, keyed by college, data version and
+    calendar size. A hit costs the one query that reads the version. The
+    version is bumped by the signals in core.signals whenever a section, room,
+    subject, teacher, mapping or preference of the college is saved or deleted;
+    queryset ``update`` and ``bulk_create`` send no signals and must call
+    bump_problem_version themselves.
+
+    The version is kept in the database, so every process sees a bump whatever
+    the cache backend; with a per-process cache such as locmem each process
+    just compiles a version once.
+    """
+    key = f'generation:problem:{college.pk}:{problem_version(college.pk)}:{num_days}x{num_slots}'
+    problem = cache.get(key)
+    if problem is None:
+        problem = compile_problem(college, num_days, num_slots)
+        cache.set(key, problem, timeout=PROBLEM_CACHE_TIMEOUT)
+    return problem
+
+
+def generation_inputs(college, validated_data):
+    """
+    Keyword arguments for run_timetable_generation: the college's compiled
+    problem from cached_problem plus the request's calendar. The availability
+    matrices are AvailabilityMatrix arrays, which the engine uses as they are.
+    Raises MissingResourceError when a resource is missing.
+    """
+    working_days = validated_data.get('working_days', DEFAULT_WORKING_DAYS)
+    problem = cached_problem(college, len(working_days))
+
+    # Default time slots
+    time_slots = validated_data.get('time_slots', {
+        1: "9:00 - 9:55",
+        2: "9:55 - 10:50",
+        3: "11:10 - 12:05",
+        4: "12:05 - 1:00",
+        5: "1:20 - 2:15",
+        6: "2:15 - 3:10",
+        7: "3:30 - 4:25",
+    })
+
+    day_map = validated_data.get('day_map', {
+        "Monday": 0,
+        "Tuesday": 1,
+        "Wednesday": 2,
+        "Thursday": 3,
+        "Friday": 4,
+    })
+
+    time_slot_map = validated_data.get('time_slot_map', DEFAULT_TIME_SLOT_MAP)
+
+    options = {
+        key: validated_data[key]
+        for key in ('target_fitness', 'stagnation_limit', 'time_limit', 'anytime', 'seed')
+        if key in validated_data
+    }
+
+    return {
+        **problem,
+        'special_subjects': {},
+        'total_generations': validated_data['total_generations'],
+        'time_slots': time_slots,
+        'day_map': day_map,
+        'time_slot_map': time_slot_map,
+        'fixed_teacher_assignment': validated_data.get('fixed_teacher_assignment'),
+        'working_days': working_days,
+        **options,
+    }
+
+
+def save_timetable(college, user, validated_data, result):
+    """Store a generation result and return its response payload."""
+    best_tt, final_teacher, final_lab, fitness_score = result
+    with transaction.atomic():
+        timetable = Timetable.objects.create(
+            college=college,
+            name=validated_data['name'],
+            academic_year=validated_data['academic_year'],
+            semester=validated_data.get('semester', ''),
+            status='generated',
+            timetable_data=best_tt,
+            fitness_score=fitness_score,
+            generation_config={**validated_data, 'seed': result.seed},
+            created_by=user,
+        )
+    return {
+        'timetable_id': str(timetable.id),
+        'timetable': best_tt,
+        'fitness_score': fitness_score,
+        'teacher_availability': final_teacher,
+        'lab_availability': final_lab,
+        'stop_reason': result.stop_reason,
+        'generations': result.generations,
+        'seed': result.seed,
+    }
+
+
+def timetable_entries(timetable):
+    """
+    Unsaved TimetableEntry rows for every class in ``timetable_data``, laid out
+    as ``{day: {section: [class, ...]}}``. Slot numbers come from the
+    generation's time_slot_map, or the default one.
+    """
+    config = timetable.generation_config or {}
+    time_slot_map = config.get('time_slot_map') or DEFAULT_TIME_SLOT_MAP
+    return [
+        TimetableEntry(
+            timetable=timetable,
+            day=day,
+            slot=time_slot_map.get(allocation.get('time_slot')),
+            time_slot=allocation.get('time_slot') or '',
+            section=section,
+            teacher=allocation.get('teacher_id') or '',
+            subject=allocation.get('subject_id') or '',
+            room=allocation.get('classroom_id') or '',
+            group=str(allocation.get('group') or 'all'),
+        )
+        for day, sections in (timetable.timetable_data or {}).items()
+        for section, allocations in sections.items()
+        for allocation in allocations
+    ]
+
+
+def store_entries(timetable):
+    """
+    Replace the timetable's TimetableEntry rows with a bulk insert. Called by
+    the post_save receiver in core.signals on every timetable save.
+    """
+    with transaction.atomic():
+        TimetableEntry.objects.filter(timetable=timetable).delete()
+        TimetableEntry.objects.bulk_create(timetable_entries(timetable), batch_size=1000)
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+DEFAULT_TIME_SLOT_MAP = {
+    "9:00 - 9:55": 1,
+    "9:55 - 10:50": 2,
+    "11:10 - 12:05": 3,
+    "12:05 - 1:00": 4,
+    "1:20 - 2:15": 5,
+    "2:15 - 3:10": 6,
+    "3:30 - 4:25": 7,
+}
+
+
+def fill_entries(apps, schema_editor):
+    """Copy the classes of every existing timetable into timetable_entries."""
+    Timetable = apps.get_model('core', 'Timetable')
+    TimetableEntry = apps.get_model('core', 'TimetableEntry')
+    for timetable in Timetable.objects.iterator():
+        time_slot_map = (timetable.generation_config or {}).get('time_slot_map') or DEFAULT_TIME_SLOT_MAP
+        TimetableEntry.objects.bulk_create(
+            [
+                TimetableEntry(
+                    timetable=timetable,
+                    day=day,
+                    slot=time_slot_map.get(allocation.get('time_slot')),
+                    time_slot=allocation.get('time_slot') or '',
+                    section=section,
+                    teacher=allocation.get('teacher_id') or '',
+                    subject=allocation.get('subject_id') or '',
+                    room=allocation.get('classroom_id') or '',
+                    group=str(allocation.get('group') or 'all'),
+                )
+                for day, sections in (timetable.timetable_data or {}).items()
+                for section, allocations in sections.items()
+                for allocation in allocations
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_generationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimetableEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.CharField(max_length=20)),
+                ('slot', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('time_slot', models.CharField(max_length=50)),
+                ('section', models.CharField(max_length=50)),
+                ('teacher', models.CharField(max_length=50)),
+                ('subject', models.CharField(max_length=50)),
+                ('room', models.CharField(max_length=100)),
+                ('group', models.CharField(default='all', max_length=20)),
+                ('timetable', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='core.timetable')),
+            ],
+            options={
+                'db_table': 'timetable_entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['timetable', 'teacher', 'day', 'slot'], name='tt_entry_teacher_idx'), models.Index(fields=['timetable', 'room', 'day', 'slot'], name='tt_entry_room_idx'), models.Index(fields=['timetable', 'section', 'day', 'slot'], name='tt_entry_section_idx')],
+            },
+        ),
+        migrations.RunPython(fill_entries, migrations.RunPython.noop),
+    ]
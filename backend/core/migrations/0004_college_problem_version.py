@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_timetableentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='college',
+            name='problem_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -45,6 +45,8 @@ class College(models.Model):
     phone = models.CharField(max_length=20, null=True, blank=True)
     email = models.EmailField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Bumped by core.signals whenever data that generation reads changes
+    problem_version = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -231,6 +233,65 @@ class Timetable(models.Model):
         return f"{self.name} ({self.college.name})"
 
 
+class TimetableEntry(models.Model):
+    """One class of a timetable, copied out of ``timetable_data`` for indexed lookups."""
+    timetable = models.ForeignKey(Timetable, on_delete=models.CASCADE, related_name='entries')
+    day = models.CharField(max_length=20)
+    slot = models.PositiveSmallIntegerField(null=True, blank=True)  # Time slot number, 1-based
+    time_slot = models.CharField(max_length=50)
+    section = models.CharField(max_length=50)
+    teacher = models.CharField(max_length=50)  # Teacher employee_id
+    subject = models.CharField(max_length=50)  # Subject code
+    room = models.CharField(max_length=100)  # Classroom or lab name
+    group = models.CharField(max_length=20, default='all')
+
+    class Meta:
+        db_table = 'timetable_entries'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['timetable', 'teacher', 'day', 'slot'], name='tt_entry_teacher_idx'),
+            models.Index(fields=['timetable', 'room', 'day', 'slot'], name='tt_entry_room_idx'),
+            models.Index(fields=['timetable', 'section', 'day', 'slot'], name='tt_entry_section_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.time_slot}: {self.section} {self.subject} ({self.teacher}, {self.room})"
+
+
+class GenerationJob(models.Model):
+    """Timetable generation run in the background by a Celery worker."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='generation_jobs')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='generation_jobs')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    config = models.JSONField()  # Validated generation request
+    generation = models.IntegerField(default=0)  # Last generation reported
+    total_generations = models.IntegerField()
+    best_fitness = models.FloatField(null=True, blank=True)
+    stop_reason = models.CharField(max_length=20, null=True, blank=True)
+    timetable = models.ForeignKey(Timetable, on_delete=models.SET_NULL, null=True, blank=True, related_name='generation_jobs')
+    result = models.JSONField(null=True, blank=True)  # Response payload, without the timetable
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'generation_jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.config.get('name')} ({self.status})"
+
+
 class TeacherPreference(models.Model):
     """Teacher preferences for time slots."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -4,10 +4,38 @@ Serializers for core models.
 from rest_framework import serializers
 from core.models import (
     User, College, Department, Teacher, Subject, Section,
-    Classroom, SubjectTeacherMapping, Timetable, TeacherPreference
+    Classroom, SubjectTeacherMapping, Timetable, TimetableEntry, TeacherPreference,
+    GenerationJob
 )
 
 
+def requested_fields(request):
+    """
+    Field names of the ``fields`` query parameter, or None without one. Only
+    reads honour it, so a write never loses the fields it was not asked to show.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    if not request.query_params.get('fields'):
+        return None
+    return {name.strip() for name in request.query_params['fields'].split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """
+    Keeps only the fields named in the comma-separated ``fields`` query
+    parameter of a GET or HEAD request, when there is one. Unknown names are
+    ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
 class CollegeSerializer(serializers.ModelSerializer):
     """Serializer for College model."""
     class Meta:
@@ -103,7 +131,7 @@ class SubjectTeacherMappingSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class TimetableSerializer(serializers.ModelSerializer):
+class TimetableSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Timetable model."""
     college_name = serializers.CharField(source='college.name', read_only=True)
     created_by_name = serializers.CharField(source='created_by.full_name', read_only=True)
@@ -117,6 +145,29 @@ class TimetableSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'fitness_score', 'college']
 
 
+class TimetableListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for Timetable lists, without the timetable and its config."""
+    college_name = serializers.CharField(source='college.name', read_only=True)
+    created_by_name = serializers.CharField(source='created_by.full_name', read_only=True)
+    
+    class Meta:
+        model = Timetable
+        fields = ['id', 'college', 'college_name', 'name', 'academic_year', 
+                 'semester', 'status', 'fitness_score', 'created_by', 
+                 'created_by_name', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class TimetableEntrySerializer(serializers.ModelSerializer):
+    """Serializer for TimetableEntry model."""
+    
+    class Meta:
+        model = TimetableEntry
+        fields = ['day', 'slot', 'time_slot', 'section', 'teacher', 'subject', 
+                 'room', 'group']
+        read_only_fields = fields
+
+
 class TeacherPreferenceSerializer(serializers.ModelSerializer):
     """Serializer for TeacherPreference model."""
     teacher_name = serializers.CharField(source='teacher.user.full_name', read_only=True)
@@ -128,6 +179,19 @@ class TeacherPreferenceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class GenerationJobSerializer(serializers.ModelSerializer):
+    """Serializer for GenerationJob status and progress."""
+    created_by_name = serializers.CharField(source='created_by.full_name', read_only=True)
+    
+    class Meta:
+        model = GenerationJob
+        fields = ['id', 'college', 'status', 'generation', 'total_generations', 
+                 'best_fitness', 'stop_reason', 'timetable', 'error', 'config', 
+                 'created_by', 'created_by_name', 'created_at', 'started_at', 
+                 'finished_at', 'updated_at']
+        read_only_fields = fields
+
+
 class GenerateTimetableSerializer(serializers.Serializer):
     """Serializer for timetable generation request."""
     name = serializers.CharField(max_length=255)
@@ -135,6 +199,15 @@ class GenerateTimetableSerializer(serializers.Serializer):
     semester = serializers.CharField(max_length=20, required=False, allow_blank=True)
     total_generations = serializers.IntegerField(default=50, min_value=1, max_value=200)
     
+    # Optional stop criteria
+    target_fitness = serializers.FloatField(required=False)
+    stagnation_limit = serializers.IntegerField(required=False, min_value=1)
+    time_limit = serializers.FloatField(required=False, min_value=0.1, help_text='Seconds')
+    anytime = serializers.BooleanField(default=True)
+    
+    # Optional root seed; the response returns the seed used, for replay
+    seed = serializers.IntegerField(required=False, min_value=0)
+    
     # Optional overrides
     time_slots = serializers.DictField(required=False)
     day_map = serializers.DictField(required=False)
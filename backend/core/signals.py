@@ -0,0 +1,62 @@
+"""
+Signal handlers for core models.
+"""
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
+
+from core.generation import bump_problem_version, store_entries
+from core.models import (
+    Section, Classroom, Subject, Teacher, SubjectTeacherMapping, TeacherPreference,
+    Timetable
+)
+
+# College of each instance whose changes alter the generation problem
+COLLEGE_OF = {
+    Section: lambda section: section.college_id,
+    Classroom: lambda classroom: classroom.college_id,
+    Subject: lambda subject: subject.college_id,
+    Teacher: lambda teacher: teacher.department.college_id,
+    SubjectTeacherMapping: lambda mapping: mapping.subject.college_id,
+    TeacherPreference: lambda preference: preference.teacher.department.college_id,
+}
+
+
+def bump_college_problem_version(sender, instance, **kwargs):
+    """Invalidate the cached generation problem of the instance's college."""
+    try:
+        college_id = COLLEGE_OF[sender](instance)
+    except ObjectDoesNotExist:
+        # The parent row is already gone, so there is no college to look up
+        return
+    bump_problem_version(college_id)
+
+
+for model in COLLEGE_OF:
+    post_save.connect(
+        bump_college_problem_version, sender=model,
+        dispatch_uid=f'problem-version-save-{model.__name__}',
+    )
+    post_delete.connect(
+        bump_college_problem_version, sender=model,
+        dispatch_uid=f'problem-version-delete-{model.__name__}',
+    )
+
+
+# Timetable fields that TimetableEntry rows are built from
+ENTRY_SOURCE_FIELDS = {'timetable_data', 'generation_config'}
+
+
+def sync_timetable_entries(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Rebuild the TimetableEntry rows of a saved timetable, however it was saved:
+    API, admin, shell or a generation job. A save limited by ``update_fields``
+    to other fields leaves them alone.
+    """
+    if update_fields is not None and not created and not ENTRY_SOURCE_FIELDS & set(update_fields):
+        return
+    store_entries(instance)
+
+
+post_save.connect(
+    sync_timetable_entries, sender=Timetable, dispatch_uid='timetable-entries-sync',
+)
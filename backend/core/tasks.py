@@ -0,0 +1,92 @@
+"""
+Celery tasks for the core app.
+"""
+import logging
+import time
+
+from celery import shared_task
+from django.utils import timezone
+
+from algorithm import iter_timetable_generation
+from algorithm.stopping import GenerationTimeout
+from core.generation import MissingResourceError, generation_inputs, save_timetable
+from core.models import GenerationJob
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two progress writes of a running job
+PROGRESS_INTERVAL = 1.0
+
+
+def _update_job(job_id, **fields):
+    """Write ``fields`` without loading the job or touching its other columns."""
+    GenerationJob.objects.filter(pk=job_id).update(updated_at=timezone.now(), **fields)
+
+
+@shared_task(ignore_result=True)
+def run_generation_job(job_id):
+    """
+    Run a pending GenerationJob. Progress (generation and best fitness) is
+    written at most every PROGRESS_INTERVAL seconds; at the end the timetable is
+    saved and the job marked succeeded, or the job is marked failed with the
+    error. A job that is no longer pending, e.g. a redelivered message, is left
+    alone.
+    """
+    claimed = GenerationJob.objects.filter(
+        pk=job_id, status=GenerationJob.Status.PENDING
+    ).update(
+        status=GenerationJob.Status.RUNNING,
+        started_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    if not claimed:
+        logger.warning(f"Generation job {job_id} is not pending, skipping")
+        return
+    job = GenerationJob.objects.select_related('college', 'created_by').get(pk=job_id)
+
+    try:
+        progress = iter_timetable_generation(**generation_inputs(job.college, job.config))
+        written = time.monotonic()
+        try:
+            while True:
+                try:
+                    step = next(progress)
+                except StopIteration as finished:
+                    result = finished.value
+                    break
+                if time.monotonic() - written >= PROGRESS_INTERVAL:
+                    _update_job(job_id, generation=step.generation, best_fitness=step.best_score)
+                    written = time.monotonic()
+        finally:
+            progress.close()
+
+        payload = save_timetable(job.college, job.created_by, job.config, result)
+    except MissingResourceError as e:
+        _update_job(
+            job_id, status=GenerationJob.Status.FAILED, error=str(e),
+            finished_at=timezone.now(),
+        )
+    except GenerationTimeout as e:
+        _update_job(
+            job_id, status=GenerationJob.Status.FAILED, error=str(e),
+            stop_reason='time_limit', finished_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.error(f"Error in generation job {job_id}: {str(e)}", exc_info=True)
+        _update_job(
+            job_id, status=GenerationJob.Status.FAILED,
+            error=f'Failed to generate timetable: {str(e)}', finished_at=timezone.now(),
+        )
+    else:
+        timetable_id = payload.pop('timetable_id')
+        payload.pop('timetable')
+        _update_job(
+            job_id,
+            status=GenerationJob.Status.SUCCEEDED,
+            generation=result.generations,
+            best_fitness=payload['fitness_score'],
+            stop_reason=result.stop_reason,
+            timetable_id=timetable_id,
+            result=payload,
+            finished_at=timezone.now(),
+        )
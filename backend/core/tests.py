@@ -0,0 +1,428 @@
+"""
+Tests for the core app.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.generation import (
+    PROBLEM_QUERIES, MissingResourceError, cached_problem, generation_inputs, load_problem,
+    problem_version
+)
+from core.models import (
+    User, College, Department, Teacher, Subject, Section,
+    Classroom, SubjectTeacherMapping, Timetable, TeacherPreference, GenerationJob
+)
+from core.tasks import run_generation_job
+from timetable_backend.celery import app as celery_app
+
+
+def create_college(code, num_teachers, subjects_per_teacher=2):
+    """A college with rooms, sections and ``num_teachers`` mapped teachers."""
+    college = College.objects.create(name=f"College {code}", code=code)
+    department = Department.objects.create(college=college, name="Computer Science", code="CS")
+    section_a = Section.objects.create(college=college, name="A", student_strength=60)
+    Section.objects.create(college=college, name="B", student_strength=55)
+    Classroom.objects.create(college=college, name="R1", capacity=70)
+    Classroom.objects.create(college=college, name="L1", capacity=30, is_lab=True)
+
+    for number in range(num_teachers):
+        user = User.objects.create_user(
+            email=f"teacher{number}@{code.lower()}.edu",
+            password="secret",
+            first_name="Teacher",
+            last_name=str(number),
+            college=college,
+        )
+        teacher = Teacher.objects.create(
+            user=user,
+            employee_id=f"{code}{number:03d}",
+            department=department,
+            designation="Lecturer",
+            max_weekly_hours=18,
+        )
+        TeacherPreference.objects.create(teacher=teacher, preferred_time_slots=[1, 2])
+        for offset in range(subjects_per_teacher):
+            subject = Subject.objects.create(
+                college=college,
+                code=f"{code}-{number}-{offset}",
+                name=f"Subject {number}.{offset}",
+                credits=3,
+                weekly_quota=4,
+                is_lab=offset == 1,
+            )
+            SubjectTeacherMapping.objects.create(subject=subject, teacher=teacher, section=section_a)
+    return college
+
+
+class LoadProblemTests(TestCase):
+    def test_query_count_does_not_grow_with_college_size(self):
+        small = create_college("SML", num_teachers=2)
+        large = create_college("LRG", num_teachers=40)
+
+        with self.assertNumQueries(PROBLEM_QUERIES):
+            load_problem(small)
+        with self.assertNumQueries(PROBLEM_QUERIES):
+            problem = load_problem(large)
+        self.assertEqual(len(problem['teacher_weekly_workload']), 40)
+        self.assertEqual(len(problem['teacher_subject_mapping']), 80)
+
+    def test_generation_inputs_add_only_the_version_read(self):
+        college = create_college("GEN", num_teachers=3)
+
+        with self.assertNumQueries(PROBLEM_QUERIES + 1):
+            inputs = generation_inputs(college, {'total_generations': 10})
+        self.assertEqual(set(inputs['teacher_availability_matrix']), {"GEN000", "GEN001", "GEN002"})
+        self.assertEqual(set(inputs['lab_availability_matrix']), {"L1"})
+
+    def test_problem_content(self):
+        college = create_college("CNT", num_teachers=2)
+        teacher = Teacher.objects.get(employee_id="CNT001")
+        TeacherPreference.objects.filter(teacher=teacher).delete()
+
+        problem = load_problem(college)
+
+        self.assertEqual(problem['total_sections'], {"A": 60, "B": 55})
+        self.assertEqual(problem['total_classrooms'], {"R1": 70})
+        self.assertEqual(problem['total_labs'], {"L1": 30})
+        self.assertEqual(problem['teacher_weekly_workload'], {"CNT000": 18, "CNT001": 18})
+        self.assertEqual(problem['teacher_preferences'], {"CNT000": [1, 2], "CNT001": []})
+        self.assertEqual(problem['teacher_subject_mapping']["CNT-1-0"], ["CNT001"])
+        self.assertEqual(problem['labs'], ["CNT-0-1", "CNT-1-1"])
+        self.assertEqual(problem['subject_quota_limits']["CNT-0-0"], 4)
+
+    def test_missing_resource(self):
+        college = College.objects.create(name="Empty", code="EMP")
+
+        with self.assertRaisesMessage(MissingResourceError, "No sections found"):
+            load_problem(college)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ProblemCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = create_college("CCH", num_teachers=3)
+
+    def test_repeated_lookup_reads_only_the_version(self):
+        with self.assertNumQueries(PROBLEM_QUERIES + 1):
+            first = cached_problem(self.college)
+        with self.assertNumQueries(1):
+            second = cached_problem(self.college)
+        self.assertEqual(second['teacher_subject_mapping'], first['teacher_subject_mapping'])
+        self.assertEqual(
+            second['teacher_availability_matrix'].to_dict(),
+            first['teacher_availability_matrix'].to_dict(),
+        )
+
+    def test_generation_reads_through_the_cache(self):
+        jobs = [
+            GenerationJob.objects.create(
+                college=self.college,
+                config={'name': f"Run {number}", 'academic_year': "2026-27", 'total_generations': 2},
+                total_generations=2,
+            )
+            for number in range(2)
+        ]
+        with mock.patch(
+            'core.tasks.iter_timetable_generation', side_effect=RuntimeError("stop")
+        ) as generation, mock.patch('core.generation.load_problem', wraps=load_problem) as load:
+            for job in jobs:
+                run_generation_job(str(job.id))
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(generation.call_count, 2)
+        self.assertEqual(
+            set(generation.call_args.kwargs['teacher_availability_matrix']),
+            {"CCH000", "CCH001", "CCH002"},
+        )
+
+    def test_version_is_kept_on_the_college(self):
+        version = problem_version(self.college.pk)
+        Subject.objects.create(
+            college=self.college, code="NEW", name="New", credits=2, weekly_quota=3
+        )
+        self.college.refresh_from_db()
+        self.assertEqual(self.college.problem_version, version + 1)
+
+    def test_save_invalidates(self):
+        cached_problem(self.college)
+        Subject.objects.create(
+            college=self.college, code="NEW", name="New", credits=2, weekly_quota=3
+        )
+
+        with self.assertNumQueries(PROBLEM_QUERIES + 1):
+            problem = cached_problem(self.college)
+        self.assertEqual(problem['subject_quota_limits']["NEW"], 3)
+
+    def test_delete_invalidates(self):
+        cached_problem(self.college)
+        TeacherPreference.objects.filter(teacher__employee_id="CCH000").get().delete()
+
+        problem = cached_problem(self.college)
+        self.assertEqual(problem['teacher_preferences']["CCH000"], [])
+
+    def test_other_colleges_stay_cached(self):
+        other = create_college("OTH", num_teachers=1)
+        cached_problem(self.college)
+        Classroom.objects.create(college=other, name="R9", capacity=40)
+
+        with mock.patch('core.generation.load_problem') as load:
+            cached_problem(self.college)
+        load.assert_not_called()
+
+
+def allocation(teacher, subject, room, time_slot, group='all'):
+    return {
+        'teacher_id': teacher, 'subject_id': subject, 'classroom_id': room,
+        'time_slot': time_slot, 'group': group,
+    }
+
+
+class TimetableEntryTests(TestCase):
+    def setUp(self):
+        self.college = College.objects.create(name="Entries", code="ENT")
+        self.timetable = Timetable.objects.create(
+            college=self.college,
+            name="Odd semester",
+            academic_year="2026-27",
+            timetable_data={
+                "Monday": {
+                    "A": [allocation("T1", "CS101", "R1", "9:00 - 9:55")],
+                    "B": [allocation("T2", "CS102", "R2", "9:00 - 9:55")],
+                },
+                "Tuesday": {
+                    "A": [
+                        allocation("T1", "CS101", "R1", "12:05 - 1:00"),
+                        allocation("T2", "CS103", "L1", "1:20 - 2:15", group=1),
+                    ],
+                },
+            },
+        )
+
+    def test_save_stores_entries(self):
+        entries = list(self.timetable.entries.values_list('day', 'slot', 'section', 'teacher', 'room', 'group'))
+        self.assertEqual(entries, [
+            ("Monday", 1, "A", "T1", "R1", "all"),
+            ("Monday", 1, "B", "T2", "R2", "all"),
+            ("Tuesday", 4, "A", "T1", "R1", "all"),
+            ("Tuesday", 5, "A", "T2", "L1", "1"),
+        ])
+
+        self.timetable.save()
+        self.assertEqual(self.timetable.entries.count(), 4)
+
+    def test_save_of_other_fields_keeps_entries(self):
+        self.timetable.status = 'published'
+        with self.assertNumQueries(1):
+            self.timetable.save(update_fields=['status'])
+        self.assertEqual(self.timetable.entries.count(), 4)
+
+    def test_missing_group_defaults_to_all(self):
+        self.timetable.timetable_data = {
+            "Monday": {"A": [allocation("T1", "CS101", "R1", "9:00 - 9:55", group=None)]}
+        }
+        self.timetable.save()
+        self.assertEqual(list(self.timetable.entries.values_list('group', flat=True)), ["all"])
+
+    def test_endpoints(self):
+        admin = User.objects.create_user(
+            email="admin@ent.edu", password="secret", first_name="Admin", last_name="User",
+            role=User.Role.COLLEGE_ADMIN, college=self.college,
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        base = f"/api/timetables/{self.timetable.id}"
+
+        response = client.get(f"{base}/teachers/T1/", {'day': "Tuesday"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry['slot'] for entry in response.data], [4])
+
+        response = client.get(f"{base}/rooms/R1/", {'slot': 1})
+        self.assertEqual([entry['section'] for entry in response.data], ["A"])
+
+        response = client.get(f"{base}/sections/A/")
+        self.assertEqual(len(response.data), 3)
+
+        self.assertEqual(client.get("/api/timetables/abc/teachers/T1/").status_code, 404)
+
+        other = College.objects.create(name="Other", code="OTR")
+        admin.college = other
+        admin.save()
+        self.assertEqual(client.get(f"{base}/sections/A/").status_code, 404)
+
+
+class TimetableListTests(TestCase):
+    def setUp(self):
+        self.college = College.objects.create(name="Lists", code="LST")
+        self.admin = User.objects.create_user(
+            email="admin@lst.edu", password="secret", first_name="Admin", last_name="User",
+            role=User.Role.COLLEGE_ADMIN, college=self.college,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_timetables(self, count):
+        for number in range(count):
+            Timetable.objects.create(
+                college=self.college,
+                name=f"Timetable {number}",
+                academic_year="2026-27",
+                timetable_data={"Monday": {"A": [allocation("T1", "CS101", "R1", "9:00 - 9:55")]}},
+                generation_config={'total_generations': 50},
+                created_by=self.admin,
+            )
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/timetables/")
+        self.assertEqual(response.status_code, 200)
+        return response, queries
+
+    def test_list_omits_json_and_runs_fixed_queries(self):
+        self.create_timetables(2)
+        _, few = self.list_queries()
+        self.create_timetables(6)
+        response, many = self.list_queries()
+
+        self.assertEqual(len(many), len(few))
+        row = response.data['results'][0]
+        self.assertNotIn('timetable_data', row)
+        self.assertEqual(row['created_by_name'], "Admin User")
+        self.assertFalse(any('"timetable_data"' in query['sql'] for query in many.captured_queries))
+
+    def test_sparse_fields(self):
+        self.create_timetables(1)
+        timetable = Timetable.objects.get()
+
+        response = self.client.get("/api/timetables/", {'fields': "id,name"})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name'})
+
+        response = self.client.get(f"/api/timetables/{timetable.id}/")
+        self.assertIn('timetable_data', response.data)
+
+        response = self.client.get(f"/api/timetables/{timetable.id}/", {'fields': "id,status"})
+        self.assertEqual(set(response.data), {'id', 'status'})
+
+    def test_sparse_fields_ignored_on_writes(self):
+        response = self.client.post(
+            "/api/timetables/?fields=id",
+            {
+                'name': "Written",
+                'academic_year': "2026-27",
+                'timetable_data': {"Monday": {"A": [allocation("T1", "CS101", "R1", "9:00 - 9:55")]}},
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        timetable = Timetable.objects.get()
+        self.assertEqual(timetable.name, "Written")
+        self.assertEqual(timetable.entries.count(), 1)
+
+        response = self.client.patch(
+            f"/api/timetables/{timetable.id}/?fields=id", {'name': "Renamed"}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        timetable.refresh_from_db()
+        self.assertEqual(timetable.name, "Renamed")
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class GenerationJobTests(TestCase):
+    def setUp(self):
+        # The Celery app read its settings when first configured, so apply the
+        # override to it as well
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', eager)
+
+        self.college = create_college("JOB", num_teachers=3)
+        # One classroom per section
+        Classroom.objects.create(college=self.college, name="R2", capacity=60)
+        self.admin = User.objects.create_user(
+            email="admin@job.edu", password="secret", first_name="Admin", last_name="User",
+            role=User.Role.COLLEGE_ADMIN, college=self.college,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def generate(self):
+        response = self.client.post(
+            "/api/generate-timetable/generate/",
+            {'name': "Eager", 'academic_year': "2026-27", 'total_generations': 2},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 202)
+        return GenerationJob.objects.get(pk=response.data['job_id'])
+
+    def test_generate_runs_job(self):
+        job = self.generate()
+
+        self.assertEqual(job.status, GenerationJob.Status.SUCCEEDED)
+        self.assertIsNotNone(job.timetable_id)
+        self.assertEqual(job.generation, 2)
+        self.assertEqual(job.stop_reason, 'generations')
+
+        response = self.client.get(f"/api/generation-jobs/{job.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'succeeded')
+
+        response = self.client.get(f"/api/generation-jobs/{job.id}/result/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['timetable_id'], str(job.timetable_id))
+        self.assertIn('timetable', response.data)
+        self.assertTrue(job.timetable.entries.exists())
+
+    def test_failing_run(self):
+        with mock.patch('core.tasks.iter_timetable_generation', side_effect=RuntimeError("boom")):
+            job = self.generate()
+
+        self.assertEqual(job.status, GenerationJob.Status.FAILED)
+        self.assertIn("boom", job.error)
+        self.assertIsNone(job.timetable_id)
+
+        response = self.client.get(f"/api/generation-jobs/{job.id}/result/")
+        self.assertEqual(response.status_code, 409)
+        self.assertIn("boom", response.data['error'])
+
+    def test_missing_resources_fail_the_job(self):
+        self.admin.college = College.objects.create(name="Empty", code="EMJ")
+        self.admin.save()
+
+        job = self.generate()
+        self.assertEqual(job.status, GenerationJob.Status.FAILED)
+        self.assertIn("No sections found", job.error)
+
+    def test_redelivered_job_is_skipped(self):
+        job = GenerationJob.objects.create(
+            college=self.college,
+            created_by=self.admin,
+            status=GenerationJob.Status.RUNNING,
+            config={'name': "Twice", 'academic_year': "2026-27", 'total_generations': 2},
+            total_generations=2,
+        )
+
+        with mock.patch('core.tasks.iter_timetable_generation') as generation:
+            run_generation_job(str(job.id))
+        generation.assert_not_called()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.RUNNING)
+        self.assertIsNone(job.started_at)
+
+    def test_other_college_job_is_hidden(self):
+        other = College.objects.create(name="Other", code="OTJ")
+        job = GenerationJob.objects.create(
+            college=other,
+            config={'name': "Theirs", 'academic_year': "2026-27", 'total_generations': 2},
+            total_generations=2,
+        )
+
+        self.assertEqual(self.client.get(f"/api/generation-jobs/{job.id}/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/generation-jobs/{job.id}/result/").status_code, 404)
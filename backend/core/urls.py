@@ -16,6 +16,7 @@ router.register(r'subject-teacher-mappings', views.SubjectTeacherMappingViewSet,
 router.register(r'timetables', views.TimetableViewSet, basename='timetable')
 router.register(r'teacher-preferences', views.TeacherPreferenceViewSet, basename='teacher-preference')
 router.register(r'generate-timetable', views.GenerateTimetableViewSet, basename='generate-timetable')
+router.register(r'generation-jobs', views.GenerationJobViewSet, basename='generation-job')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -5,22 +5,25 @@ from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.db.models import Q
 from core.models import (
     College, Department, Teacher, Subject, Section,
-    Classroom, SubjectTeacherMapping, Timetable, TeacherPreference
+    Classroom, SubjectTeacherMapping, Timetable, TimetableEntry, TeacherPreference,
+    GenerationJob
 )
 from core.serializers import (
     CollegeSerializer, DepartmentSerializer, TeacherSerializer,
     SubjectSerializer, SectionSerializer, ClassroomSerializer,
-    SubjectTeacherMappingSerializer, TimetableSerializer,
-    TeacherPreferenceSerializer, GenerateTimetableSerializer
+    SubjectTeacherMappingSerializer, TimetableSerializer, TimetableListSerializer,
+    TimetableEntrySerializer,
+    TeacherPreferenceSerializer, GenerateTimetableSerializer, GenerationJobSerializer,
+    requested_fields
 )
 from core.permissions import (
     IsMasterAdmin, IsCollegeAdminOrMaster, IsCollegeMember, IsOwnerOrAdmin
 )
-from algorithm import run_timetable_generation
-from algorithm.helpers import initialize_teacher_availability
+from core.tasks import run_generation_job
 import logging
 
 logger = logging.getLogger(__name__)
@@ -159,12 +162,28 @@ class TimetableViewSet(viewsets.ModelViewSet):
     filterset_fields = ['status', 'academic_year', 'semester']
     search_fields = ['name', 'academic_year']
     
+    # Large JSON columns, read only when a response includes them
+    json_fields = ('timetable_data', 'generation_config')
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return TimetableListSerializer
+        return TimetableSerializer
+    
     def get_queryset(self):
         user = self.request.user
+        queryset = Timetable.objects.select_related('created_by', 'college')
+        if self.action == 'list':
+            queryset = queryset.defer(*self.json_fields)
+        elif self.action == 'retrieve':
+            fields = requested_fields(self.request)
+            if fields:
+                queryset = queryset.defer(*(name for name in self.json_fields if name not in fields))
         if user.role == 'master_admin':
-            return Timetable.objects.all()
-        return Timetable.objects.filter(college=user.college)
+            return queryset
+        return queryset.filter(college=user.college)
     
+    @transaction.atomic
     def perform_create(self, serializer):
         if not self.request.user.college:
             raise ValidationError("User has no college assigned")
@@ -173,187 +192,147 @@ class TimetableViewSet(viewsets.ModelViewSet):
             college=self.request.user.college,
             created_by=self.request.user
         )
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+    
+    def _entries(self, request, pk, **filters):
+        """
+        Classes of a timetable from its TimetableEntry rows, narrowed by
+        ``filters`` and the ``day`` and ``slot`` query parameters. The timetable's
+        JSON is never loaded.
+        """
+        # Only the primary key is read; a malformed pk gives 404
+        generics.get_object_or_404(self.get_queryset().select_related(None).only('pk'), pk=pk)
+        entries = TimetableEntry.objects.filter(timetable_id=pk, **filters)
+        day = request.query_params.get('day')
+        if day:
+            entries = entries.filter(day=day)
+        slot = request.query_params.get('slot')
+        if slot:
+            if not slot.isdigit():
+                return Response(
+                    {'error': 'slot must be a time slot number'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            entries = entries.filter(slot=int(slot))
+        return Response(TimetableEntrySerializer(entries, many=True).data)
+    
+    @action(detail=True, methods=['get'], url_path=r'teachers/(?P<teacher>[^/]+)')
+    def teacher(self, request, pk=None, teacher=None):
+        """Classes of one teacher, by employee id."""
+        return self._entries(request, pk, teacher=teacher)
+    
+    @action(detail=True, methods=['get'], url_path=r'rooms/(?P<room>[^/]+)')
+    def room(self, request, pk=None, room=None):
+        """Classes held in one classroom or lab."""
+        return self._entries(request, pk, room=room)
+    
+    @action(detail=True, methods=['get'], url_path=r'sections/(?P<section>[^/]+)')
+    def section(self, request, pk=None, section=None):
+        """Classes of one section."""
+        return self._entries(request, pk, section=section)
 
 
 class GenerateTimetableViewSet(viewsets.ViewSet):
     """ViewSet for generating timetables."""
     permission_classes = [IsAuthenticated, IsCollegeAdminOrMaster]
     
-    @action(detail=False, methods=['post'])
-    def generate(self, request):
-        """Generate a timetable using the genetic algorithm."""
+    def _queue_job(self, request):
+        """
+        Validate a generation request and queue a GenerationJob for it, as
+        ``(job, None)``, or ``(None, response)`` when it cannot be queued.
+        """
         serializer = GenerateTimetableSerializer(data=request.data)
         if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return None, Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         college = request.user.college
         if not college:
-            return Response(
+            return None, Response(
                 {'error': 'User must be associated with a college'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        job = GenerationJob.objects.create(
+            college=college,
+            created_by=request.user,
+            config=serializer.validated_data,
+            total_generations=serializer.validated_data['total_generations'],
+        )
         try:
-            # Get all required data from database
-            sections = Section.objects.filter(college=college)
-            classrooms = Classroom.objects.filter(college=college, is_lab=False)
-            labs = Classroom.objects.filter(college=college, is_lab=True)
-            subjects = Subject.objects.filter(college=college)
-            teachers = Teacher.objects.filter(department__college=college)
-            mappings = SubjectTeacherMapping.objects.filter(subject__college=college)
-            
-            # Validate resources exist
-            if not sections.exists():
-                return Response(
-                    {'error': 'No sections found. Please add sections first.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if not teachers.exists():
-                return Response(
-                    {'error': 'No teachers found. Please add teachers first.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if not subjects.exists():
-                return Response(
-                    {'error': 'No subjects found. Please add subjects first.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if not classrooms.exists() and not labs.exists():
-                return Response(
-                    {'error': 'No classrooms or labs found. Please add classrooms/labs first.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if not mappings.exists():
+            run_generation_job.delay(str(job.id))
+        except Exception as e:
+            logger.error(f"Error queuing generation job {job.id}: {str(e)}", exc_info=True)
+            job.status = GenerationJob.Status.FAILED
+            job.error = f'Failed to queue generation: {str(e)}'
+            job.save(update_fields=['status', 'error', 'updated_at'])
+            return None, Response(
+                {'job_id': str(job.id), 'error': job.error},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return job, None
+    
+    @action(detail=False, methods=['post'])
+    def generate(self, request):
+        """
+        Queue a timetable generation and return its job id right away (202). The
+        job runs in a Celery worker; follow it at ``generation-jobs/<job_id>/``.
+        A college missing sections, rooms, subjects, teachers or mappings fails
+        the job, with the reason in its ``error``.
+        """
+        job, error = self._queue_job(request)
+        if error is not None:
+            return error
+        
+        # An eager task has already finished by now
+        job.refresh_from_db(fields=['status'])
+        return Response(
+            {'job_id': str(job.id), 'status': job.status},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+def _job_result_payload(job):
+    """Payload of a succeeded job, as the synchronous generation returned it."""
+    return {
+        'timetable_id': str(job.timetable_id),
+        'timetable': job.timetable.timetable_data,
+        **job.result,
+    }
+
+
+class GenerationJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status, progress and results of background generation jobs."""
+    serializer_class = GenerationJobSerializer
+    permission_classes = [IsAuthenticated, IsCollegeAdminOrMaster]
+    filterset_fields = ['status']
+    
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == 'master_admin':
+            return GenerationJob.objects.all()
+        return GenerationJob.objects.filter(college=user.college)
+    
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk=None):
+        """
+        The payload of a succeeded job, as the synchronous generation returned it.
+        A job still pending or running gets 202 with its status, a failed job 409
+        with the error, and a job whose timetable was deleted since 410.
+        """
+        job = self.get_object()
+        if job.status == GenerationJob.Status.SUCCEEDED:
+            if job.timetable is None:
                 return Response(
-                    {'error': 'No subject-teacher mappings found. Please create mappings first.'},
-                    status=status.HTTP_400_BAD_REQUEST
+                    {'error': 'The generated timetable has been deleted.'},
+                    status=status.HTTP_410_GONE
                 )
-            
-            # Build data structures for algorithm
-            total_sections = {s.name: s.student_strength for s in sections}
-            total_classrooms = {c.name: c.capacity for c in classrooms}
-            total_labs = {l.name: l.capacity for l in labs}
-            
-            # Build teacher-subject mapping
-            teacher_subject_mapping = {}
-            for mapping in mappings:
-                subject_code = mapping.subject.code
-                teacher_id = mapping.teacher.employee_id
-                if subject_code not in teacher_subject_mapping:
-                    teacher_subject_mapping[subject_code] = []
-                teacher_subject_mapping[subject_code].append(teacher_id)
-            
-            # Build subject quota limits
-            subject_quota_limits = {s.code: s.weekly_quota for s in subjects}
-            
-            # Build lab subjects list
-            lab_subjects = [s.code for s in subjects if s.is_lab]
-            
-            # Build teacher preferences
-            teacher_preferences = {}
-            teacher_weekly_workload = {}
-            teacher_duty_days = {}
-            
-            for teacher in teachers:
-                teacher_id = teacher.employee_id
-                teacher_weekly_workload[teacher_id] = teacher.max_weekly_hours
-                teacher_duty_days[teacher_id] = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-                
-                # Get preferences if exists
-                try:
-                    pref = TeacherPreference.objects.get(teacher=teacher)
-                    teacher_preferences[teacher_id] = pref.preferred_time_slots or []
-                except TeacherPreference.DoesNotExist:
-                    teacher_preferences[teacher_id] = []
-            
-            # Initialize availability matrices
-            teacher_list = list(teacher_weekly_workload.keys())
-            num_days = len(serializer.validated_data.get('working_days', ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']))
-            num_slots = 7  # Default
-            
-            teacher_availability_matrix = initialize_teacher_availability(teacher_list, num_days, num_slots)
-            
-            lab_availability_matrix = {}
-            for lab in labs:
-                lab_availability_matrix[lab.name] = [[True] * num_slots for _ in range(num_days)]
-            
-            # Default time slots
-            time_slots = serializer.validated_data.get('time_slots', {
-                1: "9:00 - 9:55",
-                2: "9:55 - 10:50",
-                3: "11:10 - 12:05",
-                4: "12:05 - 1:00",
-                5: "1:20 - 2:15",
-                6: "2:15 - 3:10",
-                7: "3:30 - 4:25",
-            })
-            
-            day_map = serializer.validated_data.get('day_map', {
-                "Monday": 0,
-                "Tuesday": 1,
-                "Wednesday": 2,
-                "Thursday": 3,
-                "Friday": 4,
-            })
-            
-            time_slot_map = serializer.validated_data.get('time_slot_map', {
-                "9:00 - 9:55": 1,
-                "9:55 - 10:50": 2,
-                "11:10 - 12:05": 3,
-                "12:05 - 1:00": 4,
-                "1:20 - 2:15": 5,
-                "2:15 - 3:10": 6,
-                "3:30 - 4:25": 7,
-            })
-            
-            working_days = serializer.validated_data.get('working_days', ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
-            
-            # Run algorithm
-            best_tt, final_teacher, final_lab, fitness_score = run_timetable_generation(
-                teacher_subject_mapping=teacher_subject_mapping,
-                total_sections=total_sections,
-                total_classrooms=total_classrooms,
-                total_labs=total_labs,
-                teacher_preferences=teacher_preferences,
-                teacher_weekly_workload=teacher_weekly_workload,
-                special_subjects={},
-                labs=lab_subjects,
-                subject_quota_limits=subject_quota_limits,
-                teacher_duty_days=teacher_duty_days,
-                teacher_availability_matrix=teacher_availability_matrix,
-                lab_availability_matrix=lab_availability_matrix,
-                total_generations=serializer.validated_data['total_generations'],
-                time_slots=time_slots,
-                day_map=day_map,
-                time_slot_map=time_slot_map,
-                fixed_teacher_assignment=serializer.validated_data.get('fixed_teacher_assignment'),
-                working_days=working_days,
-            )
-            
-            # Save timetable
-            timetable = Timetable.objects.create(
-                college=college,
-                name=serializer.validated_data['name'],
-                academic_year=serializer.validated_data['academic_year'],
-                semester=serializer.validated_data.get('semester', ''),
-                status='generated',
-                timetable_data=best_tt,
-                fitness_score=fitness_score,
-                generation_config=serializer.validated_data,
-                created_by=request.user,
-            )
-            
-            return Response({
-                'timetable_id': str(timetable.id),
-                'timetable': best_tt,
-                'fitness_score': fitness_score,
-                'teacher_availability': final_teacher,
-                'lab_availability': final_lab,
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            logger.error(f"Error generating timetable: {str(e)}", exc_info=True)
+            return Response(_job_result_payload(job))
+        if job.status == GenerationJob.Status.FAILED:
             return Response(
-                {'error': f'Failed to generate timetable: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'status': job.status, 'error': job.error, 'stop_reason': job.stop_reason},
+                status=status.HTTP_409_CONFLICT
             )
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
@@ -162,6 +162,17 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Cache (compiled generation problems, keyed by each college's data version,
+# which is kept in the database). Any backend is correct; with a per-process one
+# such as locmem, each worker compiles a college's problem once per version.
+# django.core.cache.backends.redis.RedisCache shares them between workers.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
 # Celery Configuration (for async tasks)
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -169,3 +180,8 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Without Redis, run tasks inline in the request (CELERY_TASK_ALWAYS_EAGER=True),
+# or set CELERY_BROKER_URL=memory:// and CELERY_RESULT_BACKEND=cache+memory://
+# with a worker in the same process (celery.contrib.testing.worker.start_worker)
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = True
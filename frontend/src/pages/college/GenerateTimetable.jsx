@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import { useMutation, useQuery } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
 import { Link } from 'react-router-dom'
@@ -48,13 +48,31 @@ export default function GenerateTimetable() {
     },
   })
 
+  const [jobId, setJobId] = useState(null)
+
   const generateMutation = useMutation({
     mutationFn: (data) => api.post('/generate-timetable/generate/', data),
-    onSuccess: () => {
-      navigate('/college/timetables')
-    },
+    onMutate: () => setJobId(null),
+    onSuccess: (response) => setJobId(response.data.job_id),
   })
 
+  // Generation runs as a background job; poll it until it finishes
+  const { data: job } = useQuery({
+    queryKey: ['generation-job', jobId],
+    queryFn: () => api.get(`/generation-jobs/${jobId}/`).then(r => r.data),
+    enabled: !!jobId,
+    refetchInterval: (query) =>
+      ['succeeded', 'failed'].includes(query.state.data?.status) ? false : 1000,
+  })
+
+  useEffect(() => {
+    if (job?.status === 'succeeded') {
+      navigate('/college/timetables')
+    }
+  }, [job?.status, navigate])
+
+  const isGenerating = generateMutation.isPending || (!!jobId && !['succeeded', 'failed'].includes(job?.status))
+
   const handleSubmit = (e) => {
     e.preventDefault()
     generateMutation.mutate(formData)
@@ -190,12 +208,23 @@ export default function GenerateTimetable() {
             {generateMutation.error?.response?.data?.error || generateMutation.error.message || 'Failed to generate timetable'}
           </div>
         )}
+        {job?.status === 'failed' && (
+          <div className="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">
+            {job.error || 'Failed to generate timetable'}
+          </div>
+        )}
+        {isGenerating && job?.status === 'running' && (
+          <p className="text-sm text-gray-600">
+            Generation {job.generation} of {job.total_generations}
+            {job.best_fitness != null && ` - best fitness ${job.best_fitness}`}
+          </p>
+        )}
         <button
           type="submit"
-          disabled={generateMutation.isPending || !canGenerate}
+          disabled={isGenerating || !canGenerate}
           className="w-full bg-primary-600 text-white py-2 px-4 rounded-md hover:bg-primary-700 disabled:opacity-50 disabled:cursor-not-allowed"
         >
-          {generateMutation.isPending ? 'Generating...' : 'Generate Timetable'}
+          {isGenerating ? 'Generating...' : 'Generate Timetable'}
         </button>
       </form>
     </div>
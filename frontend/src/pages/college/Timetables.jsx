@@ -15,7 +15,9 @@ export default function Timetables() {
     },
   })
 
-  const exportToExcel = (timetable) => {
+  const exportToExcel = async (listed) => {
+    // The list omits timetable_data, so fetch the full timetable first
+    const { data: timetable } = await api.get(`/timetables/${listed.id}/`)
     if (!timetable?.timetable_data) return
 
     const workbook = XLSX.utils.book_new()
@@ -13,11 +13,12 @@ setup(
         "pytest==7.4.2",
         "ortools==9.11.4210",
         "icecream==2.1.3",
+        "numpy>=1.24",
     ],  # noqa: E501
     setup_requires=["pytest-runner"],
     tests_require=["pytest==7.4.2"],
     test_suite="tests",
-    python_requires=">=3.7",
+    python_requires=">=3.8",
     project_urls={
         "Documentation": "https://github.com/TImeTable-GEHU/Time-Table/blob/main/README.md",
         "Source": "https://github.com/TImeTable-GEHU/Time-Table",
@@ -0,0 +1,81 @@
+# TEST HELPERS
+
+# Builders for the sample problem in Samples.samples, shared by the test modules
+
+from Constants.helper_routines import initialize_teacher_availability
+from GA import TimetableConfig
+from GA.chromosome import TimeTableGeneration
+from Samples.samples import (
+    RoomCapacity,
+    SpecialSubjects,
+    SubjectTeacherMap,
+    SubjectWeeklyQuota,
+    TeacherWorkload,
+    TimeSlots,
+)
+
+
+def generator_params(**overrides):
+    params = dict(
+        teacher_subject_mapping=SubjectTeacherMap.subject_teacher_map,
+        total_sections=RoomCapacity.section_strength,
+        total_classrooms=RoomCapacity.room_capacity,
+        total_labs=RoomCapacity.lab_capacity,
+        teacher_preferences=TeacherWorkload.teacher_preferences,
+        teacher_weekly_workload=TeacherWorkload.Weekly_workLoad,
+        special_subjects=SpecialSubjects.special_subjects,
+        labs=SpecialSubjects.Labs,
+        subject_quota_limits=SubjectWeeklyQuota.subject_quota,
+        teacher_duty_days=TeacherWorkload.teacher_duty_days,
+        teacher_availability_matrix=initialize_teacher_availability(
+            TeacherWorkload.Weekly_workLoad.keys(), 6, 7
+        ),
+        lab_availability_matrix={
+            lab: [[True] * 7 for _ in range(6)] for lab in RoomCapacity.lab_capacity
+        },
+        time_slots=TimeSlots.time_slots,
+    )
+    params.update(overrides)
+    return params
+
+
+def build_generator(**overrides):
+    return TimeTableGeneration(**generator_params(**overrides))
+
+
+def generated_timetable(num_weeks):
+    return build_generator().create_timetable(num_weeks)[0]
+
+
+def build_config(**overrides):
+    params = dict(
+        total_generations=4,
+        day_map={
+            day: i
+            for i, day in enumerate(
+                ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+            )
+        },
+        time_slot_map={v: k for k, v in TimeSlots.time_slots.items()},
+        fixed_teacher_assignment={},
+        population_size=6,
+    )
+    params.update(overrides)
+    return TimetableConfig(**generator_params(**params))
+
+
+def fitness_problem(**overrides):
+    problem = dict(
+        all_sections=list(RoomCapacity.section_strength),
+        subject_teacher_mapping=SubjectTeacherMap.subject_teacher_map,
+        available_classrooms=list(RoomCapacity.room_capacity),
+        available_labs=list(RoomCapacity.lab_capacity),
+        classroom_capacity=RoomCapacity.room_capacity,
+        section_student_strength=RoomCapacity.section_strength,
+        subject_quota_data=SubjectWeeklyQuota.subject_quota,
+        teacher_time_preferences=TeacherWorkload.teacher_preferences,
+        teacher_daily_workload=TeacherWorkload.Weekly_workLoad,
+        time_slots=TimeSlots.time_slots,
+    )
+    problem.update(overrides)
+    return problem
@@ -0,0 +1,324 @@
+# CHROMOSOME TESTS
+
+import copy
+import unittest
+
+import numpy as np
+
+from Constants.helper_routines import initialize_teacher_availability
+from GA.availability import AvailabilityMatrix
+from GA.encoding import EMPTY, GeneCodec
+from GA.lab_allocator import LabAllocationIndex
+from GA.population import PopulationBuilder, spawn_seeds
+from GA.subject_index import SubjectCandidateIndex
+from helpers import build_generator
+from Samples.samples import (
+    RoomCapacity,
+    SubjectTeacherMap,
+    SubjectWeeklyQuota,
+    TeacherWorkload,
+    TimeSlots,
+)
+
+
+# 1. Compact chromosome encoding (GA/encoding.py)
+
+class TestCompactChromosome(unittest.TestCase):
+    def setUp(self):
+        self.generator = build_generator()
+        self.timetable = self.generator.create_timetable(3)[0]
+        self.codec = GeneCodec.for_problem(
+            SubjectTeacherMap.subject_teacher_map,
+            RoomCapacity.section_strength,
+            RoomCapacity.room_capacity,
+            RoomCapacity.lab_capacity,
+            TimeSlots.time_slots,
+        )
+
+    def test_round_trip_is_lossless(self):
+        for schedule in self.timetable.values():
+            decoded = self.codec.encode(schedule).to_dict()
+            self.assertEqual(decoded, schedule)
+            # dict order matters to the fitness evaluator, so it must survive too
+            self.assertEqual(list(decoded), list(schedule))
+            for day in schedule:
+                self.assertEqual(list(decoded[day]), list(schedule[day]))
+
+    def test_extra_keys_are_preserved(self):
+        schedule = {
+            "Monday": {
+                "A": [
+                    {
+                        "teacher_id": "AD08",
+                        "subject_id": "PCS-506",
+                        "classroom_id": "merged_lab",
+                        "time_slot": "9:00 - 9:55",
+                        "group": "merged",
+                        "flagged": False,
+                    }
+                ]
+            }
+        }
+        chromosome = self.codec.encode(schedule)
+        self.assertEqual(chromosome.to_dict(), schedule)
+
+    def test_ragged_sections_are_padded(self):
+        schedule = {
+            "Monday": {
+                "A": [
+                    {
+                        "teacher_id": "AB01",
+                        "subject_id": "TCS-531",
+                        "classroom_id": "R1",
+                        "time_slot": "9:00 - 9:55",
+                        "group": "all",
+                    }
+                ] * 3,
+                "B": [],
+            },
+            "Tuesday": {},
+        }
+        chromosome = self.codec.encode(schedule)
+        self.assertEqual(chromosome.shape, (2, 2, 3, 5))
+        self.assertTrue((chromosome.genes[0, 1] == EMPTY).all())
+        self.assertEqual(chromosome.to_dict(), schedule)
+
+    def test_population_round_trip(self):
+        population = self.codec.encode_population(self.timetable)
+        self.assertEqual(self.codec.decode_population(population), self.timetable)
+
+    def test_copy_is_independent(self):
+        chromosome = self.codec.encode(self.timetable["Week 1"])
+        clone = chromosome.copy()
+        self.assertEqual(clone, chromosome)
+        clone.genes[0, 0, 0, 0] = EMPTY
+        self.assertNotEqual(clone, chromosome)
+
+    def test_create_encoded_timetable(self):
+        population, codec, _, _ = build_generator().create_encoded_timetable(2)
+        self.assertEqual(list(population), ["Week 1", "Week 2"])
+        for chromosome in population.values():
+            schedule = chromosome.to_dict()
+            self.assertEqual(codec.encode(copy.deepcopy(schedule)).to_dict(), schedule)
+
+
+# 2. Teacher/lab availability store (GA/availability.py)
+
+class TestAvailabilityMatrix(unittest.TestCase):
+    def setUp(self):
+        self.legacy = initialize_teacher_availability(["AB01", "PK02", "SS03"], 5, 7)
+        self.legacy["PK02"][1][3] = False
+        self.matrix = AvailabilityMatrix.from_dict(self.legacy)
+
+    def test_round_trip(self):
+        self.assertEqual(self.matrix.to_dict(), self.legacy)
+
+    def test_is_free_matches_nested_lists(self):
+        for teacher, days in self.legacy.items():
+            for day, slots in enumerate(days):
+                for slot, free in enumerate(slots):
+                    self.assertEqual(self.matrix.is_free(teacher, day, slot), free)
+
+    def test_out_of_range_and_unknown_are_busy(self):
+        self.assertFalse(self.matrix.is_free("XX99", 0, 0))
+        self.assertFalse(self.matrix.is_free("AB01", 5, 0))
+        self.assertFalse(self.matrix.is_free("AB01", 0, 7))
+        self.assertFalse(self.matrix.is_free("AB01", -1, 0))
+
+    def test_occupy_and_free_at(self):
+        self.matrix.occupy("AB01", 1, 3)
+        self.assertEqual(self.matrix.free_at(1, 3), ["SS03"])
+        self.assertEqual(self.matrix.free_among(["PK02", "SS03", "XX99"], 1, 3), ["SS03"])
+        self.matrix.release("AB01", 1, 3)
+        self.assertEqual(self.matrix.free_at(1, 3), ["AB01", "SS03"])
+
+    def test_snapshot_restore(self):
+        snapshot = self.matrix.snapshot()
+        self.matrix.occupy("SS03", 4, 6)
+        self.matrix.restore(snapshot)
+        self.assertTrue(self.matrix.is_free("SS03", 4, 6))
+
+    def test_ragged_rows_are_padded_busy(self):
+        matrix = AvailabilityMatrix.from_dict({"L1": [[True] * 7, [True] * 4]})
+        self.assertEqual(matrix.free.shape, (1, 2, 7))
+        self.assertFalse(matrix.is_free("L1", 1, 5))
+
+    def test_legacy_mapping_access(self):
+        self.assertIn("AB01", self.matrix)
+        self.matrix["AB01"][2][0] = False
+        self.assertFalse(self.matrix.is_free("AB01", 2, 0))
+        self.assertTrue(np.array_equal(self.matrix["PK02"], np.array(self.legacy["PK02"])))
+
+    def test_generator_accepts_matrix(self):
+        teachers = AvailabilityMatrix.from_dict(
+            initialize_teacher_availability(TeacherWorkload.Weekly_workLoad.keys(), 6, 7)
+        )
+        teachers.free[:] = False
+        timetable = build_generator(teacher_availability_matrix=teachers).create_timetable(1)[0]
+        subjects = {
+            entry["subject_id"]
+            for day in timetable["Week 1"].values()
+            for entries in day.values()
+            for entry in entries
+        }
+        self.assertEqual(subjects, {"Library"})
+
+
+# 3. Subject candidate index (GA/subject_index.py)
+
+class TestSubjectCandidateIndex(unittest.TestCase):
+    def setUp(self):
+        self.mapping = {"S1": ["T1", "T2", "T3"], "S2": ["T2"], "S3": ["T4"]}
+        self.usage = {"A": {"S1": 0, "S2": 0, "S3": 0}, "B": {"S1": 2, "S2": 0, "S3": 0}}
+        self.index = SubjectCandidateIndex(
+            self.mapping,
+            {"S1": 2, "S2": 1},
+            {"T1": [1], "T2": [1], "T3": [1], "T4": [1]},
+            self.usage,
+        )
+        self.workload = {teacher: 0 for teacher in ["T1", "T2", "T3", "T4"]}
+        self.index.reset_workload(self.workload)
+
+    def test_available_subjects_follow_quota(self):
+        self.assertEqual(self.index.available_subjects("A"), ["S1", "S2"])
+        self.assertEqual(self.index.available_subjects("B"), ["S2"])
+        self.index.consume("A", "S1")
+        self.assertEqual(self.index.available_subjects("A"), ["S1", "S2"])
+        self.index.consume("A", "S1")
+        self.assertEqual(self.index.available_subjects("A"), ["S2"])
+        self.index.consume("A", "Library")
+        self.assertEqual(self.index.available_subjects("A"), ["S2"])
+
+    def test_pick_teacher_prefers_least_loaded(self):
+        picks = [self.index.pick_teacher("S1", lambda t: True) for _ in range(4)]
+        self.assertEqual(picks, ["T1", "T2", "T3", "T1"])
+        self.assertEqual(self.workload["T1"], 2)
+
+    def test_pick_teacher_skips_busy_and_keeps_them(self):
+        self.assertEqual(self.index.pick_teacher("S1", lambda t: t != "T1"), "T2")
+        self.assertEqual(self.index.pick_teacher("S1", lambda t: True), "T1")
+        self.assertIsNone(self.index.pick_teacher("S1", lambda t: False))
+        self.assertEqual(self.index.pick_teacher("S1", lambda t: True), "T3")
+
+    def test_workload_is_shared_across_subjects(self):
+        self.assertEqual(self.index.pick_teacher("S2", lambda t: True), "T2")
+        self.assertEqual(self.index.pick_teacher("S1", lambda t: t != "T1"), "T3")
+
+    def test_teachers_without_preferences_are_skipped(self):
+        index = SubjectCandidateIndex({"S1": ["T1", "T2"]}, {"S1": 1}, {"T2": [1]}, {"A": {}})
+        index.reset_workload({})
+        self.assertEqual(index.pick_teacher("S1", lambda t: True), "T2")
+
+    def test_generated_week_respects_quota(self):
+        timetable = build_generator().create_timetable(2)[0]
+        for schedule in timetable.values():
+            usage = {}
+            for day in schedule.values():
+                for section, entries in day.items():
+                    for entry in entries:
+                        key = (section, entry["subject_id"])
+                        if entry["group"] == "all":
+                            usage[key] = usage.get(key, 0) + 1
+            for (section, subject), count in usage.items():
+                if subject != "Library":
+                    self.assertLessEqual(count, SubjectWeeklyQuota.subject_quota[subject])
+
+
+# 4. Lab pair allocation index (GA/lab_allocator.py)
+
+class TestLabAllocationIndex(unittest.TestCase):
+    def setUp(self):
+        self.capacity = {"L1": 70, "L2": 30, "L3": 50, "L4": 35}
+        self.matrix = AvailabilityMatrix.from_dict(
+            {lab: [[True] * 7 for _ in range(2)] for lab in self.capacity}
+        )
+        self.index = LabAllocationIndex(self.capacity, self.matrix)
+
+    def test_labs_sorted_by_capacity(self):
+        self.assertEqual(self.index.labs, ["L2", "L4", "L3", "L1"])
+
+    def test_find_pair_is_tightest_fit(self):
+        self.assertEqual(self.index.find_pair(0, 0, 35, 30), ("L4", "L2"))
+        self.assertEqual(self.index.find_pair(0, 0, 40, 35), ("L3", "L4"))
+        self.assertEqual(self.index.find_pair(0, 0, 50, 50), ("L1", "L3"))
+        self.assertIsNone(self.index.find_pair(0, 0, 70, 70))
+
+    def test_allocate_books_both_slots(self):
+        self.assertEqual(self.index.allocate(1, 2, 35, 30), ("L4", "L2"))
+        for lab in ("L4", "L2"):
+            self.assertFalse(self.matrix.is_free(lab, 1, 2))
+            self.assertFalse(self.matrix.is_free(lab, 1, 3))
+        self.assertEqual(self.index.find_pair(1, 3, 35, 30), ("L1", "L3"))
+        self.assertEqual(self.index.find_pair(1, 4, 35, 30), ("L4", "L2"))
+
+    def test_busy_labs_are_skipped(self):
+        self.matrix.occupy("L4", 0, 1)
+        index = LabAllocationIndex(self.capacity, self.matrix)
+        self.assertEqual(index.find_pair(0, 0, 35, 30), ("L3", "L2"))
+
+    def test_last_slot_has_no_pair(self):
+        self.assertIsNone(self.index.find_pair(0, 6, 10, 10))
+        self.assertIsNone(self.index.find_pair(2, 0, 10, 10))
+
+    def test_allocate_day_serves_large_sessions_first(self):
+        results = self.index.allocate_day(0, [(0, 60), (0, 100)])
+        self.assertEqual(results, [("L4", "L2"), ("L1", "L3")])
+
+    def test_generator_uses_index(self):
+        generator = build_generator()
+        generator.create_timetable(1)
+        booked = ~generator.lab_availability_matrix.free
+        self.assertEqual(booked.sum() % 2, 0)
+
+
+# 5. Parallel population construction (GA/population.py)
+
+class TestPopulationBuilder(unittest.TestCase):
+    def setUp(self):
+        generator = build_generator()
+        self.problem = dict(
+            teacher_subject_mapping=generator.subject_teacher_mapping,
+            total_sections=generator.sections_manager,
+            total_classrooms=generator.classrooms_manager,
+            total_labs=generator.lab_capacity_manager,
+            teacher_preferences=generator.teacher_availability_preferences,
+            teacher_weekly_workload=generator.weekly_workload,
+            special_subjects=generator.special_subject_list,
+            labs=generator.lab_subject_list,
+            subject_quota_limits=generator.subject_quota_limits,
+            teacher_duty_days=generator.teacher_duty_days,
+            teacher_availability_matrix=generator.teacher_availability_matrix,
+            lab_availability_matrix=generator.initial_lab_availability_matrix,
+            time_slots=generator.available_time_slots,
+        )
+
+    def test_spawn_seeds_is_deterministic(self):
+        self.assertEqual(spawn_seeds(7, 4), spawn_seeds(7, 4))
+        self.assertEqual(len(set(spawn_seeds(7, 4))), 4)
+        self.assertNotEqual(spawn_seeds(7, 4), spawn_seeds(8, 4))
+
+    def test_parallel_matches_serial(self):
+        seeds = spawn_seeds(42, 6)
+        with PopulationBuilder(self.problem, workers=1) as builder:
+            serial = builder.build(6, seeds)
+        with PopulationBuilder(self.problem, workers=3) as builder:
+            parallel = builder.build(6, seeds)
+        self.assertEqual(list(parallel), [f"Week {i}" for i in range(1, 7)])
+        self.assertEqual(parallel, serial)
+
+    def test_week_does_not_depend_on_position(self):
+        seeds = spawn_seeds(3, 3)
+        with PopulationBuilder(self.problem) as builder:
+            forward = builder.build_weeks(seeds)
+            backward = builder.build_weeks(seeds[::-1])
+        self.assertEqual(forward, backward[::-1])
+
+    def test_create_timetable_with_seeds(self):
+        seeds = spawn_seeds(5, 2)
+        first = build_generator().create_timetable(2, seeds=seeds)[0]
+        second = build_generator().create_timetable(2, seeds=seeds)[0]
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -746,5 +746,136 @@ Chromosome 1:
         self.assertEqual(output, expected_output.strip())
 
 
+if __name__ == "__main__":
+    unittest.main()
+
+# 6. Structurally shared crossover operators (GA/crossover.py)
+
+import copy
+import random
+import unittest
+
+from GA.crossover import CROSSOVER_OPERATORS, CrossoverOperator, get_crossover
+from GA.mutation import TimeTableCrossOver
+
+SLOTS = {1: "9:00 - 9:55", 2: "9:55 - 10:50", 3: "11:10 - 12:05", 4: "12:05 - 1:00"}
+
+
+def sample_week(teacher_prefix):
+    return {
+        day: {
+            section: [
+                {
+                    "teacher_id": f"{teacher_prefix}{day[:2]}{section}{number}",
+                    "subject_id": f"S{number}",
+                    "classroom_id": "R1",
+                    "time_slot": slot,
+                    "group": "all",
+                }
+                for number, slot in SLOTS.items()
+            ]
+            for section in ["A", "B", "C"]
+        }
+        for day in ["Monday", "Tuesday", "Wednesday", "Thursday"]
+    }
+
+
+def operators():
+    for name in CROSSOVER_OPERATORS:
+        kwargs = {"time_slots": SLOTS} if name == "slot_block" else {}
+        yield name, get_crossover(name, rng=random.Random(5), **kwargs)
+
+
+def week_entries(week):
+    return sorted(
+        (day, section, entry["teacher_id"])
+        for day, day_schedule in week.items()
+        for section, entries in day_schedule.items()
+        for entry in entries
+    )
+
+
+class TestSharedCrossover(unittest.TestCase):
+    def setUp(self):
+        self.parent1, self.parent2 = sample_week("P"), sample_week("Q")
+
+    def test_parents_are_never_modified(self):
+        original1, original2 = copy.deepcopy(self.parent1), copy.deepcopy(self.parent2)
+        for name, operator in operators():
+            with self.subTest(operator=name):
+                operator.cross(self.parent1, self.parent2)
+                self.assertEqual(self.parent1, original1)
+                self.assertEqual(self.parent2, original2)
+
+    def test_children_keep_days_sections_and_entries(self):
+        both = week_entries(self.parent1) + week_entries(self.parent2)
+        for name, operator in operators():
+            with self.subTest(operator=name):
+                child1, child2 = operator.cross(self.parent1, self.parent2)
+                for child in (child1, child2):
+                    self.assertEqual(list(child), list(self.parent1))
+                    for day in child:
+                        self.assertEqual(set(child[day]), set(self.parent1[day]))
+                self.assertEqual(sorted(week_entries(child1) + week_entries(child2)), sorted(both))
+
+    def test_children_share_entries_with_parents(self):
+        parent_entries = {
+            id(entry)
+            for parent in (self.parent1, self.parent2)
+            for day_schedule in parent.values()
+            for entries in day_schedule.values()
+            for entry in entries
+        }
+        for name, operator in operators():
+            with self.subTest(operator=name):
+                for child in operator.cross(self.parent1, self.parent2):
+                    for day_schedule in child.values():
+                        for entries in day_schedule.values():
+                            for entry in entries:
+                                self.assertIn(id(entry), parent_entries)
+
+    def test_section_crossover_keeps_whole_weeks(self):
+        child1, _ = get_crossover("section", rng=random.Random(2)).cross(
+            self.parent1, self.parent2
+        )
+        for section in ["A", "B", "C"]:
+            week = [child1[day][section] for day in child1]
+            self.assertTrue(
+                week == [self.parent1[day][section] for day in child1]
+                or week == [self.parent2[day][section] for day in child1]
+            )
+
+    def test_slot_block_keeps_slot_order(self):
+        child1, child2 = get_crossover(
+            "slot_block", rng=random.Random(4), time_slots=SLOTS
+        ).cross(self.parent1, self.parent2)
+        for child in (child1, child2):
+            for day_schedule in child.values():
+                for entries in day_schedule.values():
+                    self.assertEqual(
+                        [entry["time_slot"] for entry in entries], list(SLOTS.values())
+                    )
+
+    def test_operator_without_cross_cannot_be_built(self):
+        class Incomplete(CrossoverOperator):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_unknown_crossover_is_rejected(self):
+        with self.assertRaises(ValueError):
+            get_crossover("two_point")
+
+    def test_perform_crossover_does_not_alias_its_inputs(self):
+        original1, original2 = copy.deepcopy(self.parent1), copy.deepcopy(self.parent2)
+        child1, child2 = TimeTableCrossOver().perform_crossover(self.parent1, self.parent2)
+        self.assertEqual(self.parent1, original1)
+        self.assertEqual(self.parent2, original2)
+        self.assertEqual(child1, original2)
+        self.assertEqual(child2, original1)
+        self.assertIs(child1["Monday"], self.parent2["Monday"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,760 @@
+# ENGINE TESTS
+
+import copy
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+import unittest.mock
+
+from GA import (
+    GenerationProgress,
+    TimetableEngine,
+    TimetableResult,
+    iter_timetable_generation,
+)
+from GA.checkpoint import VERSION, Checkpoint, CheckpointError
+from GA.islands import IslandModel
+from GA.population import PopulationBuilder
+from GA.profiling import NULL_PROFILER, Histogram, Profiler, ProfilerHook
+from GA.repair import ConflictRepair
+from GA.seeding import SeedStreams
+from GA.stopping import GenerationTimeout, StopCriteria
+from helpers import build_config
+from Samples.samples import RoomCapacity, TeacherWorkload
+
+
+# 1. Persistent evolving population (GA/__init__.py)
+
+def start_engine(engine):
+    engine._reset_state()
+    engine.population_builder = PopulationBuilder(
+        engine._problem(engine.teacher_availability.copy())
+    )
+    engine._initialize_population()
+    return engine
+
+
+class TestPersistentPopulation(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+
+    def test_population_size_is_kept(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        for _ in range(3):
+            engine._evolve()
+            self.assertEqual(len(engine.population), 6)
+            self.assertEqual(set(engine.population), set(engine.fitness_scores))
+
+    def test_best_score_never_drops(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        best = engine.best()[1]
+        for _ in range(4):
+            engine._evolve()
+            self.assertGreaterEqual(engine.best()[1], best)
+            best = engine.best()[1]
+
+    def test_elites_survive_unchanged(self):
+        engine = start_engine(TimetableEngine(build_config(elite_count=2)))
+        ranked = sorted(engine.fitness_scores, key=engine.fitness_scores.get, reverse=True)
+        elites = {key: copy.deepcopy(engine.population[key]) for key in ranked[:2]}
+        engine._evolve()
+        for key, chromosome in elites.items():
+            self.assertIn(key, engine.population)
+            self.assertEqual(engine.population[key], chromosome)
+
+    def test_only_configured_immigrants_are_generated(self):
+        engine = start_engine(TimetableEngine(build_config(immigrant_count=2)))
+        built = []
+        original = engine.population_builder.build
+
+        def counting_build(num_weeks, *args, **kwargs):
+            built.append(num_weeks)
+            return original(num_weeks, *args, **kwargs)
+
+        engine.population_builder.build = counting_build
+        engine._evolve()
+        self.assertEqual(built, [2])
+
+    def test_scores_do_not_depend_on_batch(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        key = next(iter(engine.population))
+        alone = engine._evaluate({key: engine.population[key]})[key]
+        self.assertEqual(alone, engine.fitness_scores[key])
+
+    def test_batch_fitness_matches_the_loop_evaluator(self):
+        engine = start_engine(TimetableEngine(build_config(batch_fitness=True, seed=3)))
+        self.assertEqual(
+            engine._batch_scores(engine.population),
+            {key: engine._score(key, chromosome) for key, chromosome in engine.population.items()},
+        )
+        loop = start_engine(TimetableEngine(build_config(seed=3)))
+        self.assertEqual(engine.fitness_scores, loop.fitness_scores)
+
+    def test_batch_fitness_run_is_unchanged(self):
+        batched = TimetableEngine(build_config(batch_fitness=True, seed=3)).run()
+        plain = TimetableEngine(build_config(seed=3)).run()
+        self.assertEqual(batched.timetable, plain.timetable)
+        self.assertEqual(batched.fitness, plain.fitness)
+
+    def test_offspring_scores_match_full_evaluation(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        offspring, scores = engine._breed(engine.fitness_scores)
+        self.assertTrue(offspring)
+        for key, chromosome in offspring.items():
+            self.assertEqual(scores[key], engine._score(key, chromosome))
+            if key in engine.trackers:
+                self.assertEqual(engine.trackers[key].score, scores[key])
+
+    def test_duplicate_chromosomes_hit_the_cache(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        key = next(iter(engine.population))
+        hits = engine.fitness_cache.hits
+        twin = copy.deepcopy(engine.population[key])
+        score = engine._evaluate({"Twin": twin})["Twin"]
+        self.assertEqual(score, engine.fitness_scores[key])
+        self.assertEqual(engine.fitness_cache.hits, hits + 1)
+
+    def test_child_hash_matches_hash_from_scratch(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        offspring, _ = engine._breed(engine.fitness_scores)
+        for key, chromosome in offspring.items():
+            self.assertEqual(
+                engine.zobrist.week_hash(engine.day_hashes[key]),
+                engine.zobrist.week_hash(engine.zobrist.day_hashes(chromosome)),
+            )
+
+    def test_run_returns_timetable_and_matrices(self):
+        best, teacher, lab = TimetableEngine(build_config(total_generations=2)).run()
+        self.assertEqual(set(best["Monday"]), set(RoomCapacity.section_strength))
+        self.assertEqual(set(teacher), set(TeacherWorkload.Weekly_workLoad))
+        self.assertEqual(set(lab), set(RoomCapacity.lab_capacity))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 2. Configurable crossover strategy (GA/__init__.py)
+
+class TestCrossoverStrategy(unittest.TestCase):
+    def test_every_strategy_breeds_scored_offspring(self):
+        for name in ["section", "uniform", "slot_block"]:
+            with self.subTest(strategy=name):
+                random.seed(7)
+                engine = start_engine(TimetableEngine(build_config(crossover_strategy=name)))
+                offspring, scores = engine._breed(engine.fitness_scores)
+                for key, chromosome in offspring.items():
+                    self.assertEqual(scores[key], engine._score(key, chromosome))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 3. Conflict repair after crossover and mutation (GA/__init__.py)
+
+class TestRepairStage(unittest.TestCase):
+    def setUp(self):
+        random.seed(13)
+
+    def test_repair_history_counts_each_breeding_round(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        for generation in range(3):
+            engine._breed(engine.fitness_scores)
+            self.assertEqual(len(engine.repair_history), generation + 1)
+        self.assertGreater(sum(engine.repair_history), 0)
+
+    def test_repaired_offspring_have_fewer_clashes(self):
+        repaired = start_engine(TimetableEngine(build_config()))
+        offspring, scores = repaired._breed(repaired.fitness_scores)
+        random.seed(13)
+        plain = start_engine(TimetableEngine(build_config(repair_conflicts=False)))
+        unrepaired, _ = plain._breed(plain.fitness_scores)
+        counter = ConflictRepair()
+        self.assertLess(
+            sum(map(counter.conflicts, offspring.values())),
+            sum(map(counter.conflicts, unrepaired.values())),
+        )
+        for key, chromosome in offspring.items():
+            self.assertEqual(scores[key], repaired._score(key, chromosome))
+
+    def test_disabled_repair_records_nothing(self):
+        engine = start_engine(TimetableEngine(build_config(repair_conflicts=False)))
+        engine._evolve()
+        self.assertEqual(engine.repair_history, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 4. Memetic local search on the elites (GA/__init__.py)
+
+class TestMemeticStage(unittest.TestCase):
+    def setUp(self):
+        random.seed(17)
+
+    def test_elites_are_polished_every_generation(self):
+        engine = start_engine(TimetableEngine(build_config(memetic_moves=200)))
+        for generation in range(2):
+            engine._evolve()
+            self.assertEqual(len(engine.local_search_history), generation + 1)
+        for key, chromosome in engine.population.items():
+            self.assertEqual(engine.fitness_scores[key], engine._score(key, chromosome))
+
+    def test_polish_keeps_scores_and_hashes_in_step(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        keys = list(engine.population)
+        engine._polish(keys, 300)
+        for key in keys:
+            chromosome = engine.population[key]
+            self.assertEqual(engine.fitness_scores[key], engine._score(key, chromosome))
+            self.assertEqual(engine.day_hashes[key], engine.zobrist.day_hashes(chromosome))
+
+    def test_run_polishes_the_best_chromosome(self):
+        engine = TimetableEngine(build_config(total_generations=2, polish_moves=300))
+        best, _, _ = engine.run()
+        self.assertGreaterEqual(engine.polished_conflicts, 0)
+        self.assertEqual(set(best["Monday"]), set(RoomCapacity.section_strength))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 5. Island model with migration (GA/islands.py)
+
+class TestIslandModel(unittest.TestCase):
+    def setUp(self):
+        random.seed(19)
+
+    def island_config(self, **overrides):
+        params = dict(
+            islands=3, migration_interval=2, total_generations=4, population_size=4
+        )
+        params.update(overrides)
+        return build_config(**params)
+
+    def test_ring_and_random_targets(self):
+        ring = IslandModel(TimetableEngine, self.island_config())
+        self.assertEqual(ring.targets(), [1, 2, 0])
+        scattered = IslandModel(
+            TimetableEngine, self.island_config(migration_topology="random")
+        )
+        for _ in range(10):
+            targets = scattered.targets()
+            self.assertTrue(all(target != source for source, target in enumerate(targets)))
+
+    def test_unknown_topology_is_rejected(self):
+        with self.assertRaises(ValueError):
+            IslandModel(TimetableEngine, self.island_config(migration_topology="star"))
+
+    def test_stats_cover_every_island(self):
+        engine = TimetableEngine(self.island_config())
+        engine.run()
+        stats = engine.island_model.stats
+        self.assertEqual([island["island"] for island in stats], [0, 1, 2])
+        for island in stats:
+            self.assertEqual(island["generation"], 4)
+            self.assertEqual(island["population"], 4)
+            self.assertEqual(island["migrants_received"], 1)
+        self.assertEqual(len(engine.island_model.history), 2)
+        self.assertEqual(len(engine.population), 3)
+
+    def test_processes_match_in_process_islands(self):
+        random.seed(23)
+        local = TimetableEngine(self.island_config())
+        local_best = local.run()[0]
+        random.seed(23)
+        spread = TimetableEngine(self.island_config(workers=2))
+        self.assertEqual(spread.run()[0], local_best)
+        self.assertEqual(spread.island_model.stats, local.island_model.stats)
+
+    def test_migrants_replace_the_weakest(self):
+        engine = start_engine(TimetableEngine(build_config()))
+        weakest = min(engine.fitness_scores, key=engine.fitness_scores.get)
+        donor = start_engine(TimetableEngine(build_config()))
+        migrant = donor.best()[0]
+        engine.receive_migrants([migrant])
+        self.assertEqual(len(engine.population), 6)
+        self.assertNotIn(weakest, engine.population)
+        self.assertTrue(any(chromosome is migrant for chromosome in engine.population.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 6. Stop criteria and run results (GA/stopping.py)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStopCriteria(unittest.TestCase):
+    def test_runs_all_generations_by_default(self):
+        stop = StopCriteria(3)
+        reasons = [stop.check(generation, 10) for generation in range(4)]
+        self.assertEqual(reasons, [None, None, None, "generations"])
+
+    def test_target_fitness(self):
+        stop = StopCriteria(10, target_fitness=100)
+        self.assertIsNone(stop.check(0, 90))
+        self.assertEqual(stop.check(1, 100), "target")
+
+    def test_stagnation_counts_generations_without_improvement(self):
+        stop = StopCriteria(10, stagnation_limit=2)
+        self.assertIsNone(stop.check(0, 5))
+        self.assertIsNone(stop.check(1, 6))
+        self.assertIsNone(stop.check(2, 6))
+        self.assertEqual(stop.check(3, 6), "stagnation")
+
+    def test_time_limit(self):
+        clock = FakeClock()
+        stop = StopCriteria(10, time_limit=1.5, clock=clock)
+        self.assertIsNone(stop.check(0, 1))
+        clock.now = 2.0
+        self.assertEqual(stop.check(1, 1), "time_limit")
+        self.assertEqual(stop.elapsed, 2.0)
+
+
+class TestRunStopping(unittest.TestCase):
+    def setUp(self):
+        random.seed(29)
+
+    def test_result_unpacks_like_the_legacy_tuple(self):
+        result = TimetableEngine(build_config(total_generations=2)).run()
+        self.assertIsInstance(result, TimetableResult)
+        best, teacher, lab = result
+        self.assertIs(best, result.timetable)
+        self.assertIs(result[1], teacher)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.stop_reason, "generations")
+        self.assertEqual(result.generations, 2)
+
+    def test_reached_target_stops_before_evolving(self):
+        result = TimetableEngine(build_config(target_fitness=0)).run()
+        self.assertEqual(result.stop_reason, "target")
+        self.assertEqual(result.generations, 0)
+
+    def test_stagnation_stops_early(self):
+        result = TimetableEngine(build_config(total_generations=50, stagnation_limit=1)).run()
+        self.assertIn(result.stop_reason, ("stagnation", "generations"))
+        self.assertLess(result.generations, 50)
+
+    def test_time_limit_returns_best_so_far_in_anytime_mode(self):
+        result = TimetableEngine(build_config(total_generations=1000, time_limit=0.05)).run()
+        self.assertEqual(result.stop_reason, "time_limit")
+        self.assertLess(result.generations, 1000)
+
+    def test_time_limit_raises_without_anytime(self):
+        engine = TimetableEngine(
+            build_config(total_generations=1000, time_limit=0.05, anytime=False)
+        )
+        with self.assertRaises(GenerationTimeout) as raised:
+            engine.run()
+        self.assertEqual(raised.exception.result.stop_reason, "time_limit")
+        self.assertTrue(raised.exception.result.timetable)
+
+    def test_islands_honour_stop_criteria(self):
+        engine = TimetableEngine(
+            build_config(islands=2, migration_interval=1, total_generations=50, target_fitness=0)
+        )
+        result = engine.run()
+        self.assertEqual(result.stop_reason, "target")
+        self.assertEqual(result.generations, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 7. Streaming progress (GA/__init__.py)
+
+class TestIterRun(unittest.TestCase):
+    def test_yields_one_record_per_generation(self):
+        random.seed(31)
+        engine = TimetableEngine(build_config(total_generations=3))
+        records = list(engine.iter_run())
+        self.assertEqual([record.generation for record in records], [1, 2, 3])
+        for record in records:
+            self.assertIsInstance(record, GenerationProgress)
+            self.assertLessEqual(record.worst_score, record.mean_score)
+            self.assertLessEqual(record.mean_score, record.best_score)
+            self.assertTrue(0 < record.diversity <= 1)
+        self.assertEqual([record.stop_reason for record in records], [None, None, "generations"])
+        self.assertEqual(engine.result.generations, 3)
+
+    def test_generator_returns_the_result(self):
+        random.seed(31)
+        engine = TimetableEngine(build_config(total_generations=2))
+        progress = engine.iter_run()
+        with self.assertRaises(StopIteration) as finished:
+            while True:
+                next(progress)
+        self.assertIs(finished.exception.value, engine.result)
+
+    def test_run_matches_iter_run(self):
+        random.seed(37)
+        streamed = TimetableEngine(build_config())
+        list(streamed.iter_run())
+        random.seed(37)
+        blocking = TimetableEngine(build_config()).run()
+        self.assertEqual(streamed.result.timetable, blocking.timetable)
+        self.assertEqual(streamed.result.fitness, blocking.fitness)
+
+    def test_best_timetable_is_the_best_chromosome(self):
+        random.seed(41)
+        engine = TimetableEngine(build_config())
+        for record in engine.iter_run():
+            chromosome, score = engine.best()
+            self.assertIs(record.best_timetable(), chromosome)
+            self.assertEqual(record.best_score, score)
+        self.assertNotIn("best_loader", record.as_dict())
+
+    def test_cancel_stops_after_the_current_generation(self):
+        random.seed(43)
+        engine = TimetableEngine(build_config(total_generations=50))
+        records = []
+        for record in engine.iter_run():
+            records.append(record)
+            engine.cancel()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(engine.result.stop_reason, "cancelled")
+        self.assertEqual(engine.result.generations, 1)
+
+    def test_island_mode_yields_per_epoch(self):
+        random.seed(47)
+        engine = TimetableEngine(
+            build_config(islands=2, migration_interval=2, total_generations=5)
+        )
+        records = []
+        for record in engine.iter_run():
+            records.append(record)
+            chromosome, score = engine.island_model.best()
+            self.assertEqual(record.best_timetable(), chromosome)
+            self.assertEqual(record.best_score, score)
+        self.assertEqual([record.generation for record in records], [2, 4, 5])
+        self.assertEqual(records[-1].stop_reason, "generations")
+
+    def test_module_helper_streams(self):
+        random.seed(53)
+        config = build_config(total_generations=2)
+        progress = iter_timetable_generation(
+            config.teacher_subject_mapping,
+            config.total_sections,
+            config.total_classrooms,
+            config.total_labs,
+            config.teacher_preferences,
+            config.teacher_weekly_workload,
+            config.special_subjects,
+            config.labs,
+            config.subject_quota_limits,
+            config.teacher_duty_days,
+            config.teacher_availability_matrix,
+            config.lab_availability_matrix,
+            config.total_generations,
+            config.time_slots,
+            config.day_map,
+            config.time_slot_map,
+            population_size=config.population_size,
+        )
+        self.assertEqual([record.generation for record in progress], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 8. Profiling (GA/profiling.py)
+
+class RecordingHook(ProfilerHook):
+    def __init__(self):
+        self.events = []
+
+    def phase_started(self, phase):
+        self.events.append(("start", phase))
+
+    def phase_ended(self, phase, seconds):
+        self.events.append(("end", phase))
+
+
+class TestHistogram(unittest.TestCase):
+    def test_power_of_two_buckets(self):
+        histogram = Histogram()
+        for value in (0.5, 3, 5, 7, 100):
+            histogram.add(value)
+        summary = histogram.as_dict()
+        self.assertEqual(summary["count"], 5)
+        self.assertEqual(summary["min"], 0.5)
+        self.assertEqual(summary["max"], 100)
+        self.assertEqual(summary["buckets"], {"1": 1, "4": 1, "8": 2, "128": 1})
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        random.seed(59)
+
+    def test_disabled_by_default(self):
+        engine = TimetableEngine(build_config())
+        result = engine.run()
+        self.assertIs(engine.profiler, NULL_PROFILER)
+        self.assertIsNone(result.profile)
+
+    def test_report_covers_the_pipeline(self):
+        result = TimetableEngine(build_config(profile=True, population_size=10)).run()
+        report = json.loads(json.dumps(result.profile))
+        for phase in ("population", "fitness", "selection", "crossover", "mutation",
+                      "repair", "replacement", "best", "matrices"):
+            self.assertIn(phase, report["phases"])
+        self.assertEqual(report["phases"]["selection"]["calls"], 4)
+        self.assertEqual(report["counters"]["generations"], 4)
+        self.assertGreater(report["counters"]["evaluations"], 0)
+        self.assertNotIn("cprofile", report)
+
+    def test_hooks_see_every_phase_start_and_end(self):
+        hook = RecordingHook()
+        TimetableEngine(build_config(profile_hooks=[hook], population_size=10)).run()
+        starts = [phase for event, phase in hook.events if event == "start"]
+        ends = [phase for event, phase in hook.events if event == "end"]
+        self.assertEqual(sorted(starts), sorted(ends))
+        self.assertIn("mutation", starts)
+
+    def test_cprofile_and_allocations(self):
+        result = TimetableEngine(
+            build_config(
+                cprofile=True, trace_allocations=True, population_size=10, total_generations=2
+            )
+        ).run()
+        self.assertTrue(result.profile["cprofile"])
+        self.assertIn("allocated_bytes", result.profile["phases"]["mutation"])
+
+    def test_phase_outside_a_run(self):
+        profiler = Profiler()
+        profiler.start()
+        with profiler.phase("custom"):
+            pass
+        profiler.count("things", 3)
+        profiler.stop()
+        report = profiler.report()
+        self.assertEqual(report["phases"]["custom"]["calls"], 1)
+        self.assertEqual(report["counters"], {"things": 3})
+
+    def test_allocations_without_reset_peak(self):
+        # Python before 3.9 has no tracemalloc.reset_peak
+        with unittest.mock.patch("GA.profiling._HAS_RESET_PEAK", False):
+            profiler = Profiler(trace_allocations=True)
+            profiler.start()
+            with profiler.phase("custom"):
+                kept = [bytearray(1024) for _ in range(64)]
+            profiler.stop()
+        allocated = profiler.report()["phases"]["custom"]["allocated_bytes"]
+        self.assertEqual(allocated["count"], 1)
+        self.assertGreaterEqual(allocated["max"], 64 * 1024)
+        del kept
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 9. Checkpoint and resume (GA/checkpoint.py)
+
+def sample_checkpoint():
+    streams = SeedStreams(5)
+    streams.python("mutation").random()
+    streams.numpy("selection").random(3)
+    week = {
+        "Monday": {
+            "A": [
+                {"teacher_id": "T1", "subject_id": "S1", "classroom_id": "R1",
+                 "time_slot": "9:00 - 9:55", "group": "all"},
+                {"teacher_id": "T2", "subject_id": "S2", "classroom_id": "merged_lab",
+                 "time_slot": "9:55 - 10:50", "group": 1, "flagged": True},
+            ],
+            "B": [],
+        },
+        "Tuesday": {
+            "B": [
+                {"teacher_id": "None", "subject_id": "Library", "classroom_id": "R2",
+                 "time_slot": "9:00 - 9:55", "group": "all"},
+            ],
+        },
+    }
+    return Checkpoint(
+        generation=3,
+        next_week=9,
+        population={"Week 7": week, "Week 8": {"Monday": {"A": week["Monday"]["A"][:1]}}},
+        fitness_scores={"Week 7": 120, "Week 8": 95},
+        random_state=streams.getstate(),
+        elapsed=1.5,
+        best=120,
+        best_generation=2,
+        cache={2**63 + 5: 120, 17: 95},
+        repair_history=[1, 0, 2],
+    )
+
+
+class TestCheckpointFormat(unittest.TestCase):
+    def test_round_trip(self):
+        checkpoint = sample_checkpoint()
+        stream = io.BytesIO()
+        checkpoint.write(stream)
+        stream.seek(0)
+        self.assertEqual(Checkpoint.read(stream), checkpoint)
+
+    def test_save_replaces_the_file_atomically(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "run.ckpt")
+        with open(path, "wb") as stream:
+            stream.write(b"old")
+        sample_checkpoint().save(path)
+        self.assertEqual(os.listdir(directory), ["run.ckpt"])
+        self.assertEqual(Checkpoint.load(path).generation, 3)
+
+    def test_rejects_other_files_and_versions(self):
+        with self.assertRaises(CheckpointError):
+            Checkpoint.read(io.BytesIO(b"not a checkpoint at all"))
+        stream = io.BytesIO()
+        sample_checkpoint().write(stream)
+        data = bytearray(stream.getvalue())
+        data[6:8] = (VERSION + 1).to_bytes(2, "little")
+        with self.assertRaises(CheckpointError):
+            Checkpoint.read(io.BytesIO(bytes(data)))
+
+
+class TestResume(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "run.ckpt")
+
+    def test_resumed_run_matches_an_uninterrupted_one(self):
+        random.seed(61)
+        uninterrupted = TimetableEngine(build_config(total_generations=9, population_size=10))
+        expected = uninterrupted.run()
+
+        random.seed(61)
+        killed = TimetableEngine(
+            build_config(
+                total_generations=9,
+                population_size=10,
+                checkpoint_path=self.path,
+                checkpoint_interval=3,
+            )
+        )
+        for progress in killed.iter_run():
+            if progress.generation == 5:
+                break
+        self.assertEqual(Checkpoint.load(self.path).generation, 3)
+
+        random.seed(0)
+        resumed = TimetableEngine(
+            build_config(total_generations=9, population_size=10, resume_from=self.path)
+        )
+        result = resumed.run()
+        self.assertEqual(result.generations, 9)
+        self.assertEqual(result.timetable, expected.timetable)
+        self.assertEqual(resumed.fitness_scores, uninterrupted.fitness_scores)
+        self.assertEqual(resumed.population, uninterrupted.population)
+
+    def test_island_mode_does_not_checkpoint(self):
+        engine = TimetableEngine(build_config(islands=2, checkpoint_path=self.path))
+        with self.assertRaises(ValueError):
+            engine.run()
+
+    def test_checkpoint_interval_must_be_positive(self):
+        for interval in (0, -1):
+            with self.subTest(interval=interval), self.assertRaises(ValueError):
+                build_config(checkpoint_path=self.path, checkpoint_interval=interval)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 10. Seeding and replay (GA/seeding.py)
+
+class TestSeedStreams(unittest.TestCase):
+    def test_same_seed_same_draws(self):
+        first, second = SeedStreams(7), SeedStreams(7)
+        self.assertEqual(first.spawn("population", 3), second.spawn("population", 3))
+        self.assertEqual(first.numpy("selection").random(), second.numpy("selection").random())
+
+    def test_components_are_independent(self):
+        quiet, busy = SeedStreams(7), SeedStreams(7)
+        busy.python("mutation").random()
+        self.assertEqual(quiet.python("crossover").random(), busy.python("crossover").random())
+        self.assertNotEqual(
+            SeedStreams(7).python("mutation").random(), SeedStreams(7).python("crossover").random()
+        )
+
+    def test_state_round_trip(self):
+        streams = SeedStreams(11)
+        streams.python("search").random()
+        streams.numpy("selection").random()
+        restored = SeedStreams(0)
+        restored.setstate(streams.getstate())
+        self.assertEqual(restored.seed, 11)
+        self.assertEqual(restored.python("search").random(), streams.python("search").random())
+        self.assertEqual(restored.numpy("selection").random(), streams.numpy("selection").random())
+
+    def test_unseeded_root_follows_the_random_module(self):
+        random.seed(3)
+        first = SeedStreams().seed
+        random.seed(3)
+        self.assertEqual(SeedStreams().seed, first)
+
+    def test_unknown_component(self):
+        with self.assertRaises(ValueError):
+            SeedStreams(1).python("weather")
+
+
+class TestSeededRuns(unittest.TestCase):
+    def run_seeded(self, **overrides):
+        random.seed()
+        return TimetableEngine(build_config(seed=1234, population_size=10, **overrides)).run()
+
+    def test_config_seed_pins_the_run(self):
+        first, second = self.run_seeded(), self.run_seeded()
+        self.assertEqual(first.seed, 1234)
+        self.assertEqual(first.timetable, second.timetable)
+        self.assertEqual(first.fitness, second.fitness)
+
+    def test_result_does_not_depend_on_worker_count(self):
+        self.assertEqual(
+            self.run_seeded(workers=2).timetable, self.run_seeded(workers=1).timetable
+        )
+
+    def test_islands_are_seeded(self):
+        first = self.run_seeded(islands=2, migration_interval=2, migration_topology="random")
+        second = self.run_seeded(islands=2, migration_interval=2, migration_topology="random")
+        self.assertEqual(first.timetable, second.timetable)
+
+    def test_replay_reproduces_an_unseeded_run(self):
+        random.seed(71)
+        engine = TimetableEngine(build_config(population_size=10, crossover_strategy="uniform"))
+        result = engine.run()
+        self.assertIsNotNone(result.seed)
+        replayed = engine.replay(result)
+        self.assertEqual(replayed.timetable, result.timetable)
+        self.assertEqual(replayed.fitness, result.fitness)
+        self.assertEqual(replayed.generations, result.generations)
+
+    def test_replay_reproduces_a_cancelled_run(self):
+        engine = TimetableEngine(build_config(population_size=10, total_generations=50))
+        for progress in engine.iter_run():
+            if progress.generation == 3:
+                engine.cancel()
+        replayed = engine.replay(engine.result)
+        self.assertEqual(replayed.generations, 3)
+        self.assertEqual(replayed.timetable, engine.result.timetable)
+
+
+if __name__ == "__main__":
+    unittest.main()
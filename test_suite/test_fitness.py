@@ -795,3 +795,276 @@ class TestTimetableGenerator(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+# 5. Batch fitness evaluator (GA/batch_fitness.py)
+
+import copy
+import random
+import unittest
+
+from GA.batch_fitness import BatchFitnessEvaluator, StackedPopulation
+from GA.encoding import GeneCodec
+from GA.fitness import TimetableFitnessEvaluator
+from GA.fitness_cache import FitnessCache, ZobristKeys
+from GA.mutation import TimeTableMutation
+from helpers import fitness_problem, generated_timetable
+from Samples.samples import TeacherWorkload, TimeSlots
+
+
+def entry(teacher, room, time_slot):
+    return {
+        "teacher_id": teacher,
+        "subject_id": "TCS-531",
+        "classroom_id": room,
+        "time_slot": time_slot,
+        "group": "all",
+    }
+
+
+class TestBatchFitnessEvaluator(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+
+    def assert_parity(self, timetable, **overrides):
+        problem = fitness_problem(**overrides)
+        expected = TimetableFitnessEvaluator(timetable, **problem).evaluate_timetable_fitness()
+        evaluator = BatchFitnessEvaluator(
+            teacher_duty_days=TeacherWorkload.teacher_duty_days, **problem
+        )
+        result = evaluator.evaluate_timetable(GeneCodec(), timetable)
+        self.assertEqual(result, expected)
+
+    def test_matches_loop_evaluator_on_generated_population(self):
+        self.assert_parity(generated_timetable(8))
+
+    def test_matches_loop_evaluator_with_real_slot_mapping(self):
+        # Map the slot strings onto slot numbers so that slots differ per entry.
+        slot_numbers = {label: number for number, label in TimeSlots.time_slots.items()}
+        self.assert_parity(generated_timetable(5), time_slots=slot_numbers)
+
+    def test_matches_loop_evaluator_on_conflicts(self):
+        timetable = {
+            "Week 1": {
+                "Monday": {
+                    "A": [
+                        entry("AB01", "R1", "9:00 - 9:55"),
+                        entry("AB01", "R1", "9:00 - 9:55"),
+                        entry(None, "merged_lab", "9:55 - 10:50"),
+                    ],
+                    "B": [entry("AB01", "unknown", "9:00 - 9:55")],
+                    "C": [],
+                },
+                "Sunday": {"B": [entry("PK02", "R2", "11:10 - 12:05")] * 3},
+            },
+            "Week 2": {"Monday": {"A": [entry("AB01", "R3", "9:00 - 9:55")]}, "Tuesday": {}},
+        }
+        slot_numbers = {label: number for number, label in TimeSlots.time_slots.items()}
+        self.assert_parity(timetable)
+        self.assert_parity(timetable, time_slots=slot_numbers)
+        self.assert_parity(timetable, teacher_daily_workload={"AB01": 1, "PK02": 2.5})
+
+    def test_independent_scores_each_week_alone(self):
+        timetable = generated_timetable(4)
+        problem = fitness_problem()
+        evaluator = BatchFitnessEvaluator(
+            teacher_duty_days=TeacherWorkload.teacher_duty_days, **problem
+        )
+        daily, weekly = evaluator.evaluate_timetable(GeneCodec(), timetable, independent=True)
+        for week, schedule in timetable.items():
+            alone = TimetableFitnessEvaluator({week: schedule}, **problem)
+            expected_daily, expected_weekly = alone.evaluate_timetable_fitness()
+            self.assertEqual(daily[week], expected_daily[week])
+            self.assertEqual(weekly[week], expected_weekly[week])
+
+    def test_without_duty_days_skips_the_penalty(self):
+        timetable = {"Week 1": {"Sunday": {"A": [entry("AB01", "R1", "9:00 - 9:55")]}}}
+        problem = fitness_problem()
+        with_duty = BatchFitnessEvaluator(
+            teacher_duty_days=TeacherWorkload.teacher_duty_days, **problem
+        ).evaluate_timetable(GeneCodec(), timetable)[1]["Week 1"]
+        without_duty = BatchFitnessEvaluator(**problem).evaluate_timetable(
+            GeneCodec(), timetable
+        )[1]["Week 1"]
+        self.assertEqual(without_duty - with_duty, 40)
+
+    def test_stacking_pads_to_the_largest_chromosome(self):
+        codec = GeneCodec()
+        timetable = generated_timetable(2)
+        timetable["Week 2"] = {"Monday": timetable["Week 2"]["Monday"]}
+        stacked = StackedPopulation.from_timetable(codec, timetable)
+        self.assertEqual(len(stacked), 2)
+        self.assertEqual(stacked.genes.shape[:2], (2, 6))
+        self.assertEqual(stacked.days[1], ("Monday",))
+
+    def test_stacking_dicts_matches_stacking_chromosomes(self):
+        codec = GeneCodec()
+        timetable = generated_timetable(3)
+        timetable["Week 3"] = {"Tuesday": timetable["Week 1"]["Monday"]}
+        direct = StackedPopulation.from_timetable(codec, timetable)
+        encoded = StackedPopulation.from_chromosomes(codec.encode_population(timetable))
+        self.assertTrue((direct.genes == encoded.genes).all())
+        self.assertTrue((direct.sections == encoded.sections).all())
+        self.assertEqual(direct.days, encoded.days)
+
+    def test_empty_population(self):
+        evaluator = BatchFitnessEvaluator(**fitness_problem())
+        self.assertEqual(evaluator.evaluate_timetable(GeneCodec(), {}), ({}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 6. Incremental fitness (TimetableFitnessEvaluator.incremental)
+
+class TestIncrementalFitness(unittest.TestCase):
+    def setUp(self):
+        random.seed(9)
+        self.timetable = generated_timetable(6)
+        slot_numbers = {label: number for number, label in TimeSlots.time_slots.items()}
+        # Real slot numbers make slot moves change teacher and classroom bookings.
+        self.evaluator = TimetableFitnessEvaluator({}, **fitness_problem(time_slots=slot_numbers))
+
+    def full_score(self, week_schedule):
+        self.evaluator.timetable = {"Week": week_schedule}
+        return self.evaluator.evaluate_timetable_fitness()[1]["Week"]
+
+    def test_initial_score_matches_evaluator(self):
+        for week_schedule in self.timetable.values():
+            tracker = self.evaluator.incremental(week_schedule)
+            self.assertEqual(tracker.score, self.full_score(week_schedule))
+
+    def test_mutation_change_set(self):
+        for week_schedule in self.timetable.values():
+            tracker = self.evaluator.incremental(week_schedule)
+            changes = []
+            mutated = TimeTableMutation().mutate_schedule_for_week(week_schedule, changes)
+            self.assertTrue(changes)
+            self.assertEqual(tracker.apply(changes), self.full_score(mutated))
+
+    def test_copy_is_independent(self):
+        week_schedule = self.timetable["Week 1"]
+        tracker = self.evaluator.incremental(week_schedule)
+        clone = tracker.copy()
+        changes = []
+        TimeTableMutation().mutate_schedule_for_week(week_schedule, changes)
+        clone.apply(changes)
+        self.assertEqual(tracker.score, self.full_score(week_schedule))
+
+    def test_teacher_change_updates_bookings_and_overload(self):
+        week_schedule = {day: dict(sections) for day, sections in self.timetable["Week 2"].items()}
+        tracker = self.evaluator.incremental(week_schedule)
+        for teacher in ["AB01", None, "None", "unknown"]:
+            day = random.choice(list(week_schedule))
+            section = random.choice(list(week_schedule[day]))
+            entries = list(week_schedule[day][section])
+            entries[0] = dict(entries[0], teacher_id=teacher)
+            week_schedule[day][section] = entries
+            self.assertEqual(
+                tracker.update_section(day, section, entries), self.full_score(week_schedule)
+            )
+
+    def test_replace_day(self):
+        week_schedule = dict(self.timetable["Week 3"])
+        tracker = self.evaluator.incremental(week_schedule)
+        for day in ["Monday", "Thursday"]:
+            week_schedule[day] = self.timetable["Week 4"][day]
+            self.assertEqual(
+                tracker.replace_day(day, week_schedule[day]), self.full_score(week_schedule)
+            )
+
+    def test_replace_day_with_other_sections_rescores(self):
+        week_schedule = dict(self.timetable["Week 5"])
+        tracker = self.evaluator.incremental(week_schedule)
+        week_schedule["Friday"] = {"A": week_schedule["Friday"]["A"]}
+        self.assertEqual(
+            tracker.replace_day("Friday", week_schedule["Friday"]), self.full_score(week_schedule)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 7. Fitness cache and Zobrist hashing (GA/fitness_cache.py)
+
+class TestFitnessCache(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = FitnessCache(maxsize=2)
+        cache.put(1, 10)
+        cache.put(2, 20)
+        self.assertEqual(cache.get(1), 10)
+        cache.put(3, 30)
+        self.assertNotIn(2, cache)
+        self.assertIn(1, cache)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_get_or_compute_runs_once(self):
+        cache = FitnessCache()
+        calls = []
+        for _ in range(3):
+            cache.get_or_compute("week", lambda: calls.append(1) or 5)
+        self.assertEqual(len(calls), 1)
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+    def test_zero_size_disables_storage(self):
+        cache = FitnessCache(maxsize=0)
+        cache.put(1, 10)
+        self.assertEqual(len(cache), 0)
+
+
+class TestZobristKeys(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+        self.timetable = generated_timetable(3)
+        self.keys = ZobristKeys()
+
+    def week_hash(self, week_schedule):
+        return self.keys.week_hash(self.keys.day_hashes(week_schedule))
+
+    def test_equal_content_gives_equal_hash(self):
+        week_schedule = self.timetable["Week 1"]
+        other_keys = ZobristKeys()
+        self.assertEqual(
+            self.week_hash(week_schedule), self.week_hash(copy.deepcopy(week_schedule))
+        )
+        self.assertEqual(
+            self.week_hash(week_schedule),
+            other_keys.week_hash(other_keys.day_hashes(week_schedule)),
+        )
+        self.assertNotEqual(self.week_hash(week_schedule), self.week_hash(self.timetable["Week 2"]))
+
+    def test_day_and_section_order_are_hashed(self):
+        week_schedule = self.timetable["Week 1"]
+        reordered = dict(reversed(list(week_schedule.items())))
+        self.assertNotEqual(self.week_hash(week_schedule), self.week_hash(reordered))
+        monday = dict(reversed(list(week_schedule["Monday"].items())))
+        self.assertNotEqual(
+            self.week_hash(week_schedule), self.week_hash({**week_schedule, "Monday": monday})
+        )
+
+    def test_incremental_update_matches_full_hash(self):
+        week_schedule = self.timetable["Week 3"]
+        changes = []
+        mutated = TimeTableMutation().mutate_schedule_for_week(week_schedule, changes)
+        day_hashes = self.keys.apply(self.keys.day_hashes(week_schedule), week_schedule, changes)
+        self.assertEqual(self.keys.week_hash(day_hashes), self.week_hash(mutated))
+
+    def test_gene_projection(self):
+        keys = ZobristKeys(gene=lambda entry: (entry["teacher_id"],))
+        week_schedule = self.timetable["Week 1"]
+        renamed = copy.deepcopy(week_schedule)
+        for entries in renamed["Monday"].values():
+            for entry in entries:
+                entry["subject_id"] = "Other"
+        self.assertEqual(
+            keys.week_hash(keys.day_hashes(week_schedule)),
+            keys.week_hash(keys.day_hashes(renamed)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
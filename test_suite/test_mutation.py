@@ -455,3 +455,258 @@ class TestMutation(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+# 4. In-place mutation, undo log and structurally shared forks (GA/mutation.py)
+
+import copy
+import random
+import unittest
+
+from GA.local_search import LocalSearch
+from GA.mutation import TimeTableMutation
+from GA.repair import ConflictRepair, OccupancyIndex
+
+
+def sample_week():
+    slots = ["9:00 - 9:55", "9:55 - 10:50", "11:10 - 12:05", "12:05 - 1:00"]
+    return {
+        day: {
+            section: [
+                {
+                    "teacher_id": f"T{i}",
+                    "subject_id": f"S{i}",
+                    "classroom_id": "R1",
+                    "time_slot": slot,
+                    "group": "all",
+                }
+                for i, slot in enumerate(slots)
+            ]
+            for section in ["A", "B", "C", "D"]
+        }
+        for day in ["Monday", "Tuesday", "Wednesday"]
+    }
+
+
+class TestCopyFreeMutation(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.mutation = TimeTableMutation()
+
+    def test_fork_leaves_parent_untouched_and_shares_the_rest(self):
+        week = sample_week()
+        original = copy.deepcopy(week)
+        mutated = self.mutation.mutate_schedule_for_week(week)
+        self.assertEqual(week, original)
+        self.assertNotEqual(mutated, original)
+        shared = sum(
+            mutated[day][section] is week[day][section]
+            for day in week
+            for section in week[day]
+        )
+        self.assertGreater(shared, 0)
+
+    def test_fork_matches_deepcopy_mutation(self):
+        week = sample_week()
+        random.seed(11)
+        forked = self.mutation.mutate_schedule_for_week(week)
+        random.seed(11)
+        in_place = copy.deepcopy(week)
+        self.mutation.mutate_in_place(in_place)
+        self.assertEqual(forked, in_place)
+
+    def test_undo_restores_the_week(self):
+        week = sample_week()
+        original = copy.deepcopy(week)
+        undo_log = self.mutation.mutate_in_place(week)
+        self.assertTrue(undo_log)
+        self.assertNotEqual(week, original)
+        self.mutation.undo(week, undo_log)
+        self.assertEqual(week, original)
+
+    def test_undo_log_lists_changed_entries_only(self):
+        week = sample_week()
+        original = copy.deepcopy(week)
+        for day, section, index, old_slot in self.mutation.mutate_in_place(week):
+            self.assertEqual(original[day][section][index]["time_slot"], old_slot)
+            self.assertNotEqual(week[day][section][index]["time_slot"], old_slot)
+
+    def test_changes_from_log(self):
+        week = sample_week()
+        undo_log = self.mutation.mutate_in_place(week)
+        changes = self.mutation.changes_from_log(week, undo_log)
+        self.assertEqual(len(changes), len(undo_log))
+        for day, section, index, entry in changes:
+            self.assertIs(entry, week[day][section][index])
+
+    def test_explicit_fork(self):
+        week = sample_week()
+        forked = TimeTableMutation.fork(week, {"Monday": ["A"]})
+        self.assertIsNot(forked["Monday"]["A"], week["Monday"]["A"])
+        self.assertIs(forked["Monday"]["B"], week["Monday"]["B"])
+        self.assertIs(forked["Tuesday"], week["Tuesday"])
+        forked["Monday"]["A"][0]["time_slot"] = "changed"
+        self.assertEqual(week["Monday"]["A"][0]["time_slot"], "9:00 - 9:55")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 5. Occupancy-index conflict repair (GA/repair.py)
+
+SLOTS = {1: "9:00 - 9:55", 2: "9:55 - 10:50", 3: "11:10 - 12:05", 4: "12:05 - 1:00"}
+
+
+def lesson(teacher, room, slot, group="all"):
+    return {
+        "teacher_id": teacher,
+        "subject_id": "S",
+        "classroom_id": room,
+        "time_slot": SLOTS[slot],
+        "group": group,
+    }
+
+
+def clashing_week():
+    # T1 teaches A and B at slot 1; R2 hosts B and C at slot 2.
+    return {
+        "Monday": {
+            "A": [lesson("T1", "R1", 1), lesson("T2", "R1", 2), lesson("T3", "R1", 3)],
+            "B": [lesson("T1", "R2", 1), lesson("T4", "R2", 2), lesson("T5", "R5", 3)],
+            "C": [lesson("T6", "R3", 1), lesson("T7", "R2", 2), lesson("T8", "R3", 3)],
+        },
+        "Tuesday": {
+            "A": [lesson("T1", "R1", 1), lesson("T2", "R1", 2)],
+        },
+    }
+
+
+class TestConflictRepair(unittest.TestCase):
+    def setUp(self):
+        self.repair = ConflictRepair(SLOTS)
+
+    def test_index_ignores_placeholders_and_lab_groups(self):
+        day = {
+            "A": [lesson("T1", "L1", 1, group=1), lesson("T1", "L2", 1, group=2)],
+            "B": [lesson("None", "merged_lab", 1)],
+            "C": [lesson("None", "merged_lab", 1)],
+        }
+        self.assertEqual(OccupancyIndex.from_day("Monday", day).conflict_count(), 0)
+
+    def test_repair_removes_every_clash(self):
+        week = clashing_week()
+        self.assertEqual(self.repair.conflicts(week), 2)
+        repaired_week, repaired = self.repair.repair(week)
+        self.assertEqual(self.repair.conflicts(repaired_week), 0)
+        self.assertEqual(repaired, 2)
+
+    def test_repair_only_touches_conflicting_sections(self):
+        week = clashing_week()
+        original = copy.deepcopy(week)
+        repaired_week, _ = self.repair.repair(week)
+        self.assertEqual(week, original)
+        self.assertIs(repaired_week["Tuesday"], week["Tuesday"])
+        self.assertIs(repaired_week["Monday"]["C"], week["Monday"]["C"])
+
+    def test_sections_keep_their_lessons(self):
+        week = clashing_week()
+        repaired_week, _ = self.repair.repair(week)
+        for section, entries in week["Monday"].items():
+            before = sorted((e["teacher_id"], e["classroom_id"]) for e in entries)
+            after = sorted(
+                (e["teacher_id"], e["classroom_id"]) for e in repaired_week["Monday"][section]
+            )
+            self.assertEqual(before, after)
+
+    def test_changes_replay_the_repair(self):
+        week = clashing_week()
+        changes = []
+        repaired_week, _ = self.repair.repair(week, changes)
+        replayed = copy.deepcopy(week)
+        for day, section, index, entry in changes:
+            replayed[day][section][index] = entry
+        self.assertEqual(replayed, repaired_week)
+
+    def test_unresolvable_clash_is_left_alone(self):
+        week = {
+            "Monday": {
+                "A": [lesson("T1", "R1", 1)],
+                "B": [lesson("T1", "R2", 1)],
+            }
+        }
+        repaired_week, repaired = ConflictRepair().repair(week)
+        self.assertEqual(repaired, 0)
+        self.assertEqual(repaired_week, week)
+
+    def test_merge_changes_keeps_one_change_per_position(self):
+        week = clashing_week()
+        first = [("Monday", "A", 0, week["Monday"]["A"][1])]
+        second = [("Monday", "A", 0, week["Monday"]["A"][2]), ("Monday", "B", 1, None)]
+        merged = ConflictRepair.merge_changes(week, first, second)
+        self.assertEqual(
+            merged,
+            [
+                ("Monday", "A", 0, week["Monday"]["A"][0]),
+                ("Monday", "B", 1, week["Monday"]["B"][1]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# 6. Move, swap and Kempe-chain local search (GA/local_search.py)
+
+class TestLocalSearch(unittest.TestCase):
+    def setUp(self):
+        self.search = LocalSearch(SLOTS, max_moves=500, rng=random.Random(7))
+
+    def test_index_excess_follows_edits(self):
+        day = clashing_week()["Monday"]
+        index = OccupancyIndex.from_day("Monday", day)
+        entry = day["B"][0]
+        index.remove("Monday", "B", entry)
+        entry["time_slot"] = SLOTS[4]
+        index.add("Monday", "B", entry)
+        fresh = OccupancyIndex.from_day("Monday", day)
+        self.assertEqual(index.excess, fresh.excess)
+        self.assertEqual(index.hot, fresh.hot)
+
+    def test_kempe_chain_links_sections_through_shared_resources(self):
+        day = {
+            "A": [lesson("T1", "R1", 1), lesson("T2", "R1", 2)],
+            "B": [lesson("T3", "R2", 1), lesson("T1", "R2", 2)],
+            "C": [lesson("T4", "R3", 1), lesson("T5", "R3", 2)],
+        }
+        chain = LocalSearch.kempe_chain(day, "A", 0, SLOTS[1], SLOTS[2])
+        self.assertEqual(chain, [("A", 0), ("A", 1), ("B", 0), ("B", 1)])
+
+    def test_polish_clears_clashes_without_touching_the_input(self):
+        week = clashing_week()
+        original = copy.deepcopy(week)
+        changes = []
+        polished, removed = self.search.polish(week, changes)
+        self.assertEqual(week, original)
+        self.assertEqual(removed, 2)
+        self.assertEqual(self.search.conflicts(polished), 0)
+        replayed = copy.deepcopy(week)
+        for day, section, index, entry in changes:
+            replayed[day][section][index] = entry
+        self.assertEqual(replayed, polished)
+
+    def test_polish_never_adds_conflicts(self):
+        week = {
+            "Monday": {
+                "A": [lesson("T1", "R1", 1), lesson("T2", "R1", 2)],
+                "B": [lesson("T1", "R1", 1), lesson("T2", "R1", 2)],
+            }
+        }
+        polished, removed = self.search.polish(week)
+        self.assertGreaterEqual(removed, 0)
+        self.assertLessEqual(self.search.conflicts(polished), self.search.conflicts(week))
+
+
+if __name__ == "__main__":
+    unittest.main()
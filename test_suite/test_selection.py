@@ -419,3 +419,74 @@ def select_top_chromosomes(self, population: list, percentage=0.30) -> list:
     selected_chromosomes += [chromosome for chromosome, _ in rank_chromosomes]
 
     return selected_chromosomes
+
+
+# 6. SelectionEngine and TimeTableSelection strategies (GA/selection.py)
+
+import random
+import unittest
+
+import numpy as np
+
+from GA.selection import SelectionEngine, TimeTableSelection
+
+
+class TestSelectionEngine(unittest.TestCase):
+    def setUp(self):
+        random.seed(2)
+
+    def engine(self, strategy, **kwargs):
+        return SelectionEngine(strategy, rng=np.random.default_rng(0), **kwargs)
+
+    def test_negative_fitness_is_shifted(self):
+        weights = self.engine("roulette").shift_fitness([-300, -100, -200])
+        self.assertTrue((weights > 0).all())
+        self.assertEqual(list(np.argsort(weights)), [0, 2, 1])
+
+    def test_equal_fitness_gives_uniform_weights(self):
+        self.assertEqual(list(self.engine("roulette").shift_fitness([7, 7, 7])), [1, 1, 1])
+
+    def test_roulette_prefers_fitter_chromosomes(self):
+        fitness = np.array([-500.0, -400.0, 0.0, 100.0])
+        indices = self.engine("roulette").select_indices(fitness, 4000)
+        counts = np.bincount(indices, minlength=4)
+        self.assertTrue(counts[3] > counts[2] > counts[1] > counts[0])
+
+    def test_sus_spreads_pointers_evenly(self):
+        fitness = np.array([1.0, 1.0, 1.0, 1.0])
+        indices = self.engine("sus").select_indices(fitness, 8)
+        self.assertEqual(list(np.bincount(indices, minlength=4)), [2, 2, 2, 2])
+
+    def test_tournament_winner_is_best_contestant(self):
+        engine = self.engine("tournament", tournament_size=4)
+        indices = engine.select_indices(np.array([5.0, 1.0, 3.0, 2.0]), 500)
+        # Contestants are drawn with replacement: index 0 enters 1 - (3/4)^4 of the time.
+        self.assertGreater((indices == 0).sum(), 250)
+
+    def test_rank_ignores_score_magnitude(self):
+        near = self.engine("rank").select_indices(np.array([1.0, 2.0, 3.0]), 3000)
+        far = self.engine("rank").select_indices(np.array([1.0, 2.0, 3e9]), 3000)
+        self.assertEqual(list(near), list(far))
+
+    def test_select_returns_keys_and_handles_empty(self):
+        scores = {"Week 1": -10, "Week 2": -20}
+        for strategy in SelectionEngine.STRATEGIES:
+            keys = self.engine(strategy).select(scores, 5)
+            self.assertEqual(len(keys), 5)
+            self.assertTrue(set(keys) <= set(scores))
+            self.assertEqual(self.engine(strategy).select({}, 3), [])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            SelectionEngine("lottery")
+
+    def test_timetable_selection_with_negative_scores(self):
+        scores = {f"Week {i}": -1000.0 - i for i in range(20)}
+        for strategy in SelectionEngine.STRATEGIES:
+            selected = TimeTableSelection(strategy).select_chromosomes(scores)
+            self.assertIn("Week 0", selected)
+            self.assertGreater(len(selected), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()